@@ -1,20 +1,67 @@
 #apps.py
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file, send_from_directory
-from pymongo import MongoClient
+from utils.startup import StartupTimer, bytecode_cache, precompile_templates
+# Created before the other imports so the startup report covers them too
+startup = StartupTimer()
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, send_file, send_from_directory, make_response, Response
+from pymongo import ReturnDocument, UpdateOne, DeleteOne
 from datetime import datetime, timedelta
-from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
+from werkzeug.middleware.proxy_fix import ProxyFix
+import asyncio
+import click
+import inspect
+import json
 import os
 import os.path
-from functools import wraps
-from models import User, Opportunity
+import signal
+import tempfile
+import traceback
+from functools import lru_cache, wraps
+startup.mark('import flask, pymongo and stdlib')
+from models import User, Opportunity, Application, MockTest
+from utils.helpers import get_cursor_params, paginate, paginate_async, build_search_query, parse_deadline, format_date
+from utils.indexes import ensure_indexes, check_indexes
+from utils.archive import archive_opportunities, parse_window, Throttle
+from utils.stats import StatsCache
+from utils.search import SearchIndex, SearchUnavailable
+from utils.catalog import Catalog
+from utils.mock_tests import MockTestGrader, InvalidMockTest, validate_test, empty_stats, percentile
+from utils.page_cache import PageCache, LRUBackend, MongoGenerations
+from utils.serialization import dumps, compress_response
+from utils.bulk import read_rows, bulk_import_opportunities, export_rows
+from utils.activity import ActivityLogWriter
+from utils.async_db import AsyncMongo
+from utils.mongo import Mongo, pool_options_from_env
+from utils.metrics import Metrics, Counter
+from utils.assets import Assets
+from utils.ratelimit import RateLimiter, MemoryBackend, MongoBackend, parse_rate
+from utils.auth import Auth, PasswordHasher, LastLoginRecorder, HasherSaturated
+from utils.decorators import log_activity
+from utils.resume_store import ResumeStore, ResumeUploadRequest, InvalidResume, RESUME_MIMETYPES
+from utils.resume_pipeline import ResumePipeline
 from bson import ObjectId
+from bson.errors import InvalidId
 from dotenv import load_dotenv
+startup.mark('import models and utils')
 
 load_dotenv()
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
+# Stream uploads through a hashing, size-capped file target while parsing
+app.request_class = ResumeUploadRequest
+# Compiled templates are kept on local disk, so a fresh worker loads them
+# instead of compiling every template again on its first requests
+try:
+    app.jinja_env.bytecode_cache = bytecode_cache(os.getenv('JINJA_CACHE_DIR'))
+except OSError as e:
+    print(f"Jinja bytecode cache disabled: {e}")
+# Behind a reverse proxy, take the client address from X-Forwarded-For
+# (set to the number of proxies in front of the app, so it cannot be spoofed).
+# Production runs behind Render's proxy, so it trusts one hop by default
+TRUSTED_PROXIES = int(os.getenv('TRUSTED_PROXIES', 1 if os.environ.get('FLASK_ENV') == 'production' else 0))
+if TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES)
 
 # At the top of your file
 if os.environ.get('FLASK_ENV') == 'production':
@@ -24,6 +71,48 @@ else:
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
+# Largest accepted resume; whole requests over this (plus form overhead) are
+# rejected from their Content-Length before the body is read
+app.config['MAX_RESUME_SIZE'] = int(os.getenv('MAX_RESUME_SIZE', 5 * 1024 * 1024))
+app.config['MAX_CONTENT_LENGTH'] = app.config['MAX_RESUME_SIZE'] + ResumeUploadRequest.FORM_OVERHEAD
+# Endpoints that accept larger uploads than a resume
+app.config['UPLOAD_LIMITS'] = {
+    'import_opportunities': int(os.getenv('MAX_IMPORT_SIZE', 50 * 1024 * 1024))
+}
+resume_store = ResumeStore(UPLOAD_FOLDER, cleanup_workers=int(os.getenv('RESUME_CLEANUP_WORKERS', 4)))
+# Uploaded resumes are validated and their text extracted by `flask process-resumes`
+resume_pipeline = ResumePipeline(resume_store,
+                                 max_workers=int(os.getenv('RESUME_PROCESS_WORKERS', 2)),
+                                 max_attempts=int(os.getenv('RESUME_PROCESS_ATTEMPTS', 5)),
+                                 timeout=int(os.getenv('RESUME_PROCESS_TIMEOUT', 60)))
+# Optional front-proxy offload for resume downloads: 'nginx' answers with an
+# X-Accel-Redirect to RESUME_ACCEL_PREFIX, 'sendfile' with an X-Sendfile path
+RESUME_ACCEL_MODE = os.getenv('RESUME_ACCEL_MODE', '').lower()
+RESUME_ACCEL_PREFIX = os.getenv('RESUME_ACCEL_PREFIX', '/protected-resumes/')
+app.config['USE_X_SENDFILE'] = RESUME_ACCEL_MODE == 'sendfile'
+
+# Dashboard counters, refreshed at most every STATS_CACHE_TTL seconds
+dashboard_stats = StatsCache(ttl=int(os.getenv('STATS_CACHE_TTL', 300)))
+
+# Per-endpoint latency and MongoDB command accounting, exposed at /metrics.
+# MONGO_QUERY_BUDGET flags requests issuing more commands than that (raising in development)
+metrics = Metrics(
+    query_budget=int(os.getenv('MONGO_QUERY_BUDGET', 0)),
+    budget_mode=os.getenv('MONGO_QUERY_BUDGET_MODE',
+                          'raise' if os.environ.get('FLASK_ENV') == 'development' else 'log')
+)
+# /metrics is served to METRICS_ALLOW networks (default: this host) and to
+# scrapers sending `Authorization: Bearer $METRICS_TOKEN`
+metrics.init_app(app, token=os.getenv('METRICS_TOKEN'),
+                 allow=os.getenv('METRICS_ALLOW', '127.0.0.1/32,::1/128').split(','))
+# Gauges that query MongoDB are computed at most once per METRICS_GAUGE_TTL seconds
+METRICS_GAUGE_TTL = int(os.getenv('METRICS_GAUGE_TTL', 30))
+
+# Minified, fingerprinted and precompressed CSS/JS served with immutable caching;
+# templates link them with asset_url(). Development serves the source files
+assets = Assets(app, enabled=os.environ.get('FLASK_ENV') != 'development')
+
+startup.mark('configure app and caches')
 
 def allowed_file(filename):
     return '.' in filename and \
@@ -37,16 +126,205 @@ def format_datetime(value):
         return ""
     return value.strftime('%Y-%m-%d %H:%M:%S')
 
-# MongoDB connection
-try:
-    MONGODB_URI = os.getenv('MONGODB_URI')  # Get from environment variable
-    client = MongoClient(MONGODB_URI)
-    db = client['career_portal']
-    # Test the connection
-    client.server_info()  # This will raise an exception if connection fails
-    print("MongoDB connected successfully")
-except Exception as e:
-    print(f"Could not connect to MongoDB: {e}")
+# Deadlines are dates; older documents may still hold the raw form string
+app.template_filter('date')(format_date)
+
+# MongoDB connection: created lazily in each process on first use, so importing
+# the app (e.g. in a preloading gunicorn master) does no network I/O and forked
+# workers never share the parent's sockets
+MONGODB_URI = os.getenv('MONGODB_URI')
+MONGODB_DATABASE = os.getenv('MONGODB_DATABASE', 'career_portal')
+mongo = Mongo(MONGODB_URI, MONGODB_DATABASE, event_listeners=[metrics.listener],
+              **pool_options_from_env(MONGODB_URI))
+db = mongo.db
+startup.mark('create mongo client')
+
+# Rendered public listing pages, invalidated by opportunity writes. Pages are
+# kept per worker; the generations live in MongoDB so a write reaches every worker
+page_cache = PageCache(MongoGenerations(LRUBackend(max_entries=int(os.getenv('PAGE_CACHE_ENTRIES', 512))),
+                                        db.page_cache_generations,
+                                        max_age=float(os.getenv('PAGE_CACHE_GENERATION_MAX_AGE', 1))),
+                       ttl=int(os.getenv('PAGE_CACHE_TTL', 300)))
+
+# Active opportunities for the public listings, read by every worker on the host
+# from one memory-mapped snapshot; admin writes publish a new version of it
+catalog = Catalog(db, os.getenv('CATALOG_PATH') or os.path.join(tempfile.gettempdir(), f'career-portal-{os.getuid()}',
+                                                                  f'catalog-{MONGODB_DATABASE}.bin'),
+                  refresh_interval=int(os.getenv('CATALOG_REFRESH_SECONDS', 5)),
+                  # Pages rendered from the old snapshot meanwhile are dropped
+                  on_rebuilt=lambda: page_cache.invalidate('opportunities'))
+
+# Relevance-ranked opportunity search, held in memory per worker. Admin writes
+# update it in place; writes made by other workers show up after a rebuild
+search_index = SearchIndex(db.opportunities, ttl=int(os.getenv('SEARCH_INDEX_TTL', 300)))
+
+# Per-client token buckets for the expensive POSTs (/login hashes a password,
+# /apply receives an upload). The memory backend limits each worker process
+# separately; RATE_LIMIT_BACKEND=mongo shares the buckets across workers
+rate_limited = metrics.add(Counter('rate_limited_requests_total', 'Requests rejected by the rate limiter',
+                                   ('endpoint', 'reason')))
+limiter = RateLimiter(
+    MongoBackend(db.rate_limits) if os.getenv('RATE_LIMIT_BACKEND', 'memory') == 'mongo' else MemoryBackend(),
+    enabled=os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true',
+    on_reject=lambda endpoint, reason: rate_limited.inc(endpoint, reason)
+)
+LOGIN_RATE = parse_rate(os.getenv('RATE_LIMIT_LOGIN', '10/minute'))
+APPLY_RATE = parse_rate(os.getenv('RATE_LIMIT_APPLY', '10/minute'))
+APPLY_UPLOAD_RATE = parse_rate(os.getenv('RATE_LIMIT_APPLY_BYTES', '104857600/hour'))
+
+# Password checks run on a bounded executor; last_login writes are batched
+password_hasher = PasswordHasher(
+    method=os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256'),
+    max_workers=int(os.getenv('PASSWORD_HASH_WORKERS', 4)),
+    max_pending=int(os.getenv('PASSWORD_HASH_QUEUE', 16))
+)
+auth = Auth(db, hasher=password_hasher,
+            last_login=LastLoginRecorder(db.users, flush_interval=int(os.getenv('LAST_LOGIN_FLUSH_SECONDS', 5))))
+
+# Admin activity is written to activity_log in background batches
+app.extensions['activity_log'] = ActivityLogWriter(
+    db.activity_log,
+    max_queue=int(os.getenv('ACTIVITY_LOG_QUEUE_SIZE', 10000)),
+    batch_size=int(os.getenv('ACTIVITY_LOG_BATCH_SIZE', 100)),
+    flush_interval=int(os.getenv('ACTIVITY_LOG_FLUSH_MS', 500)) / 1000
+)
+metrics.gauge('activity_log_entries', 'Activity log writer counters by state',
+              lambda: {(state,): value for state, value in app.extensions['activity_log'].stats().items()},
+              labelnames=('state',))
+metrics.gauge('resume_jobs', 'Resume processing jobs by state (pending is the backlog)',
+              lambda: {(state,): count for state, count in resume_pipeline.backlog(db).items()},
+              labelnames=('state',), ttl=METRICS_GAUGE_TTL)
+
+# Mock test attempts are graded a whole cohort at a time by `flask grade-mock-tests`
+mock_test_grader = MockTestGrader(batch_size=int(os.getenv('MOCK_TEST_GRADE_BATCH', 5000)))
+metrics.gauge('mock_test_attempts', 'Mock test attempts by state (submitted is the grading backlog)',
+              lambda: {(state,): count for state, count in mock_test_grader.backlog(db).items()},
+              labelnames=('state',), ttl=METRICS_GAUGE_TTL)
+startup.mark('set up limiter, auth and background writers')
+
+@app.cli.command('ensure-indexes')
+@click.option('--rebuild', is_flag=True, help='Drop and recreate existing indexes that differ from their declaration')
+def ensure_indexes_command(rebuild):
+    """Create the MongoDB indexes declared in utils/indexes.py"""
+    created, conflicts = ensure_indexes(db, rebuild=rebuild)
+    for collection, names in created.items():
+        print(f"{collection}: {', '.join(names)}")
+    for collection, indexes in conflicts.items():
+        for name, message in indexes:
+            print(f"{collection}.{name} differs from the existing index (rerun with --rebuild to replace it): "
+                  f"{message}")
+    if conflicts:
+        raise SystemExit(1)
+
+@app.cli.command('check-indexes')
+def check_indexes_command():
+    """Fail if any hot query's winning plan is a collection scan"""
+    failures = check_indexes(db)
+    for query, stages in failures.items():
+        print(f"COLLSCAN in {query}: {' -> '.join(stages)}")
+    if failures:
+        raise SystemExit(1)
+    print("All checked queries use an index")
+
+@app.cli.command('build-assets')
+def build_assets_command():
+    """Minify, fingerprint and precompress static CSS and JS into static/dist"""
+    for source, built in assets.build().items():
+        print(f"{source} -> {built}")
+
+@app.cli.command('startup-report')
+def startup_report_command():
+    """Run the startup tasks and show where import and boot time went"""
+    run_startup_tasks()
+    print(startup.report())
+
+@app.cli.command('backfill-search-fields')
+def backfill_search_fields_command():
+    """Copy opportunity titles onto existing applications for admin search"""
+    for opportunity in db.opportunities.find({}, {'title': 1}):
+        result = Application.sync_opportunity_title(db, opportunity['_id'], opportunity.get('title'))
+        print(f"{opportunity.get('title')}: {result.modified_count} applications updated")
+
+@app.cli.command('process-resumes')
+@click.option('--once', is_flag=True, help='Exit when no job is ready instead of polling')
+@click.option('--backfill', is_flag=True, help='First queue every stored resume not processed yet')
+def process_resumes_command(once, backfill):
+    """Validate uploaded resumes and extract their text and page count"""
+    if backfill:
+        filenames = db.applications.distinct('resume_path', {'resume_info': {'$exists': False}})
+        for filename in filenames:
+            resume_pipeline.enqueue(db, filename)
+        print(f"Queued {len(filenames)} resumes")
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    resume_pipeline.run(db, once=once, should_stop=lambda: bool(stopping))
+    print(f"Resume jobs: {resume_pipeline.backlog(db)}")
+
+@app.cli.command('import-mock-test')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_mock_test_command(path):
+    """Add a mock test from a JSON file (format in utils/mock_tests.validate_test)"""
+    with open(path) as f:
+        definition = json.load(f)
+    try:
+        test = validate_test(definition)
+    except InvalidMockTest as e:
+        print(f"Could not import {path}: {e}")
+        raise SystemExit(1)
+    db.mock_tests.insert_one(test)
+    db.mock_test_stats.insert_one(dict(empty_stats(test), _id=test['_id']))
+    print(f"Imported '{test['title']}' ({test['question_count']} questions) as {test['_id']}")
+
+@app.cli.command('grade-mock-tests')
+@click.option('--once', is_flag=True, help='Exit when nothing is left to grade instead of polling')
+def grade_mock_tests_command(once):
+    """Grade submitted mock test attempts and update per-question statistics"""
+    if not mock_test_grader.available:
+        print("Grading mock tests requires numpy")
+        raise SystemExit(1)
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    mock_test_grader.run(db, once=once, poll_interval=float(os.getenv('MOCK_TEST_GRADE_INTERVAL', 2)),
+                         should_stop=lambda: bool(stopping))
+    print(f"Mock test attempts: {mock_test_grader.backlog(db)}")
+
+@app.cli.command('migrate-deadlines')
+def migrate_deadlines_command():
+    """Convert deadlines stored as form strings into dates"""
+    converted, invalid = 0, []
+    for opportunity in db.opportunities.find({'deadline': {'$type': 'string'}}, {'deadline': 1}):
+        try:
+            deadline = parse_deadline(opportunity['deadline'])
+        except ValueError:
+            invalid.append(opportunity['_id'])
+            continue
+        update = {'$set': {'deadline': deadline}} if deadline else {'$unset': {'deadline': ''}}
+        converted += db.opportunities.update_one({'_id': opportunity['_id']}, update).modified_count
+    print(f"{converted} deadlines converted")
+    if converted:
+        catalog.publish()
+    for object_id in invalid:
+        print(f"Could not parse the deadline of opportunity {object_id}")
+
+@app.cli.command('archive-opportunities')
+@click.option('--grace-days', default=0, help='Keep expired opportunities this many days past their deadline')
+@click.option('--include-applications', is_flag=True, help='Archive their applications too')
+@click.option('--batch-size', default=500, help='Opportunities moved per batch')
+@click.option('--duty-cycle', default=0.25, help='Largest fraction of the time spent working')
+@click.option('--window', default=lambda: os.getenv('ARCHIVE_WINDOW', ''),
+              help="UTC hours to run in, e.g. '1-6'; the job stops outside them")
+def archive_opportunities_command(grace_days, include_applications, batch_size, duty_cycle, window):
+    """Move closed and expired opportunities out of the live collection (run from cron)"""
+    report = archive_opportunities(db, grace_days=grace_days, include_applications=include_applications,
+                                   batch_size=batch_size,
+                                   throttle=Throttle(duty_cycle=duty_cycle, window=parse_window(window)))
+    print(f"Archived {report['opportunities']} opportunities and {report['applications']} applications "
+          f"in {report['batches']} batches")
+    if report['opportunities']:
+        catalog.publish()
+    if report['stopped']:
+        print(f"Stopped early: {report['stopped']}")
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
@@ -56,22 +334,42 @@ def home():
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
+# Liveness: the process is up and serving requests (no dependencies checked)
+@app.route('/healthz')
+def healthz():
+    return jsonify({'status': 'ok'})
+
+# Readiness: MongoDB answers a ping, so the worker can take traffic
+@app.route('/readyz')
+def readyz():
+    try:
+        mongo.ping()
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'mongodb': str(e)}), 503
+    return jsonify({'status': 'ready'})
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
 # Login route
 @app.route('/login', methods=['GET', 'POST'])
+@limiter.limit(LOGIN_RATE)
 def login():
     if request.method == 'POST':
         username = request.form['username']
         password = request.form['password']
         
-        user = db.users.find_one({'username': username})
-        
         try:
-            if user and check_password_hash(user['password'], password):
+            user = auth.verify_user(username, password)
+            if user:
                 session['is_admin'] = user.get('is_admin', False)
                 session['user_id'] = str(user['_id'])
                 session['username'] = username
                 flash('Login successful!', 'success')
                 return redirect(url_for('admin_dashboard'))
+        except HasherSaturated:
+            # Shed load instead of queueing more password checks
+            flash('The server is busy. Please try again in a few seconds.', 'warning')
+            return render_template('login.html'), 503, {'Retry-After': '5'}
         except ValueError as e:
             print(f"Password verification error: {e}")
             # Log the error but don't expose it to the user
@@ -90,38 +388,160 @@ def logout():
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
+def listing_page(category, cursor, per_page):
+    """One page of a public listing, from the catalog snapshot unless there is none"""
+    page = catalog.page(category, cursor, per_page)
+    if page is None:
+        page = paginate(db.opportunities, Opportunity.live_query(category), cursor, per_page)
+    return page
+
 @app.route('/internships')
+@page_cache.cached('opportunities')
 def internships():
-    opportunities = list(db.opportunities.find({'type': 'internship'}))
+    cursor, per_page = get_cursor_params(request)
+    opportunities, pagination = listing_page('internship', cursor, per_page)
     return render_template('opportunity_list.html', 
                          category='internship', 
-                         opportunities=opportunities)
+                         opportunities=opportunities,
+                         pagination=pagination)
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
 @app.route('/jobs')
+@page_cache.cached('opportunities')
 def jobs():
-    opportunities = list(db.opportunities.find({'type': 'job'}))
+    cursor, per_page = get_cursor_params(request)
+    opportunities, pagination = listing_page('job', cursor, per_page)
     return render_template('opportunity_list.html', 
                          category='job', 
-                         opportunities=opportunities)
+                         opportunities=opportunities,
+                         pagination=pagination)
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
 @app.route('/hackathons')
+@page_cache.cached('opportunities')
 def hackathons():
-    opportunities = list(db.opportunities.find({'type': 'hackathon'}))
+    cursor, per_page = get_cursor_params(request)
+    opportunities, pagination = listing_page('hackathon', cursor, per_page)
     return render_template('opportunity_list.html', 
                          category='hackathon', 
-                         opportunities=opportunities)
+                         opportunities=opportunities,
+                         pagination=pagination)
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
+# The listing shows no questions, so they are not loaded
+MOCK_TEST_LIST_PROJECTION = {'questions': 0}
+
 @app.route('/mock-tests')
+@page_cache.cached('mock_tests')
 def mock_tests():
-    tests = list(db.mock_tests.find())
+    tests = list(db.mock_tests.find({}, MOCK_TEST_LIST_PROJECTION))
     return render_template('mock_tests.html', tests=tests)
 
+@lru_cache(maxsize=256)
+def mock_test_options(test_id):
+    """Option count of each question of a test (tests are not edited once imported)"""
+    try:
+        test = db.mock_tests.find_one({'_id': ObjectId(test_id)}, {'questions.options': 1})
+    except InvalidId:
+        return None
+    return tuple(len(question['options']) for question in test.get('questions', [])) if test else None
+
+def mock_test_attempt_id(test_id):
+    """This browser's attempt at a test, kept in the session"""
+    return session.get('mock_attempts', {}).get(test_id)
+
+@app.route('/mock-tests/<test_id>', methods=['GET', 'POST'])
+def take_mock_test(test_id):
+    try:
+        test = MockTest.get_public(db, test_id)
+    except InvalidId:
+        test = None
+    if not test or not test.get('questions'):
+        flash('Mock test not found', 'danger')
+        return redirect(url_for('mock_tests'))
+
+    now = datetime.utcnow()
+    attempt_id = mock_test_attempt_id(test_id)
+    attempt = db.mock_test_attempts.find_one({'_id': ObjectId(attempt_id)}) if attempt_id else None
+    if attempt is None:
+        closed = bool(test.get('closes_at')) and test['closes_at'] <= now
+        if request.method == 'POST' and not closed:
+            attempt = MockTest.start_attempt(db, test, request.form.get('name'), request.form.get('email'), now=now)
+            session['mock_attempts'] = dict(session.get('mock_attempts', {}), **{test_id: str(attempt['_id'])})
+            return redirect(url_for('take_mock_test', test_id=test_id))
+        return render_template('mock_test_start.html', test=test, closed=closed)
+    if attempt['status'] != 'in_progress' or attempt['expires_at'] <= now:
+        return redirect(url_for('mock_test_result', test_id=test_id))
+    return render_template('mock_test.html', test=test, attempt=attempt,
+                           remaining=int((attempt['expires_at'] - now).total_seconds()))
+
+# Autosave: one small write per answer, checked against the cached question layout
+@app.route('/mock-tests/<test_id>/answer', methods=['POST'])
+def save_mock_test_answer(test_id):
+    attempt_id = mock_test_attempt_id(test_id)
+    options = mock_test_options(test_id)
+    if not attempt_id or options is None:
+        return jsonify({'success': False, 'message': 'No attempt in progress'}), 404
+    payload = request.get_json(silent=True) or {}
+    question, choice = payload.get('question'), payload.get('choice')
+    if type(question) is not int or not 0 <= question < len(options) or \
+            type(choice) is not int or not 0 <= choice < options[question]:
+        return jsonify({'success': False, 'message': 'Invalid answer'}), 400
+    if not MockTest.save_answer(db, attempt_id, question, choice):
+        return jsonify({'success': False, 'message': 'Time is up: this attempt is closed'}), 409
+    return jsonify({'success': True, 'message': 'Answer saved'})
+
+@app.route('/mock-tests/<test_id>/submit', methods=['POST'])
+def submit_mock_test(test_id):
+    attempt_id = mock_test_attempt_id(test_id)
+    if not attempt_id:
+        return redirect(url_for('take_mock_test', test_id=test_id))
+    # The form carries every answer too, in case an autosave did not get through
+    answers = {}
+    for question, count in enumerate(mock_test_options(test_id) or ()):
+        choice = request.form.get(f'q{question}', type=int)
+        if choice is not None and 0 <= choice < count:
+            answers[str(question)] = choice
+    MockTest.submit(db, attempt_id, answers)
+    return redirect(url_for('mock_test_result', test_id=test_id))
+
+@app.route('/mock-tests/<test_id>/result')
+def mock_test_result(test_id):
+    attempt_id = mock_test_attempt_id(test_id)
+    attempt = db.mock_test_attempts.find_one({'_id': ObjectId(attempt_id)}) if attempt_id else None
+    if attempt is None:
+        return redirect(url_for('take_mock_test', test_id=test_id))
+    now = datetime.utcnow()
+    if attempt['status'] == 'in_progress':
+        if attempt['expires_at'] > now:
+            return redirect(url_for('take_mock_test', test_id=test_id))
+        # Time ran out before the attempt was handed in: grade what was saved
+        MockTest.submit(db, attempt_id)
+        attempt['status'] = 'submitted'
+    if attempt['status'] != 'graded':
+        test = db.mock_tests.find_one({'_id': attempt['test_id']}, {'title': 1})
+        return render_template('mock_test_result.html', test=test, attempt=attempt, pending=True)
+
+    # Questions, answers and the answer key are only shown once the test has closed for everyone
+    test = db.mock_tests.find_one({'_id': attempt['test_id']})
+    stats = db.mock_test_stats.find_one({'_id': attempt['test_id']}, {'questions': 1, 'scores': 1, 'attempts': 1})
+    return render_template('mock_test_result.html', test=test, attempt=attempt, pending=False,
+                           reveal=not test.get('closes_at') or test['closes_at'] <= now,
+                           difficulty=(stats or {}).get('questions', []),
+                           percentile=percentile(stats, attempt['score']))
+
+@app.route('/mock-tests/<test_id>/restart', methods=['POST'])
+def restart_mock_test(test_id):
+    # Only a finished attempt is let go; the next visit starts a new one
+    attempt_id = mock_test_attempt_id(test_id)
+    if attempt_id and db.mock_test_attempts.count_documents(
+            {'_id': ObjectId(attempt_id), 'status': 'graded'}, limit=1):
+        session['mock_attempts'] = {key: value for key, value in session['mock_attempts'].items() if key != test_id}
+    return redirect(url_for('take_mock_test', test_id=test_id))
+
 #---------------------------------------------------------------------------------------------------------------------------------#
 
 @app.route('/activity-points')
@@ -130,8 +550,108 @@ def activity_points():
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
-# Admin required decorator
+# Fields clients may request from /api/v1/opportunities
+API_OPPORTUNITY_FIELDS = {'title', 'description', 'type', 'link', 'company', 'location',
+                          'deadline', 'status', 'is_paid', 'payment_amount', 'created_at'}
+API_DEFAULT_FIELDS = API_OPPORTUNITY_FIELDS - {'description'}
+
+def api_response(payload, status=200):
+    response = make_response(dumps(payload), status)
+    response.mimetype = 'application/json'
+    return compress_response(response, request)
+
+def api_opportunity_args():
+    """Parse the ?fields, ?deadline_from and ?deadline_to arguments both opportunity APIs take.
+
+    ?fields=title,company picks the returned fields; description is opt-in.
+    Returns (fields, deadline_from, deadline_to); raises ValueError with a
+    message for the client.
+    """
+    requested = request.args.get('fields')
+    fields = {f.strip() for f in requested.split(',') if f.strip()} if requested else API_DEFAULT_FIELDS
+    unknown = fields - API_OPPORTUNITY_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    try:
+        deadline_from = parse_deadline(request.args.get('deadline_from'))
+        deadline_to = parse_deadline(request.args.get('deadline_to'))
+    except ValueError:
+        raise ValueError('Deadlines must be formatted YYYY-MM-DD')
+    return fields, deadline_from, deadline_to
+
+@app.route('/api/v1/opportunities')
+def api_opportunities():
+    try:
+        fields, deadline_from, deadline_to = api_opportunity_args()
+    except ValueError as e:
+        return api_response({'success': False, 'message': str(e)}, 400)
+
+    cursor, per_page = get_cursor_params(request)
+    opportunities, pagination = Opportunity.get_page(
+        db,
+        type=request.args.get('type'),
+        deadline_from=deadline_from,
+        deadline_to=deadline_to,
+        fields=fields,
+        cursor=cursor,
+        per_page=per_page
+    )
+    data = [dict({'id': opportunity['_id']},
+                 **{k: v for k, v in opportunity.items() if k in fields})
+            for opportunity in opportunities]
+    return api_response({'success': True, 'data': data, 'pagination': pagination})
+
+@app.route('/api/v1/opportunities/search')
+def api_search_opportunities():
+    # ?q=python remote ranks by relevance; without q the filtered results come newest first
+    try:
+        fields, deadline_from, deadline_to = api_opportunity_args()
+    except ValueError as e:
+        return api_response({'success': False, 'message': str(e)}, 400)
+    try:
+        min_payment = float(request.args['min_payment']) if request.args.get('min_payment') else None
+        page = max(1, int(request.args.get('page', 1)))
+    except ValueError:
+        return api_response({'success': False, 'message': 'min_payment and page must be numbers'}, 400)
+    paid = request.args.get('paid')
+
+    _, per_page = get_cursor_params(request, max_per_page=50)
+    try:
+        results, total = search_index.search(
+            request.args.get('q', ''),
+            type=request.args.get('type'),
+            is_paid={'true': True, 'false': False}.get(paid),
+            min_payment=min_payment,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+            offset=(page - 1) * per_page,
+            limit=per_page
+        )
+    except SearchUnavailable as e:
+        return api_response({'success': False, 'message': str(e)}, 503)
+
+    # The index ranks; the current documents come from MongoDB in one query
+    documents = {doc['_id']: doc for doc in db.opportunities.find(
+        {'_id': {'$in': [opportunity_id for opportunity_id, _ in results]}}, dict.fromkeys(fields, 1))}
+    data = [dict({'id': opportunity_id, 'score': round(score, 4)},
+                 **{k: v for k, v in documents[opportunity_id].items() if k in fields})
+            for opportunity_id, score in results if opportunity_id in documents]
+    return api_response({'success': True, 'data': data, 'pagination': {
+        'page': page, 'per_page': per_page, 'total': total, 'has_next': page * per_page < total}})
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
+# Admin required decorator (works for both sync and async views)
 def admin_required(f):
+    if inspect.iscoroutinefunction(f):
+        @wraps(f)
+        async def async_decorated_function(*args, **kwargs):
+            if not session.get('is_admin'):
+                flash('Access denied. Admin privileges required.', 'danger')
+                return redirect(url_for('login'))
+            return await f(*args, **kwargs)
+        return async_decorated_function
+
     @wraps(f)
     def decorated_function(*args, **kwargs):
         if not session.get('is_admin'):
@@ -153,14 +673,13 @@ def admin_homepage():
 @app.route('/admin/dashboard')
 @admin_required
 def admin_dashboard():
-    # Get statistics for the dashboard
+    # Get statistics for the dashboard from the in-process cache
+    cached = dashboard_stats.get(db)
     stats = {
-        'total_opportunities': db.opportunities.count_documents({}),
-        'active_applications': db.applications.count_documents({'status': 'pending'}),
-        'total_users': db.users.count_documents({}),
-        'new_applications': db.applications.count_documents({
-            'created_at': {'$gte': datetime.utcnow() - timedelta(days=1)}
-        })
+        'total_opportunities': cached['opportunities']['total'],
+        'active_applications': cached['applications']['pending'],
+        'total_users': cached['users']['total'],
+        'new_applications': cached['applications']['new']
     }
     
     # Get recent activities
@@ -175,19 +694,22 @@ def admin_dashboard():
 @app.route('/admin/opportunities', methods=['GET'])
 @admin_required
 def manage_opportunities():
-    opportunities = Opportunity.get_all(db)
+    cursor, per_page = get_cursor_params(request)
+    opportunities, pagination = paginate(db.opportunities, {'status': 'active'}, cursor, per_page)
     # Define opportunity types
     opportunity_types = ['internship', 'job', 'hackathon']
     return render_template(
         'admin/manage_opportunities.html', 
         opportunities=opportunities,
-        opportunity_types=opportunity_types
+        opportunity_types=opportunity_types,
+        pagination=pagination
     )
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
 @app.route('/admin/opportunity/<opportunity_id>', methods=['GET', 'POST'])
 @admin_required
+@log_activity
 def edit_opportunity(opportunity_id):
     if request.method == 'POST':
         # Convert is_paid from string to boolean
@@ -201,6 +723,12 @@ def edit_opportunity(opportunity_id):
             except ValueError:
                 payment_amount = None
 
+        try:
+            deadline = parse_deadline(request.form.get('deadline'))
+        except ValueError:
+            flash('Deadline must be a valid date (YYYY-MM-DD)', 'danger')
+            return redirect(request.url)
+
         updates = {
             'title': request.form['title'],
             'description': request.form['description'],
@@ -208,7 +736,7 @@ def edit_opportunity(opportunity_id):
             'link': request.form['link'],
             'company': request.form.get('company'),
             'location': request.form.get('location'),
-            'deadline': request.form.get('deadline'),
+            'deadline': deadline,
             'status': request.form['status'],
             'is_paid': is_paid,
             'payment_amount': payment_amount
@@ -217,10 +745,18 @@ def edit_opportunity(opportunity_id):
         # Remove None values to avoid overwriting with null
         updates = {k: v for k, v in updates.items() if v is not None}
         
-        db.opportunities.update_one(
+        previous = db.opportunities.find_one_and_update(
             {'_id': ObjectId(opportunity_id)},
-            {'$set': updates}
+            {'$set': updates},
+            return_document=ReturnDocument.BEFORE
         )
+        if previous:
+            dashboard_stats.opportunity_updated(previous, {**previous, **updates})
+            page_cache.invalidate('opportunities')
+            search_index.upsert({**previous, **updates})
+            catalog.publish()
+            if previous.get('title') != updates['title']:
+                Application.sync_opportunity_title(db, opportunity_id, updates['title'])
         flash('Opportunity updated successfully!', 'success')
         return redirect(url_for('manage_opportunities'))
     
@@ -231,6 +767,7 @@ def edit_opportunity(opportunity_id):
 
 @app.route('/admin/opportunity/add', methods=['GET', 'POST'])
 @admin_required
+@log_activity
 def add_opportunity():
     if request.method == 'POST':
         # Convert is_paid from string to boolean
@@ -244,6 +781,12 @@ def add_opportunity():
             except ValueError:
                 payment_amount = None
 
+        try:
+            deadline = parse_deadline(request.form.get('deadline'))
+        except ValueError:
+            flash('Deadline must be a valid date (YYYY-MM-DD)', 'danger')
+            return redirect(request.url)
+
         opportunity = {
             'title': request.form['title'],
             'description': request.form['description'],
@@ -251,7 +794,7 @@ def add_opportunity():
             'link': request.form['link'],
             'company': request.form.get('company'),
             'location': request.form.get('location'),
-            'deadline': request.form.get('deadline'),
+            'deadline': deadline,
             'created_at': datetime.utcnow(),
             'status': 'active',
             'is_paid': is_paid,
@@ -262,6 +805,10 @@ def add_opportunity():
         opportunity = {k: v for k, v in opportunity.items() if v is not None}
         
         db.opportunities.insert_one(opportunity)
+        dashboard_stats.opportunity_added(opportunity)
+        page_cache.invalidate('opportunities')
+        search_index.upsert(opportunity)
+        catalog.publish()
         flash('New opportunity added successfully!', 'success')
         return redirect(url_for('manage_opportunities'))
     
@@ -271,9 +818,15 @@ def add_opportunity():
 
 @app.route('/admin/opportunity/delete/<opportunity_id>', methods=['POST'])
 @admin_required
+@log_activity
 def delete_opportunity(opportunity_id):
     try:
-        Opportunity.delete(db, opportunity_id)
+        deleted = Opportunity.delete(db, opportunity_id)
+        dashboard_stats.opportunity_removed(deleted)
+        page_cache.invalidate('opportunities')
+        if deleted:
+            search_index.remove(deleted['_id'])
+            catalog.publish()
         return jsonify({
             'success': True,
             'message': 'Opportunity deleted successfully!'
@@ -286,21 +839,160 @@ def delete_opportunity(opportunity_id):
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
+@app.route('/admin/opportunities/<opportunity_id>/status', methods=['POST'])
+@admin_required
+@log_activity
+def update_opportunity_status(opportunity_id):
+    # The status switch on the manage opportunities page
+    status = (request.get_json(silent=True) or {}).get('status')
+    if status not in ('active', 'inactive'):
+        return jsonify({'success': False, 'message': 'Status must be active or inactive'}), 400
+    try:
+        previous = db.opportunities.find_one_and_update(
+            {'_id': ObjectId(opportunity_id)},
+            {'$set': {'status': status}},
+            return_document=ReturnDocument.BEFORE
+        )
+    except Exception as e:
+        return jsonify({'success': False, 'message': str(e)}), 500
+    if not previous:
+        return jsonify({'success': False, 'message': 'Opportunity not found'}), 404
+
+    dashboard_stats.opportunity_updated(previous, {**previous, 'status': status})
+    page_cache.invalidate('opportunities')
+    search_index.upsert({**previous, 'status': status})
+    catalog.publish()
+    return jsonify({'success': True, 'message': f'Opportunity is now {status}'})
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
+@app.route('/admin/opportunities/import', methods=['GET', 'POST'])
+@admin_required
+@log_activity
+def import_opportunities():
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or upload.filename == '':
+            flash('No file selected', 'danger')
+            return redirect(request.url)
+        
+        format = 'csv' if upload.filename.lower().endswith('.csv') else 'jsonl'
+        # Rows are parsed, validated and written in chunks as the file is read
+        report = bulk_import_opportunities(db, read_rows(upload.stream, format))
+        
+        if report['inserted']:
+            dashboard_stats.invalidate()
+            page_cache.invalidate('opportunities')
+            search_index.invalidate()
+            catalog.publish()
+        flash(f"Imported {report['inserted']} opportunities with {len(report['errors'])} errors.",
+              'success' if not report['errors'] else 'warning')
+    
+    return render_template('admin/import_opportunities.html', report=report)
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
+EXPORT_FIELDS = {
+    'opportunities': ['_id', 'title', 'type', 'company', 'location', 'deadline', 'status',
+                      'is_paid', 'payment_amount', 'link', 'created_at', 'description'],
+    'applications': ['_id', 'name', 'email', 'phone', 'opportunity_title', 'opportunity_type',
+                     'status', 'created_at', 'resume_path']
+}
+
+def export_response(collection, transform=None, extra_fields=()):
+    format = 'jsonl' if request.args.get('format') == 'jsonl' else 'csv'
+    fields = EXPORT_FIELDS[collection]
+    # extra_fields are fetched for the transform but not written out; newest first
+    # by _id, whose index lets the export stream instead of sorting in memory
+    cursor = db[collection].find({}, dict.fromkeys(fields + list(extra_fields), 1)).sort('_id', -1)
+    filename = f"{collection}-{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{format}"
+    return Response(
+        export_rows(cursor, fields, format, transform=transform),
+        mimetype='text/csv' if format == 'csv' else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/admin/opportunities/export')
+@admin_required
+def export_opportunities():
+    return export_response('opportunities')
+
+@app.route('/admin/applications/export')
+@admin_required
+def export_applications():
+    # Titles are joined per batch with a single $in lookup
+    return export_response('applications',
+                           transform=lambda batch: Application.attach_opportunity_titles(db, batch),
+                           extra_fields=['opportunity_id'])
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
+# Extracted resume text is only needed on the application's own page
+APPLICATION_LIST_PROJECTION = {'resume_info.text': 0}
+
 @app.route('/admin/applications')
 @admin_required
 def manage_applications():
-    # Get all applications and populate with opportunity details
-    applications = list(db.applications.find().sort('created_at', -1))
-    
-    # Populate each application with its opportunity title
-    for application in applications:
-        opportunity = db.opportunities.find_one({'_id': application['opportunity_id']})
-        if opportunity:
-            application['opportunity_title'] = opportunity.get('title', 'Unknown Opportunity')
-        else:
-            application['opportunity_title'] = 'Opportunity Not Found'
+    # Get one page of applications with their opportunity titles in a single bulk lookup
+    cursor, per_page = get_cursor_params(request)
+    applications, pagination = paginate(db.applications, {}, cursor, per_page,
+                                        projection=APPLICATION_LIST_PROJECTION)
+    Application.attach_opportunity_titles(db, applications)
+
+    return render_template('admin/manage_applications.html', 
+                         applications=applications,
+                         pagination=pagination)
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
+@app.route('/admin/api/search')
+@admin_required
+def admin_search():
+    # Server-side search over the text indexes declared in utils/indexes.py
+    collection = request.args.get('collection', 'applications')
+    term = request.args.get('q', '')
+    status = request.args.get('status')
+    cursor, per_page = get_cursor_params(request)
+
+    if collection == 'applications':
+        query = build_search_query(term, {'opportunity_type': request.args.get('type'), 'status': status},
+                                   db.applications, ('name', 'email', 'phone', 'opportunity_title'))
+        applications, pagination = paginate(db.applications, query, cursor, per_page,
+                                            projection=APPLICATION_LIST_PROJECTION)
+        Application.attach_opportunity_titles(db, applications)
+        results = [{
+            'id': str(application['_id']),
+            'name': application.get('name'),
+            'email': application.get('email'),
+            'phone': application.get('phone'),
+            'opportunity_title': application['opportunity_title'],
+            'opportunity_type': application.get('opportunity_type'),
+            'status': application.get('status'),
+            'created_at': format_datetime(application.get('created_at')),
+            'view_url': url_for('view_application', application_id=application['_id']),
+            'delete_url': url_for('delete_application', application_id=application['_id'])
+        } for application in applications]
+    elif collection == 'opportunities':
+        query = build_search_query(term, {'type': request.args.get('type'), 'status': status},
+                                   db.opportunities, ('title', 'company', 'location'))
+        opportunities, pagination = paginate(db.opportunities, query, cursor, per_page,
+                                             projection={'description': 0})
+        results = [{
+            'id': str(opportunity['_id']),
+            'title': opportunity.get('title'),
+            'type': opportunity.get('type'),
+            'company': opportunity.get('company'),
+            'status': opportunity.get('status'),
+            'applications_count': opportunity.get('applications_count'),
+            'created_at': format_datetime(opportunity.get('created_at')),
+            'edit_url': url_for('edit_opportunity', opportunity_id=opportunity['_id']),
+            'delete_url': url_for('delete_opportunity', opportunity_id=opportunity['_id'])
+        } for opportunity in opportunities]
+    else:
+        return jsonify({'success': False, 'message': f'Unknown collection: {collection}'}), 400
 
-    return render_template('admin/manage_applications.html', applications=applications)
+    return jsonify({'success': True, 'results': results, 'pagination': pagination})
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
@@ -308,19 +1000,12 @@ def manage_applications():
 @admin_required
 def view_application(application_id):
     try:
-        # Find the application
-        application = db.applications.find_one({'_id': ObjectId(application_id)})
+        # Find the application along with its opportunity title
+        application = Application.get_by_id(db, application_id)
         if not application:
             flash('Application not found', 'danger')
             return redirect(url_for('manage_applications'))
         
-        # Get the associated opportunity
-        opportunity = db.opportunities.find_one({'_id': application['opportunity_id']})
-        if opportunity:
-            application['opportunity_title'] = opportunity.get('title', 'Unknown Opportunity')
-        else:
-            application['opportunity_title'] = 'Opportunity Not Found'
-        
         # Add resume filename for display
         if 'resume_path' in application:
             application['resume_filename'] = os.path.basename(application['resume_path'])
@@ -336,17 +1021,19 @@ def view_application(application_id):
 @app.route('/admin/users')
 @admin_required
 def manage_users():
-    users = list(db.users.find())
-    return render_template('admin/manage_users.html', users=users)
+    cursor, per_page = get_cursor_params(request)
+    users, pagination = paginate(db.users, {}, cursor, per_page, projection={'password': 0})
+    return render_template('admin/manage_users.html', users=users, pagination=pagination)
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
 
 @app.route('/admin/reset-user-password/<user_id>', methods=['POST'])
 @admin_required
+@log_activity
 def reset_user_password(user_id):
     new_password = request.form['new_password']
-    hashed_password = generate_password_hash(new_password, method='pbkdf2:sha256')
+    hashed_password = password_hasher.hash(new_password)
     
     db.users.update_one(
         {'_id': ObjectId(user_id)},
@@ -357,7 +1044,24 @@ def reset_user_password(user_id):
 
 #---------------------------------------------------------------------------------------------------------------------------------#
 
+@app.errorhandler(413)
+def upload_too_large(error):
+    max_mb = request._upload_limit() / (1024 * 1024)
+    flash(f'File is too large. Please upload a file under {max_mb:g} MB.', 'danger')
+    return redirect(request.url)
+
+@app.errorhandler(429)
+def rate_limited_response(error):
+    # Keep the 429 status and Retry-After, but answer login attempts with the login page
+    if request.endpoint == 'login':
+        flash(f'Too many login attempts. Please try again in {error.retry_after} seconds.', 'warning')
+        return render_template('login.html'), 429, {'Retry-After': str(error.retry_after)}
+    return error
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
 @app.route('/apply/<opportunity_type>/<opportunity_id>', methods=['GET', 'POST'])
+@limiter.limit_upload(APPLY_RATE, APPLY_UPLOAD_RATE)
 def apply(opportunity_type, opportunity_id):
     opportunity = db.opportunities.find_one({'_id': ObjectId(opportunity_id)})
     if not opportunity:
@@ -379,30 +1083,34 @@ def apply(opportunity_type, opportunity_id):
             return redirect(request.url)
         
         if resume and allowed_file(resume.filename):
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S_')
-            filename = timestamp + secure_filename(resume.filename)
-            
-            # Ensure the upload directory exists
-            uploads_dir = os.path.join(os.path.dirname(__file__), 'static', 'uploads', 'resumes')
-            os.makedirs(uploads_dir, exist_ok=True)
-            
-            # Save the file
-            resume_path = os.path.join(uploads_dir, filename)
-            resume.save(resume_path)
+            # Deduplicated by content hash; the type is checked from the file's first bytes
+            try:
+                filename = resume_store.save(db, resume)
+            except InvalidResume:
+                flash('Invalid file type. Please upload PDF, DOC, or DOCX files only.', 'danger')
+                return redirect(request.url)
             
             # Store only the filename in the database
             application = {
                 'opportunity_id': ObjectId(opportunity_id),
                 'opportunity_type': opportunity_type,
+                'opportunity_title': opportunity.get('title'),
                 'name': name,
                 'email': email,
                 'phone': phone,
                 'resume_path': filename,  # Store only filename
+                'resume_name': secure_filename(resume.filename),
                 'status': 'pending',
                 'created_at': datetime.utcnow()
             }
             
             db.applications.insert_one(application)
+            dashboard_stats.application_added(application)
+            try:
+                resume_pipeline.enqueue(db, filename)
+            except Exception as e:
+                # The application stands; `flask process-resumes --backfill` picks the file up later
+                print(f"Could not queue resume {filename} for processing: {e}")
             flash('Application submitted successfully!', 'success')
             return redirect(url_for('internships' if opportunity_type == 'internship' 
                                   else 'jobs' if opportunity_type == 'job' 
@@ -417,78 +1125,168 @@ def apply(opportunity_type, opportunity_id):
 
 @app.route('/admin/applications/delete/<application_id>', methods=['POST'])
 @admin_required
+@log_activity
 def delete_application(application_id):
     try:
         # Get the application to find the resume path
         application = db.applications.find_one({'_id': ObjectId(application_id)})
-        if application and 'resume_path' in application:
-            # Delete the resume file if it exists
-            try:
-                os.remove(application['resume_path'])
-            except (OSError, FileNotFoundError):
-                # Log this error but continue with application deletion
-                print(f"Could not delete resume file: {application['resume_path']}")
         
         # Delete the application from database
         result = db.applications.delete_one({'_id': ObjectId(application_id)})
         if result.deleted_count:
+            dashboard_stats.application_removed(application)
+            if 'resume_path' in application:
+                # Drop this application's reference; the file goes with the last one
+                try:
+                    resume_store.release(db, application['resume_path'])
+                except OSError:
+                    # Log this error but continue with application deletion
+                    print(f"Could not delete resume file: {application['resume_path']}")
             return jsonify({'success': True, 'message': 'Application deleted successfully'})
         return jsonify({'success': False, 'message': 'Application not found'})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
     
 #---------------------------------------------------------------------------------------------------------------------------------#
-def verify_pdf_file(file_path):
-    """Verify if a file is a valid PDF"""
-    try:
-        with open(file_path, 'rb') as f:
-            header = f.read(4)
-            # Check for PDF magic number
-            return header.startswith(b'%PDF')
-    except Exception as e:
-        print(f"Error verifying PDF: {e}")
-        return False
+
+APPLICATION_STATUSES = {'pending', 'accepted', 'rejected'}
+BULK_MAX_ITEMS = 500
+
+@app.route('/admin/applications/bulk', methods=['POST'])
+@admin_required
+@log_activity
+def bulk_applications():
+    """Change the status of, or delete, many applications in one bulk_write.
+
+    Expects JSON {"action": "status" | "delete", "ids": [...], "status": ...}
+    and reports an outcome for every id.
+    """
+    payload = request.get_json(silent=True) or {}
+    action = payload.get('action')
+    ids = payload.get('ids') or []
+    status = payload.get('status')
+    
+    if action not in ('status', 'delete'):
+        return jsonify({'success': False, 'message': 'action must be "status" or "delete"'}), 400
+    if action == 'status' and status not in APPLICATION_STATUSES:
+        return jsonify({'success': False,
+                        'message': f"status must be one of {', '.join(sorted(APPLICATION_STATUSES))}"}), 400
+    if not isinstance(ids, list) or not ids or len(ids) > BULK_MAX_ITEMS:
+        return jsonify({'success': False, 'message': f'Send between 1 and {BULK_MAX_ITEMS} ids'}), 400
     
+    results = {}
+    object_ids = []
+    for application_id in ids:
+        try:
+            object_ids.append(ObjectId(application_id))
+        except (InvalidId, TypeError):
+            results[str(application_id)] = 'invalid_id'
+    
+    # One read for the current state, one bulk_write for the change
+    applications = {
+        application['_id']: application
+        for application in db.applications.find({'_id': {'$in': object_ids}},
+                                                {'status': 1, 'created_at': 1, 'resume_path': 1})
+    }
+    for object_id in object_ids:
+        if object_id not in applications:
+            results[str(object_id)] = 'not_found'
+    
+    response = {'success': True, 'results': results}
+    if applications and action == 'status':
+        # Each update applies only to the status read above, so a match means our delta is exact
+        result = db.applications.bulk_write([
+            UpdateOne({'_id': object_id, 'status': application.get('status')}, {'$set': {'status': status}})
+            for object_id, application in applications.items()
+        ], ordered=False)
+        if result.matched_count == len(applications):
+            for object_id, application in applications.items():
+                dashboard_stats.application_updated(application, dict(application, status=status))
+                results[str(object_id)] = 'updated'
+        else:
+            # Some changed or went away meanwhile: report what is there now and recount
+            current = {application['_id']: application.get('status') for application in
+                       db.applications.find({'_id': {'$in': list(applications)}}, {'status': 1})}
+            for object_id in applications:
+                if object_id not in current:
+                    results[str(object_id)] = 'not_found'
+                else:
+                    results[str(object_id)] = 'updated' if current[object_id] == status else 'conflict'
+            dashboard_stats.invalidate()
+    elif applications:
+        result = db.applications.bulk_write([DeleteOne({'_id': object_id}) for object_id in applications],
+                                            ordered=False)
+        for object_id in applications:
+            results[str(object_id)] = 'deleted'
+        if result.deleted_count == len(applications):
+            for application in applications.values():
+                dashboard_stats.application_removed(application)
+            # Resume files are removed on the cleanup pool; slow ones finish in the background
+            resumes = {str(object_id): application['resume_path'] for object_id, application in applications.items()
+                       if application.get('resume_path')}
+            response['resumes'] = resume_store.release_many(db, resumes, timeout=5)
+        else:
+            # Another request deleted some of them and released their resumes; which
+            # ones is unknown, so leave the references rather than drop one twice
+            app.logger.warning("Bulk delete raced with another delete; resume references of %d "
+                               "applications were left in place", len(applications))
+            dashboard_stats.invalidate()
+    
+    return jsonify(response)
+
+#---------------------------------------------------------------------------------------------------------------------------------#
 # Add this new route to serve resume files securely
 @app.route('/admin/resume/<application_id>')
 @admin_required
 def serve_resume(application_id):
     try:
         # Get application
-        application = db.applications.find_one({'_id': ObjectId(application_id)})
+        application = db.applications.find_one({'_id': ObjectId(application_id)},
+                                               {'resume_path': 1, 'resume_name': 1})
         if not application or 'resume_path' not in application:
             flash('Resume not found', 'danger')
             return redirect(url_for('manage_applications'))
         
-        # Setup paths
-        base_dir = os.path.dirname(__file__)
-        uploads_dir = os.path.join(base_dir, 'static', 'uploads', 'resumes')
         filename = os.path.basename(application['resume_path'])
-        full_path = os.path.join(uploads_dir, filename)
         
-        # Check if file exists
-        if not os.path.exists(full_path):
+        # Check the file type from its leading bytes (cached per file)
+        try:
+            resume_type = resume_store.detect_type(filename)
+        except FileNotFoundError:
             flash('Resume file is missing', 'danger')
             return redirect(url_for('manage_applications'))
-        
-        # Verify PDF integrity
-        if not verify_pdf_file(full_path):
-            flash('Invalid or corrupted PDF file', 'danger')
+        if resume_type is None:
+            flash('Invalid or corrupted resume file', 'danger')
             return redirect(url_for('manage_applications'))
         
-        # Serve the file with proper headers
-        response = send_from_directory(
-            uploads_dir, 
-            filename,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
+        mimetype = RESUME_MIMETYPES[resume_type]
+        download_name = application.get('resume_name') or filename
+        # PDFs open inline so browser viewers can use range requests; ?download=1 forces a save
+        as_attachment = resume_type != 'pdf' or request.args.get('download') == '1'
         
-        # Add additional headers for PDF handling
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        if RESUME_ACCEL_MODE == 'nginx':
+            # The proxy sends the bytes (and handles ranges/conditionals); we only authorize
+            response = app.response_class(mimetype=mimetype)
+            response.headers['X-Accel-Redirect'] = RESUME_ACCEL_PREFIX + filename
+            response.headers.set('Content-Disposition',
+                                 'attachment' if as_attachment else 'inline',
+                                 filename=download_name)
+        else:
+            # Conditional GET (ETag/Last-Modified -> 304) and Range requests are
+            # handled by send_file; content-addressed files use their hash as ETag
+            response = send_from_directory(
+                resume_store.directory,
+                filename,
+                mimetype=mimetype,
+                as_attachment=as_attachment,
+                download_name=download_name,
+                etag=resume_store.content_hash(filename) or True,
+                max_age=3600
+            )
         
+        # Resumes are personal data: only the admin's browser may cache them
+        response.cache_control.public = False
+        response.cache_control.private = True
         return response
         
     except Exception as e:
@@ -543,5 +1341,162 @@ def debug_resume(application_id):
     
 #---------------------------------------------------------------------------------------------------------------------------------#
 
+# Async mode: with ASYNC_MODE=true the read-heavy views below replace their sync
+# versions and query MongoDB through Motor, running independent queries concurrently.
+ASYNC_MODE = os.getenv('ASYNC_MODE', 'false').lower() == 'true'
+
+if ASYNC_MODE:
+    adb = AsyncMongo(MONGODB_URI, MONGODB_DATABASE, event_listeners=[metrics.listener],
+                     **pool_options_from_env(MONGODB_URI))
+
+    async def render_listing_async(category):
+        cursor, per_page = get_cursor_params(request)
+        # The catalog snapshot is in memory; MongoDB is only the fallback
+        page = catalog.page(category, cursor, per_page)
+        if page is None:
+            page = await adb.run(
+                lambda db: paginate_async(db.opportunities, Opportunity.live_query(category), cursor, per_page))
+        opportunities, pagination = page
+        return render_template('opportunity_list.html',
+                             category=category,
+                             opportunities=opportunities,
+                             pagination=pagination)
+
+    @page_cache.cached('opportunities')
+    async def internships_async():
+        return await render_listing_async('internship')
+
+    @page_cache.cached('opportunities')
+    async def jobs_async():
+        return await render_listing_async('job')
+
+    @page_cache.cached('opportunities')
+    async def hackathons_async():
+        return await render_listing_async('hackathon')
+
+    @page_cache.cached('mock_tests')
+    async def mock_tests_async():
+        tests = await adb.run(lambda db: db.mock_tests.find({}, MOCK_TEST_LIST_PROJECTION).to_list(None))
+        return render_template('mock_tests.html', tests=tests)
+
+    @admin_required
+    async def admin_dashboard_async():
+        # Counters and recent activity are independent, so fetch them concurrently
+        cached, recent_activities = await asyncio.gather(
+            dashboard_stats.get_async(adb),
+            adb.run(lambda db: db.activity_log.find().sort('timestamp', -1).limit(10).to_list(10))
+        )
+        stats = {
+            'total_opportunities': cached['opportunities']['total'],
+            'active_applications': cached['applications']['pending'],
+            'total_users': cached['users']['total'],
+            'new_applications': cached['applications']['new']
+        }
+        return render_template('admin/dashboard.html',
+                             stats=stats,
+                             recent_activities=recent_activities)
+
+    @admin_required
+    async def manage_applications_async():
+        cursor, per_page = get_cursor_params(request)
+
+        async def load(db):
+            applications, pagination = await paginate_async(db.applications, {}, cursor, per_page,
+                                                            projection=APPLICATION_LIST_PROJECTION)
+            await Application.attach_opportunity_titles_async(db, applications)
+            return applications, pagination
+
+        applications, pagination = await adb.run(load)
+        return render_template('admin/manage_applications.html',
+                             applications=applications,
+                             pagination=pagination)
+
+    @admin_required
+    async def view_application_async(application_id):
+        try:
+            application = await adb.run(lambda db: Application.get_by_id_async(db, application_id))
+            if not application:
+                flash('Application not found', 'danger')
+                return redirect(url_for('manage_applications'))
+
+            if 'resume_path' in application:
+                application['resume_filename'] = os.path.basename(application['resume_path'])
+
+            return render_template('admin/view_application.html',
+                                application=application)
+        except Exception as e:
+            flash(f'Error viewing application: {str(e)}', 'danger')
+            return redirect(url_for('manage_applications'))
+
+    app.view_functions.update({
+        'internships': internships_async,
+        'jobs': jobs_async,
+        'hackathons': hackathons_async,
+        'mock_tests': mock_tests_async,
+        'admin_dashboard': admin_dashboard_async,
+        'manage_applications': manage_applications_async,
+        'view_application': view_application_async
+    })
+
+startup.mark('register routes')
+
+#---------------------------------------------------------------------------------------------------------------------------------#
+
+def run_startup_tasks():
+    """Run one-off startup tasks and return the app.
+
+    The app, its MongoDB client, caches and pools are built when this module
+    is imported; this only prepares what they need (indexes, assets, the
+    catalog and search index, compiled templates). Used as the gunicorn
+    entry point ("app:run_startup_tasks()"); with preload_app it runs once
+    in the master instead of once per worker.
+    """
+    # Create the indexes our queries rely on (no-op when they already exist)
+    with startup.phase('ensure indexes'):
+        try:
+            if os.getenv('MONGODB_ENSURE_INDEXES', 'true').lower() == 'true':
+                _, conflicts = ensure_indexes(db)
+                for collection, indexes in conflicts.items():
+                    print(f"Index conflicts in {collection} (fix with `flask ensure-indexes --rebuild`): "
+                          f"{', '.join(name for name, _ in indexes)}")
+            if os.getenv('MONGODB_CHECK_INDEXES', 'false').lower() == 'true':
+                for query, stages in check_indexes(db).items():
+                    print(f"Query {query} does a collection scan: {stages}")
+        except Exception as e:
+            print(f"Could not prepare MongoDB indexes: {e}")
+    # Build static assets (files already built are kept); skip with a prebuilt static/dist
+    with startup.phase('build static assets'):
+        if assets.enabled and os.getenv('ASSETS_BUILD_ON_START', 'true').lower() == 'true':
+            try:
+                assets.build()
+            except Exception as e:
+                print(f"Could not build static assets: {e}")
+    # Make sure this host has a current catalog snapshot before workers read it
+    with startup.phase('build catalog snapshot'):
+        if catalog.available:
+            try:
+                catalog.refresh()
+            except Exception as e:
+                print(f"Could not build the opportunity catalog: {e}")
+    # Build the search index before forking so workers start with a copy of it
+    with startup.phase('build search index'):
+        if search_index.available:
+            try:
+                search_index.rebuild()
+            except Exception as e:
+                print(f"Could not build the search index: {e}")
+    # Compile every template now rather than on the first request that renders
+    # it; with preload_app the compiled templates are inherited by each worker
+    with startup.phase('precompile templates'):
+        try:
+            precompile_templates(app)
+        except Exception as e:
+            print(f"Could not precompile templates: {e}")
+    # Drop the startup connection so forked workers do not inherit its sockets
+    mongo.close()
+    if os.getenv('STARTUP_REPORT', 'false').lower() == 'true':
+        print(f"Startup timing (pid {os.getpid()}):\n{startup.report()}")
+    return app
+
 if __name__ == '__main__':
-    app.run()
\ No newline at end of file
+    run_startup_tasks().run()
\ No newline at end of file
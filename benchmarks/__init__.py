@@ -0,0 +1,4 @@
+"""Seeded data generator, per-view micro-benchmarks and a concurrent load scenario.
+
+Run against a local mongod with `python -m benchmarks --help`.
+"""
@@ -0,0 +1,152 @@
+"""Benchmark runner.
+
+    python -m benchmarks seed --opportunities 1000 --applications 5000 --users 100
+    python -m benchmarks micro --iterations 50 --json micro.json
+    python -m benchmarks load --concurrency 16 --duration 30 --json load.json
+    python -m benchmarks compare before.json after.json
+
+Everything runs against MONGODB_URI (default: a local mongod) in the
+career_portal_bench database, with resumes stored in a scratch folder.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+
+DEFAULT_URI = 'mongodb://localhost:27017/'
+DEFAULT_DATABASE = 'career_portal_bench'
+
+
+def load_app(args):
+    """Import the app pointed at the benchmark database with command counting enabled"""
+    from pymongo import monitoring
+    from benchmarks.report import CommandCounter
+
+    os.environ.setdefault('MONGODB_URI', DEFAULT_URI)
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    # Every simulated client shares one address; measure the views, not the limiter
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    os.environ['MONGODB_DATABASE'] = args.database
+    counter = CommandCounter()
+    # Must be registered before the app's (lazily created) client connects
+    monitoring.register(counter)
+
+    import app as appmod
+    appmod.resume_store.directory = args.uploads
+    appmod.app.config['UPLOAD_FOLDER'] = args.uploads
+    os.makedirs(args.uploads, exist_ok=True)
+    appmod.run_startup_tasks()
+    return appmod, counter
+
+
+def seed_command(args):
+    from benchmarks import datagen
+    appmod, _ = load_app(args)
+    counts = datagen.seed(appmod.db, appmod.resume_store, appmod.password_hasher.hash(datagen.PASSWORD),
+                          opportunities=args.opportunities, applications=args.applications,
+                          users=args.users, mock_attempts=args.mock_attempts, seed=args.seed)
+    # The seeded catalog replaces whatever snapshot an earlier seed left behind
+    appmod.catalog.publish()
+    appmod.run_startup_tasks()
+    for collection, count in counts.items():
+        print(f'{collection}: {count}')
+
+
+def micro_command(args):
+    from benchmarks import micro
+    appmod, counter = load_app(args)
+    results = micro.run(appmod, counter, iterations=args.iterations, warmup=args.warmup,
+                        only=args.only, seed=args.seed)
+    finish(args, results, iterations=args.iterations, warmup=args.warmup)
+
+
+def load_command(args):
+    from benchmarks import load
+    appmod, counter = load_app(args)
+    server = None
+    if args.url:
+        # External server (started with the same MONGODB_DATABASE): count ops from
+        # the server's own counters, which include any other clients
+        def ops():
+            counters = appmod.mongo.client.admin.command('serverStatus')['opcounters']
+            return sum(counters[key] for key in ('query', 'insert', 'update', 'delete', 'getmore', 'command'))
+        base_url = args.url
+    else:
+        from werkzeug.serving import make_server
+        server = make_server('127.0.0.1', 0, appmod.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{server.server_port}'
+
+        def ops():
+            return counter.count
+
+    scenario = load.Scenario(appmod.db, seed=args.seed)
+    results = load.run(base_url, scenario, ops, concurrency=args.concurrency,
+                       duration=args.duration, seed=args.seed)
+    if server:
+        server.shutdown()
+    finish(args, results, concurrency=args.concurrency, duration=args.duration,
+           server=args.url or 'werkzeug (in-process)')
+
+
+def finish(args, results, **settings):
+    from benchmarks import report
+    report.print_table(results)
+    if args.json:
+        report.write(args.json, {'meta': report.metadata(database=args.database, seed=args.seed, **settings),
+                                 'results': results})
+        print(f'Wrote {args.json}')
+
+
+def compare_command(args):
+    from benchmarks import report
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    report.compare(old, new, metric=args.metric)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--uploads', default=os.path.join(tempfile.gettempdir(), 'career-portal-bench-resumes'))
+    parser.add_argument('--seed', type=int, default=42)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed = commands.add_parser('seed', help='drop and regenerate the benchmark data')
+    seed.add_argument('--opportunities', type=int, default=1000)
+    seed.add_argument('--applications', type=int, default=5000)
+    seed.add_argument('--users', type=int, default=100)
+    seed.add_argument('--mock-attempts', type=int, default=2000)
+    seed.set_defaults(func=seed_command)
+
+    micro = commands.add_parser('micro', help='time every view in-process')
+    micro.add_argument('--iterations', type=int, default=50)
+    micro.add_argument('--warmup', type=int, default=5)
+    micro.add_argument('--only', nargs='*', help='run benchmarks whose name contains any of these')
+    micro.add_argument('--json', help='write results to this file')
+    micro.set_defaults(func=micro_command)
+
+    load = commands.add_parser('load', help='run the concurrent mixed workload')
+    load.add_argument('--concurrency', type=int, default=8)
+    load.add_argument('--duration', type=float, default=30)
+    load.add_argument('--url', help='benchmark a running server instead of an in-process one')
+    load.add_argument('--json', help='write results to this file')
+    load.set_defaults(func=load_command)
+
+    compare = commands.add_parser('compare', help='compare two JSON reports')
+    compare.add_argument('old')
+    compare.add_argument('new')
+    compare.add_argument('--metric', default='p95_ms')
+    compare.set_defaults(func=compare_command)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import io
+import random
+import zlib
+from datetime import datetime, timedelta
+from werkzeug.datastructures import FileStorage
+from utils.mock_tests import MockTestGrader, validate_test
+
+ADMIN_USERNAME = 'bench-admin'
+RESET_USERNAME = 'bench-reset'
+PASSWORD = 'benchmark-password'
+
+OPPORTUNITY_TYPES = ['internship', 'job', 'hackathon']
+APPLICATION_STATUSES = ['pending', 'accepted', 'rejected']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries',
+             'Wayne Enterprises', 'Cyberdyne', 'Soylent', 'Wonka Industries']
+LOCATIONS = ['Bengaluru', 'Pune', 'Mumbai', 'Hyderabad', 'Delhi', 'Chennai', 'Remote']
+ROLES = ['Software Engineer', 'Data Analyst', 'Frontend Developer', 'Backend Developer',
+         'ML Engineer', 'Product Designer', 'DevOps Engineer', 'Security Analyst']
+WORDS = ('build ship scale team product users data cloud python react mongo api design '
+         'test deploy learn mentor impact remote hybrid startup growth ownership').split()
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Kavya', 'Rohan', 'Saanvi', 'Vivaan', 'Ananya',
+               'Arjun', 'Meera', 'Kabir', 'Tara']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Nair', 'Kulkarni', 'Das']
+MOCK_TEST_QUESTIONS = 40
+
+
+def _sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def resume_blob(rng):
+    """Return (filename, bytes) for a resume of realistic size and format.
+
+    Most are PDFs of roughly 40 KB to 1 MB with compressed text streams
+    (so the bytes are not trivially compressible); the rest are DOCX files.
+    """
+    size = int(min(max(rng.lognormvariate(11.8, 0.7), 20 * 1024), 2 * 1024 * 1024))
+    text = ' '.join(_sentence(rng, 12) for _ in range(64)).encode()
+    stream = zlib.compress(text) + rng.randbytes(size)
+    if rng.random() < 0.8:
+        body = (b'%PDF-1.4\n1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n'
+                b'3 0 obj\n<< /Length ' + str(len(stream)).encode() + b' /Filter /FlateDecode >>\nstream\n'
+                + stream + b'\nendstream\nendobj\ntrailer\n<< /Root 1 0 R >>\n%%EOF\n')
+        return 'resume.pdf', body
+    return 'resume.docx', b'PK\x03\x04' + stream
+
+
+def opportunity_document(rng, now):
+    created_at = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+    is_paid = rng.random() < 0.6
+    opportunity = {
+        'title': f'{rng.choice(ROLES)} {rng.choice(["Intern", "I", "II", "Lead", "Fellow"])}',
+        'description': ' '.join(_sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(3, 8))),
+        'type': rng.choice(OPPORTUNITY_TYPES),
+        'link': f'https://example.com/jobs/{rng.getrandbits(48):x}',
+        'company': rng.choice(COMPANIES),
+        'location': rng.choice(LOCATIONS),
+        'deadline': (created_at + timedelta(days=rng.randint(7, 90))).replace(hour=0, minute=0, second=0,
+                                                                             microsecond=0),
+        'created_at': created_at,
+        'status': 'active' if rng.random() < 0.9 else 'inactive',
+        'is_paid': is_paid
+    }
+    if is_paid:
+        opportunity['payment_amount'] = float(rng.randrange(5000, 150000, 500))
+    return opportunity
+
+
+def mock_test_definition(rng, role, questions=MOCK_TEST_QUESTIONS):
+    """A timed multiple-choice test in the format `flask import-mock-test` reads"""
+    return {
+        'title': f'{role} Mock Test',
+        'description': _sentence(rng, 15),
+        'duration_minutes': 60,
+        'questions': [{'text': _sentence(rng, 12), 'options': [_sentence(rng, 3) for _ in range(4)],
+                       'answer': rng.randrange(4)} for _ in range(questions)]
+    }
+
+
+def _batches(documents, size=1000):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(db, resume_store, password_hash, opportunities=1000, applications=5000, users=100,
+         seed=42, duplicate_resumes=0.05, mock_attempts=2000):
+    """Drop and repopulate the benchmark database deterministically.
+
+    password_hash is reused for every user so seeding does not spend
+    minutes hashing. Returns the number of documents written per collection.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for collection in ('opportunities', 'applications', 'users', 'resumes', 'activity_log', 'mock_tests',
+                       'mock_test_attempts', 'mock_test_stats', 'opportunities_archive', 'applications_archive'):
+        db[collection].drop()
+
+    opportunity_docs = [opportunity_document(rng, now) for _ in range(opportunities)]
+    for batch in _batches(opportunity_docs):
+        db.opportunities.insert_many(batch)
+
+    usernames = [ADMIN_USERNAME, RESET_USERNAME] + [f'user{i}' for i in range(max(users - 2, 0))]
+    db.users.insert_many([{
+        'username': username,
+        'email': f'{username}@example.com',
+        'password': password_hash,
+        'role': 'admin' if username == ADMIN_USERNAME else 'user',
+        'is_admin': username == ADMIN_USERNAME,
+        'created_at': now - timedelta(days=rng.randint(0, 365)),
+        'last_login': None,
+        'is_active': True
+    } for username in usernames])
+
+    def application_documents():
+        stored = []
+        for _ in range(applications):
+            opportunity = rng.choice(opportunity_docs)
+            if stored and rng.random() < duplicate_resumes:
+                filename, resume_name = rng.choice(stored)
+                db.resumes.update_one({'_id': filename}, {'$inc': {'refs': 1}})
+            else:
+                resume_name, blob = resume_blob(rng)
+                filename = resume_store.save(db, FileStorage(io.BytesIO(blob), filename=resume_name))
+                stored.append((filename, resume_name))
+            name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+            yield {
+                'opportunity_id': opportunity['_id'],
+                'opportunity_type': opportunity['type'],
+                'opportunity_title': opportunity['title'],
+                'name': name,
+                'email': f"{name.lower().replace(' ', '.')}{rng.randint(1, 999)}@example.com",
+                'phone': f'+91{rng.randint(7000000000, 9999999999)}',
+                'resume_path': filename,
+                'resume_name': resume_name,
+                'status': rng.choice(APPLICATION_STATUSES),
+                'created_at': opportunity['created_at'] + timedelta(minutes=rng.randint(1, 60 * 24 * 30))
+            }
+
+    for batch in _batches(application_documents()):
+        db.applications.insert_many(batch)
+
+    db.activity_log.insert_many([{
+        'action': rng.choice(['add_opportunity', 'edit_opportunity', 'delete_application']),
+        'username': ADMIN_USERNAME,
+        'path': '/admin/opportunities',
+        'timestamp': now - timedelta(minutes=i)
+    } for i in range(50)])
+    db.mock_tests.insert_many([{
+        'title': f'{role} Assessment',
+        'description': _sentence(rng, 15),
+        'link': f'https://example.com/tests/{i}'
+    } for i, role in enumerate(ROLES)])
+
+    # Hosted tests, with a graded cohort so result pages have statistics to show
+    test_ids = db.mock_tests.insert_many([validate_test(mock_test_definition(rng, role))
+                                          for role in ROLES[:2]]).inserted_ids
+    for batch in _batches({
+        'test_id': test_ids[0],
+        'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+        'status': 'submitted',
+        'answers': {str(q): rng.randrange(4) for q in range(MOCK_TEST_QUESTIONS) if rng.random() < 0.9},
+        'started_at': now - timedelta(hours=2),
+        'expires_at': now - timedelta(hours=1),
+        'submitted_at': now - timedelta(hours=1)
+    } for _ in range(mock_attempts)):
+        db.mock_test_attempts.insert_many(batch)
+    grader = MockTestGrader()
+    if grader.available:
+        grader.run(db, once=True)
+
+    return {collection: db[collection].count_documents({})
+            for collection in ('opportunities', 'applications', 'users', 'resumes', 'mock_test_attempts')}
@@ -0,0 +1,164 @@
+import http.client
+import random
+import threading
+import time
+import uuid
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+from benchmarks.datagen import ADMIN_USERNAME, PASSWORD, resume_blob
+from benchmarks.report import summarize
+
+# Weighted request mix: (name, weight). Public listings dominate, as in production.
+SCENARIO = [
+    ('internships', 20),
+    ('jobs', 20),
+    ('hackathons', 10),
+    ('api_opportunities', 10),
+    ('apply_submit', 8),
+    ('login_submit', 2),
+    ('admin_dashboard', 8),
+    ('manage_applications', 8),
+    ('view_application', 6),
+    ('manage_opportunities', 4),
+    ('admin_search', 4),
+]
+
+
+def _multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, content) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+class Client:
+    """Keep-alive HTTP client holding its own session cookie"""
+    def __init__(self, base_url):
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.connection = None
+        self.cookies = {}
+
+    def request(self, method, path, body=None, content_type=None):
+        headers = {'Accept-Encoding': 'gzip, br'}
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        if content_type:
+            headers['Content-Type'] = content_type
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # The server closed an idle keep-alive connection; reconnect once
+                self.connection.close()
+                self.connection = None
+                if attempt:
+                    raise
+        for header in response.headers.get_all('Set-Cookie') or []:
+            for name, morsel in SimpleCookie(header).items():
+                self.cookies[name] = morsel.value
+        return response.status
+
+    def login(self):
+        return self.request('POST', '/login', urlencode({'username': ADMIN_USERNAME, 'password': PASSWORD}),
+                            'application/x-www-form-urlencoded')
+
+
+class Scenario:
+    """Builds the requests of the mixed workload from seeded sample data"""
+    def __init__(self, db, seed=42):
+        self.opportunities = list(db.opportunities.find({'status': 'active'}, {'type': 1}).limit(200))
+        self.applications = [a['_id'] for a in db.applications.find({}, {'_id': 1}).limit(200)]
+        self.terms = sorted({o['title'].split()[0] for o in db.opportunities.find({}, {'title': 1}).limit(200)})
+        self.seed = seed
+
+    def request(self, name, rng):
+        """Return (method, path, body, content type) for a named request"""
+        if name in ('internships', 'jobs', 'hackathons'):
+            return 'GET', f'/{name}', None, None
+        if name == 'api_opportunities':
+            return 'GET', f"/api/v1/opportunities?type={rng.choice(['internship', 'job', 'hackathon'])}", None, None
+        if name == 'apply_submit':
+            opportunity = rng.choice(self.opportunities)
+            resume_name, blob = resume_blob(rng)
+            body, content_type = _multipart(
+                {'name': 'Load Applicant', 'email': 'load@example.com', 'phone': '+919999999999'},
+                {'resume': (resume_name, blob)})
+            return 'POST', f"/apply/{opportunity['type']}/{opportunity['_id']}", body, content_type
+        if name == 'login_submit':
+            return ('POST', '/login', urlencode({'username': ADMIN_USERNAME, 'password': PASSWORD}),
+                    'application/x-www-form-urlencoded')
+        if name == 'admin_dashboard':
+            return 'GET', '/admin/dashboard', None, None
+        if name == 'manage_applications':
+            return 'GET', '/admin/applications', None, None
+        if name == 'view_application':
+            return 'GET', f'/admin/applications/{rng.choice(self.applications)}', None, None
+        if name == 'manage_opportunities':
+            return 'GET', '/admin/opportunities', None, None
+        if name == 'admin_search':
+            return 'GET', f'/admin/api/search?collection=applications&q={rng.choice(self.terms)}', None, None
+        raise ValueError(f'Unknown request {name}')
+
+
+def run(base_url, scenario, ops_counter, concurrency=8, duration=30, seed=42):
+    """Drive the weighted mix from concurrency threads for duration seconds.
+
+    ops_counter() returns a running total of MongoDB operations; the delta
+    over the run gives ops per request. Returns {name: summary} plus 'total'.
+    """
+    names = [name for name, _ in SCENARIO]
+    weights = [weight for _, weight in SCENARIO]
+    latencies = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(concurrency + 1)
+    stop_at = []
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        client = Client(base_url)
+        # Admin pages need a session; logging in is not part of the measurement
+        client.login()
+        start_barrier.wait()
+        while time.perf_counter() < stop_at[0]:
+            name = rng.choices(names, weights)[0]
+            method, path, body, content_type = scenario.request(name, rng)
+            started = time.perf_counter()
+            try:
+                status = client.request(method, path, body, content_type)
+            except (OSError, http.client.HTTPException):
+                status = 599
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies[name].append(elapsed)
+                if status >= 400:
+                    errors[name] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    ops_before = ops_counter()
+    stop_at.append(time.perf_counter() + duration)
+    started = time.perf_counter()
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    ops = ops_counter() - ops_before
+
+    total_requests = sum(len(values) for values in latencies.values())
+    results = {f'load:{name}': summarize(latencies[name], elapsed, errors[name]) for name in names}
+    results['load:total'] = summarize([value for values in latencies.values() for value in values],
+                                      elapsed, sum(errors.values()), ops if total_requests else None)
+    return results
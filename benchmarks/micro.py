@@ -0,0 +1,199 @@
+import io
+import json
+import random
+import time
+from datetime import datetime
+from bson import ObjectId
+from werkzeug.datastructures import FileStorage
+from benchmarks.datagen import ADMIN_USERNAME, RESET_USERNAME, PASSWORD, opportunity_document, resume_blob
+from benchmarks.report import summarize
+from models import MockTest
+
+
+class Context:
+    """Sample ids and fixtures shared by the benchmark request builders"""
+    def __init__(self, appmod, seed=42):
+        self.appmod = appmod
+        self.db = appmod.db
+        self.rng = random.Random(seed)
+        self.opportunity = self.db.opportunities.find_one({'status': 'active'})
+        self.application = self.db.applications.find_one({})
+        self.reset_user = self.db.users.find_one({'username': RESET_USERNAME})
+        self.search_term = self.opportunity['title'].split()[0]
+        self.mock_test = self.db.mock_tests.find_one({'question_count': {'$gt': 0}})
+        self.graded_attempt = self.db.mock_test_attempts.find_one({'status': 'graded'}, {'test_id': 1})
+        self._open_attempt = None
+
+    def new_opportunity(self):
+        opportunity = opportunity_document(self.rng, datetime.utcnow())
+        return str(self.db.opportunities.insert_one(opportunity).inserted_id)
+
+    def new_application(self):
+        resume_name, blob = resume_blob(self.rng)
+        filename = self.appmod.resume_store.save(self.db, FileStorage(io.BytesIO(blob), filename=resume_name))
+        application = dict(self.application, _id=ObjectId(), resume_path=filename,
+                           resume_name=resume_name, created_at=datetime.utcnow())
+        return str(self.db.applications.insert_one(application).inserted_id)
+
+    def resume_upload(self):
+        resume_name, blob = resume_blob(self.rng)
+        return (io.BytesIO(blob), resume_name)
+
+    def new_mock_attempt(self):
+        return MockTest.start_attempt(self.db, self.mock_test, 'Bench Candidate', 'bench@example.com')['_id']
+
+    def open_mock_attempt(self):
+        # Answers are saved into one attempt, started on first use
+        if self._open_attempt is None:
+            self._open_attempt = self.new_mock_attempt()
+        return self._open_attempt
+
+    def opportunity_form(self):
+        return {
+            'title': 'Benchmark Engineer', 'description': 'Benchmark opportunity',
+            'type': 'job', 'link': 'https://example.com/bench', 'company': 'Acme Corp',
+            'location': 'Remote', 'deadline': '2030-01-01', 'status': 'active', 'is_paid': 'false'
+        }
+
+
+def _get(path):
+    return lambda ctx: {'method': 'GET', 'path': path(ctx) if callable(path) else path}
+
+
+def _cold(path, namespace):
+    """GET that bypasses the rendered page cache by invalidating it first"""
+    def build(ctx):
+        ctx.appmod.page_cache.invalidate(namespace)
+        return {'method': 'GET', 'path': path}
+    return build
+
+
+def _mock_test(test_id, attempt_id, method='GET', suffix='', **request):
+    """A request made by the browser holding attempt_id in its session"""
+    return dict(request, method=method, path=f'/mock-tests/{test_id}{suffix}',
+                session={'mock_attempts': {str(test_id): str(attempt_id)}})
+
+
+def _opportunity_path(ctx):
+    return f"/admin/opportunity/{ctx.opportunity['_id']}"
+
+
+def _application_path(ctx):
+    return f"/admin/applications/{ctx.application['_id']}"
+
+
+# (benchmark name, needs an admin session, request builder). Builders run
+# outside the timed section, so per-iteration fixtures (e.g. a fresh
+# opportunity to delete) do not count towards the view's latency; a
+# 'session' entry is stored in the client's session before the request.
+BENCHMARKS = [
+    ('home', False, _get('/')),
+    ('healthz', False, _get('/healthz')),
+    ('readyz', False, _get('/readyz')),
+    ('login_form', False, _get('/login')),
+    ('login_submit', False, lambda ctx: {'method': 'POST', 'path': '/login',
+                                         'data': {'username': ADMIN_USERNAME, 'password': PASSWORD}}),
+    ('logout', False, _get('/logout')),
+    ('internships', False, _get('/internships')),
+    ('internships_uncached', False, _cold('/internships', 'opportunities')),
+    ('jobs', False, _get('/jobs')),
+    ('jobs_uncached', False, _cold('/jobs', 'opportunities')),
+    ('hackathons', False, _get('/hackathons')),
+    ('hackathons_uncached', False, _cold('/hackathons', 'opportunities')),
+    ('mock_tests', False, _get('/mock-tests')),
+    ('mock_tests_uncached', False, _cold('/mock-tests', 'mock_tests')),
+    ('take_mock_test', False, lambda ctx: _mock_test(ctx.mock_test['_id'], ctx.open_mock_attempt())),
+    ('save_mock_test_answer', False, lambda ctx: _mock_test(
+        ctx.mock_test['_id'], ctx.open_mock_attempt(), 'POST', '/answer', content_type='application/json',
+        data=json.dumps({'question': ctx.rng.randrange(ctx.mock_test['question_count']),
+                         'choice': ctx.rng.randrange(4)}))),
+    ('submit_mock_test', False, lambda ctx: _mock_test(
+        ctx.mock_test['_id'], ctx.new_mock_attempt(), 'POST', '/submit',
+        data={f'q{q}': ctx.rng.randrange(4) for q in range(ctx.mock_test['question_count'])})),
+    ('mock_test_result', False, lambda ctx: _mock_test(
+        ctx.graded_attempt['test_id'], ctx.graded_attempt['_id'], suffix='/result')),
+    ('activity_points', False, _get('/activity-points')),
+    ('api_opportunities', False, _get('/api/v1/opportunities?per_page=50')),
+    ('api_opportunities_search', False, _get(lambda ctx: f'/api/v1/opportunities/search?q={ctx.search_term}')),
+    ('api_opportunities_search_filtered', False, _get(
+        lambda ctx: f'/api/v1/opportunities/search?q={ctx.search_term}&type=job&paid=true&per_page=50')),
+    ('apply_form', False, _get(lambda ctx: f"/apply/{ctx.opportunity['type']}/{ctx.opportunity['_id']}")),
+    ('apply_submit', False, lambda ctx: {
+        'method': 'POST', 'path': f"/apply/{ctx.opportunity['type']}/{ctx.opportunity['_id']}",
+        'data': {'name': 'Bench Applicant', 'email': 'bench@example.com', 'phone': '+919999999999',
+                 'resume': ctx.resume_upload()},
+        'content_type': 'multipart/form-data'}),
+    ('admin', True, _get('/admin')),
+    ('admin_dashboard', True, _get('/admin/dashboard')),
+    ('manage_opportunities', True, _get('/admin/opportunities')),
+    ('edit_opportunity_form', True, _get(_opportunity_path)),
+    ('edit_opportunity_submit', True, lambda ctx: {
+        'method': 'POST', 'path': f'/admin/opportunity/{ctx.new_opportunity()}',
+        'data': ctx.opportunity_form()}),
+    ('add_opportunity_form', True, _get('/admin/opportunity/add')),
+    ('add_opportunity_submit', True, lambda ctx: {
+        'method': 'POST', 'path': '/admin/opportunity/add', 'data': ctx.opportunity_form()}),
+    ('delete_opportunity', True, lambda ctx: {
+        'method': 'POST', 'path': f'/admin/opportunity/delete/{ctx.new_opportunity()}'}),
+    ('import_opportunities_form', True, _get('/admin/opportunities/import')),
+    ('import_opportunities_submit', True, lambda ctx: {
+        'method': 'POST', 'path': '/admin/opportunities/import',
+        'data': {'file': (io.BytesIO(b'title,description,type,link\n' + b''.join(
+            b'Imported %d,Benchmark import,job,https://example.com/%d\n' % (i, i) for i in range(100))),
+            'opportunities.csv')},
+        'content_type': 'multipart/form-data'}),
+    ('export_opportunities', True, _get('/admin/opportunities/export?format=csv')),
+    ('export_applications', True, _get('/admin/applications/export?format=jsonl')),
+    ('manage_applications', True, _get('/admin/applications')),
+    ('admin_search', True, _get(lambda ctx: f'/admin/api/search?collection=applications&q={ctx.search_term}')),
+    ('view_application', True, _get(_application_path)),
+    ('manage_users', True, _get('/admin/users')),
+    ('reset_user_password', True, lambda ctx: {
+        'method': 'POST', 'path': f"/admin/reset-user-password/{ctx.reset_user['_id']}",
+        'data': {'new_password': PASSWORD}}),
+    ('delete_application', True, lambda ctx: {
+        'method': 'POST', 'path': f'/admin/applications/delete/{ctx.new_application()}'}),
+    ('bulk_applications_status', True, lambda ctx: {
+        'method': 'POST', 'path': '/admin/applications/bulk',
+        'data': json.dumps({'action': 'status', 'status': 'pending',
+                            'ids': [str(ctx.application['_id'])]}),
+        'content_type': 'application/json'}),
+    ('serve_resume', True, _get(lambda ctx: f"/admin/resume/{ctx.application['_id']}")),
+    ('debug_resume', True, _get(lambda ctx: f"/admin/debug-resume/{ctx.application['_id']}")),
+]
+
+
+def run(appmod, counter, iterations=50, warmup=5, only=None, seed=42):
+    """Time each view through the Flask test client, returning {name: summary}"""
+    ctx = Context(appmod, seed=seed)
+    results = {}
+    for name, admin, build in BENCHMARKS:
+        if only and not any(pattern in name for pattern in only):
+            continue
+        client = appmod.app.test_client()
+        if admin:
+            with client.session_transaction() as session:
+                session['is_admin'] = True
+                session['username'] = ADMIN_USERNAME
+
+        latencies, errors, ops = [], 0, 0
+        for iteration in range(warmup + iterations):
+            request = build(ctx)
+            if 'session' in request:
+                with client.session_transaction() as session:
+                    session.update(request.pop('session'))
+            ops_before = counter.count
+            request_started = time.perf_counter()
+            response = client.open(request.pop('path'), **request)
+            response.get_data()
+            elapsed = time.perf_counter() - request_started
+            response.close()
+            if iteration < warmup:
+                continue
+            ops += counter.count - ops_before
+            latencies.append(elapsed)
+            if response.status_code >= 400:
+                errors += 1
+        # Throughput of a single client: requests per second of time spent in the view
+        results[name] = summarize(latencies, sum(latencies), errors, ops)
+    return results
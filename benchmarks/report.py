@@ -0,0 +1,109 @@
+import json
+import platform
+import subprocess
+import threading
+from datetime import datetime
+from pymongo import monitoring
+
+# Driver commands that are not issued by the application itself
+IGNORED_COMMANDS = {'endSessions', 'isMaster', 'ismaster', 'hello', 'serverStatus'}
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts MongoDB commands sent by this process.
+
+    Register it with pymongo.monitoring.register() before the app's client
+    is first used. Commands issued by background writers (activity log,
+    last_login) are counted too, whenever they happen to flush.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in IGNORED_COMMANDS:
+            with self._lock:
+                self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies, elapsed, errors=0, mongo_ops=None):
+    """Summary statistics for a list of latencies in seconds (reported in ms)"""
+    latencies = sorted(latencies)
+    requests = len(latencies)
+
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        'requests': requests,
+        'errors': errors,
+        'mean_ms': ms(sum(latencies) / requests) if requests else None,
+        'p50_ms': ms(percentile(latencies, 0.50)),
+        'p95_ms': ms(percentile(latencies, 0.95)),
+        'p99_ms': ms(percentile(latencies, 0.99)),
+        'max_ms': ms(latencies[-1]) if latencies else None,
+        'throughput_rps': round(requests / elapsed, 2) if elapsed else None,
+        'mongo_ops_per_request': round(mongo_ops / requests, 2) if requests and mongo_ops is not None else None
+    }
+
+
+def metadata(**settings):
+    def git(*args):
+        try:
+            return subprocess.check_output(['git', *args], stderr=subprocess.DEVNULL, text=True).strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': settings
+    }
+
+
+def write(path, report):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def print_table(results):
+    print(f"{'benchmark':<34} {'req':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'ops/req':>8}")
+    for name, stats in results.items():
+        def cell(key, width):
+            value = stats.get(key)
+            return f"{'-' if value is None else value:>{width}}"
+        print(f"{name:<34} {cell('requests', 6)} {cell('errors', 4)} {cell('p50_ms', 9)} {cell('p95_ms', 9)} "
+              f"{cell('p99_ms', 9)} {cell('throughput_rps', 9)} {cell('mongo_ops_per_request', 8)}")
+
+
+def compare(old, new, metric='p95_ms'):
+    """Print metric per benchmark for two reports with the relative change"""
+    print(f"{'benchmark':<34} {'old':>10} {'new':>10} {'change':>9}")
+    for name, stats in new['results'].items():
+        before = old['results'].get(name, {}).get(metric)
+        after = stats.get(metric)
+        if before and after is not None:
+            change = f'{(after - before) / before * 100:+.1f}%'
+        else:
+            change = '-'
+        print(f"{name:<34} {before if before is not None else '-':>10} {after if after is not None else '-':>10} {change:>9}")
@@ -0,0 +1,19 @@
+# Default gunicorn settings (loaded automatically from the working directory)
+#
+# The app is imported once in the master and forked into workers, so worker
+# boot and rolling restarts skip the import and inherit the templates that
+# run_startup_tasks() precompiled; each worker then opens its own MongoDB pool
+# right after fork instead of on its first request.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+timeout = 30
+preload_app = True
+
+
+def post_fork(server, worker):
+    from app import mongo
+    elapsed = mongo.warm_up()
+    if elapsed is not None:
+        server.log.info(f"Worker {worker.pid} connected to MongoDB in {elapsed * 1000:.0f} ms")
@@ -0,0 +1,21 @@
+# Gunicorn profile for ASYNC_MODE: gunicorn -c gunicorn_async.conf.py "app:run_startup_tasks()"
+#
+# Flask serves async views over WSGI by running each one on its own event
+# loop (via asgiref), so worker concurrency still comes from threads, while
+# the Motor client queries MongoDB from a shared per-worker loop and the
+# queries inside a view run concurrently.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = 30
+raw_env = ['ASYNC_MODE=true']
+preload_app = True
+
+
+def post_fork(server, worker):
+    from app import mongo
+    mongo.warm_up()
@@ -1,7 +1,9 @@
 #models.py
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from datetime import datetime, timedelta
 from bson import ObjectId
+from utils.helpers import paginate, parse_deadline
+from utils.mock_tests import GRACE
 
 class User:
     """User model for both admins and regular users"""
@@ -40,7 +42,7 @@ class Opportunity:
             'link': link,
             'company': company,
             'location': location,
-            'deadline': deadline,
+            'deadline': parse_deadline(deadline),
             'created_at': datetime.utcnow(),
             'status': 'active'
         }
@@ -55,11 +57,155 @@ class Opportunity:
 
     @staticmethod
     def delete(db, opportunity_id):
-        return db.opportunities.delete_one({'_id': ObjectId(opportunity_id)})
+        """Delete an opportunity, returning the removed document (None if missing)"""
+        return db.opportunities.find_one_and_delete({'_id': ObjectId(opportunity_id)})
 
     @staticmethod
-    def get_all(db, type=None, status='active'):
-        query = {'status': status}
+    def live_query(type=None, now=None):
+        """Filter for opportunities shown publicly: active and not past their deadline.
+
+        Missing deadlines never expire; a deadline is open through its whole day.
+        """
+        today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+        query = {'status': 'active', 'deadline': {'$not': {'$lt': today}}}
         if type:
             query['type'] = type
-        return list(db.opportunities.find(query).sort('created_at', -1))
\ No newline at end of file
+        return query
+
+    @staticmethod
+    def expired_query(now=None, grace_days=0):
+        """Filter for opportunities the archival job moves out: closed, or expired
+        for more than grace_days"""
+        today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+        return {'$or': [
+            {'status': 'inactive'},
+            {'deadline': {'$lt': today - timedelta(days=grace_days)}}
+        ]}
+
+    @staticmethod
+    def get_page(db, type=None, deadline_from=None, deadline_to=None, fields=None, cursor=None, per_page=20):
+        """Keyset-paginated page of the live opportunities with deadline filters and projection.
+
+        deadline_from/deadline_to are datetimes (or YYYY-MM-DD strings)."""
+        query = Opportunity.live_query(type)
+        if deadline_from:
+            query['deadline']['$gte'] = parse_deadline(deadline_from)
+        if deadline_to:
+            query['deadline']['$lte'] = parse_deadline(deadline_to)
+        # created_at is always fetched because the pagination cursor is built from it
+        projection = dict.fromkeys(set(fields) | {'created_at'}, 1) if fields else None
+        return paginate(db.opportunities, query, cursor, per_page, projection=projection)
+
+class Application:
+    """Model for managing applications submitted against opportunities"""
+    @staticmethod
+    def _titles_query(applications):
+        opportunity_ids = {app['opportunity_id'] for app in applications if app.get('opportunity_id')}
+        return {'_id': {'$in': list(opportunity_ids)}} if opportunity_ids else None
+
+    @staticmethod
+    def _apply_titles(applications, opportunities):
+        titles = {opp['_id']: opp.get('title', 'Unknown Opportunity') for opp in opportunities}
+        for application in applications:
+            title = titles.get(application.get('opportunity_id'))
+            if title is None:
+                # Archived or deleted: keep the title copied onto the application when it was made
+                title = application.get('opportunity_title') or 'Opportunity Not Found'
+            application['opportunity_title'] = title
+        return applications
+
+    @staticmethod
+    def attach_opportunity_titles(db, applications):
+        """Populate opportunity_title on each application with one bulk lookup"""
+        query = Application._titles_query(applications)
+        opportunities = db.opportunities.find(query, {'title': 1}) if query else []
+        return Application._apply_titles(applications, opportunities)
+
+    @staticmethod
+    async def attach_opportunity_titles_async(db, applications):
+        """attach_opportunity_titles() for a Motor database"""
+        query = Application._titles_query(applications)
+        opportunities = await db.opportunities.find(query, {'title': 1}).to_list(None) if query else []
+        return Application._apply_titles(applications, opportunities)
+
+    @staticmethod
+    def sync_opportunity_title(db, opportunity_id, title):
+        """Update the opportunity title copied onto applications for search"""
+        return db.applications.update_many(
+            {'opportunity_id': ObjectId(opportunity_id)},
+            {'$set': {'opportunity_title': title}}
+        )
+
+    @staticmethod
+    def get_by_id(db, application_id):
+        application = db.applications.find_one({'_id': ObjectId(application_id)})
+        if application:
+            Application.attach_opportunity_titles(db, [application])
+        return application
+
+    @staticmethod
+    async def get_by_id_async(db, application_id):
+        """get_by_id() for a Motor database"""
+        application = await db.applications.find_one({'_id': ObjectId(application_id)})
+        if application:
+            await Application.attach_opportunity_titles_async(db, [application])
+        return application
+
+
+class MockTest:
+    """Model for mock tests and the attempts students make at them"""
+    # Everything a student may see of a test: the answer key stays on the server
+    PUBLIC_PROJECTION = {'questions.answer': 0}
+
+    @staticmethod
+    def get_public(db, test_id):
+        return db.mock_tests.find_one({'_id': ObjectId(test_id)}, MockTest.PUBLIC_PROJECTION)
+
+    @staticmethod
+    def start_attempt(db, test, name, email, now=None):
+        """Open a timed attempt; it ends after the test's duration or when the test closes"""
+        now = now or datetime.utcnow()
+        expires_at = now + timedelta(minutes=test.get('duration_minutes', 30))
+        if test.get('closes_at'):
+            expires_at = min(expires_at, test['closes_at'])
+        attempt = {
+            'test_id': test['_id'],
+            'name': name,
+            'email': email,
+            'status': 'in_progress',
+            'answers': {},
+            'started_at': now,
+            'expires_at': expires_at
+        }
+        db.mock_test_attempts.insert_one(attempt)
+        return attempt
+
+    @staticmethod
+    def _open_query(attempt_id, now):
+        # Answers arriving within GRACE of the end still count
+        return {'_id': ObjectId(attempt_id), 'status': 'in_progress', 'expires_at': {'$gt': now - GRACE}}
+
+    @staticmethod
+    def save_answer(db, attempt_id, question, choice, now=None):
+        """Record one answer while the attempt is open; returns False once it is not"""
+        now = now or datetime.utcnow()
+        result = db.mock_test_attempts.update_one(MockTest._open_query(attempt_id, now),
+                                                  {'$set': {f'answers.{question}': choice}})
+        return result.matched_count == 1
+
+    @staticmethod
+    def submit(db, attempt_id, answers=None, now=None):
+        """Hand an attempt in for grading, with its final answers if still in time"""
+        now = now or datetime.utcnow()
+        submitted = {'status': 'submitted', 'submitted_at': now}
+        if answers is not None:
+            # Merged per question like save_answer, so autosaved answers missing from the form are kept
+            result = db.mock_test_attempts.update_one(
+                MockTest._open_query(attempt_id, now),
+                {'$set': dict(submitted, **{f'answers.{q}': choice for q, choice in answers.items()})})
+            if result.matched_count:
+                return True
+        # Out of time: the answers saved so far are the ones graded
+        result = db.mock_test_attempts.update_one({'_id': ObjectId(attempt_id), 'status': 'in_progress'},
+                                                  {'$set': submitted})
+        return result.matched_count == 1
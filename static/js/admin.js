@@ -1,27 +1,17 @@
-console.log('JavaScript file loaded');
-
-// Debug helper
-function debug(message) {
-    console.log(`Debug: ${message}`);
-}
-
 document.addEventListener('DOMContentLoaded', function() {
-    debug('Admin JS loaded');
-
     // ====== Element Selectors ======
     const searchInput = document.querySelector('.search-input');
     const searchBtn = document.querySelector('.search-btn');
     const typeFilter = document.querySelector('#type-filter');
+    const statusFilter = document.querySelector('#status-filter');
     const searchableItems = document.querySelectorAll('.searchable-item');
     const selectAllCheckbox = document.querySelector('.select-all');
-    const itemCheckboxes = document.querySelectorAll('.item-checkbox');
-    const deleteButtons = document.querySelectorAll('.delete-btn');
+    const adminTable = document.querySelector('.admin-table');
+    const tableBody = adminTable ? adminTable.querySelector('tbody') : null;
 
-    // Log initial element detection
-    debug(`Found ${searchableItems.length} searchable rows`);
-    if (searchInput) debug('Search input found');
-    if (searchBtn) debug('Search button found');
-    if (typeFilter) debug('Type filter found');
+    // Tables that declare a search collection are searched on the server
+    const searchUrl = adminTable ? adminTable.dataset.searchUrl : null;
+    const searchCollection = adminTable ? adminTable.dataset.searchCollection : null;
 
     // ====== Utility Functions ======
     function debounce(func, wait) {
@@ -49,35 +39,163 @@ document.addEventListener('DOMContentLoaded', function() {
         }, 3000);
     }
 
+    function createCell(content) {
+        const cell = document.createElement('td');
+        if (content instanceof Node) {
+            cell.appendChild(content);
+        } else {
+            cell.textContent = content ?? '';
+        }
+        return cell;
+    }
+
+    function createLink(href, text) {
+        const link = document.createElement('a');
+        link.href = href;
+        link.className = 'admin-btn';
+        link.textContent = text;
+        return link;
+    }
+
+    function createDeleteButton(item) {
+        const button = document.createElement('button');
+        button.className = 'admin-btn admin-btn-danger delete-btn';
+        button.dataset.id = item.id;
+        button.dataset.deleteUrl = item.delete_url;
+        button.textContent = 'Delete';
+        return button;
+    }
+
+    function createCheckbox(item) {
+        const checkbox = document.createElement('input');
+        checkbox.type = 'checkbox';
+        checkbox.className = 'item-checkbox';
+        checkbox.value = item.id;
+        return checkbox;
+    }
+
+    // ====== Search Result Rendering ======
+    const rowRenderers = {
+        applications(item) {
+            const badge = document.createElement('span');
+            badge.className = `status-badge status-${item.status}`;
+            badge.textContent = item.status;
+
+            const actions = document.createElement('span');
+            actions.append(createLink(item.view_url, 'View'), ' ', createDeleteButton(item));
+
+            return [createCheckbox(item), item.name, item.opportunity_title, item.created_at, badge, actions];
+        },
+        opportunities(item) {
+            const toggle = document.createElement('label');
+            toggle.className = 'switch';
+            const input = document.createElement('input');
+            input.type = 'checkbox';
+            input.className = 'status-toggle';
+            input.dataset.id = item.id;
+            input.checked = item.status === 'active';
+            const slider = document.createElement('span');
+            slider.className = 'slider round';
+            toggle.append(input, slider);
+
+            const actions = document.createElement('span');
+            actions.append(createLink(item.edit_url, 'Edit'), ' ', createDeleteButton(item));
+
+            return [createCheckbox(item), item.title, item.type, item.applications_count, toggle, item.created_at, actions];
+        }
+    };
+
+    function renderResults(results) {
+        tableBody.innerHTML = '';
+        results.forEach(item => {
+            const row = document.createElement('tr');
+            row.className = 'searchable-item';
+            rowRenderers[searchCollection](item).forEach(content => row.appendChild(createCell(content)));
+            tableBody.appendChild(row);
+        });
+        updateNoResultsMessage(results.length > 0);
+    }
+
+    function renderSearchPagination(pagination) {
+        // Server-rendered page links describe the unfiltered listing, so hide them
+        const pageNav = document.querySelector('nav[aria-label="Page navigation"]');
+        if (pageNav) pageNav.style.display = 'none';
+
+        let searchNav = document.querySelector('.search-pagination');
+        if (!searchNav) {
+            searchNav = document.createElement('nav');
+            searchNav.className = 'search-pagination d-flex justify-content-between my-4';
+            adminTable.after(searchNav);
+        }
+        searchNav.innerHTML = '';
+
+        [['prev', '\u00ab Previous'], ['next', 'Next \u00bb']].forEach(([key, label]) => {
+            const button = document.createElement('button');
+            button.type = 'button';
+            button.className = 'btn btn-outline-secondary';
+            button.textContent = label;
+            button.style.visibility = pagination[key] ? 'visible' : 'hidden';
+            button.addEventListener('click', () => performSearch(pagination[key]));
+            searchNav.appendChild(button);
+        });
+    }
+
     // ====== Search and Filter Functions ======
-    function performSearch() {
-        debug('Performing search');
+    let searchController = null;
+
+    function performSearch(cursor = null) {
+        if (!searchUrl) {
+            filterRows();
+            return;
+        }
+
+        const params = new URLSearchParams({ collection: searchCollection });
+        if (searchInput && searchInput.value.trim()) params.set('q', searchInput.value.trim());
+        if (typeFilter && typeFilter.value) params.set('type', typeFilter.value);
+        if (statusFilter && statusFilter.value) params.set('status', statusFilter.value);
+        if (cursor) params.set('cursor', cursor);
+
+        // Drop the response of any search still in flight
+        if (searchController) searchController.abort();
+        searchController = new AbortController();
+
+        fetch(`${searchUrl}?${params}`, { signal: searchController.signal })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                if (!data.success) {
+                    throw new Error(data.message || 'Search failed');
+                }
+                renderResults(data.results);
+                renderSearchPagination(data.pagination);
+            })
+            .catch(error => {
+                if (error.name === 'AbortError') return;
+                showNotification(error.message || 'Error searching', 'error');
+            });
+    }
+
+    function filterRows() {
+        // Tables without a server search endpoint only filter the rows on this page
         const searchTerm = searchInput.value.toLowerCase();
-        const selectedType = typeFilter ? typeFilter.value.toLowerCase() : '';
         
         searchableItems.forEach(item => {
             const text = item.textContent.toLowerCase();
-            const typeCell = item.querySelector('td:nth-child(3)');
-            const type = typeCell ? typeCell.textContent.trim().toLowerCase() : '';
-            
-            const matchesSearch = searchTerm === '' || text.includes(searchTerm);
-            const matchesType = !selectedType || type === selectedType;
-            
-            item.style.display = matchesSearch && matchesType ? '' : 'none';
+            item.style.display = searchTerm === '' || text.includes(searchTerm) ? '' : 'none';
         });
 
-        updateNoResultsMessage();
+        updateNoResultsMessage(Array.from(searchableItems).some(item => item.style.display !== 'none'));
     }
 
-    function updateNoResultsMessage() {
-        const tableBody = document.querySelector('tbody');
+    function updateNoResultsMessage(hasVisibleRows) {
         let noResultsMsg = document.querySelector('.no-results-message');
         
-        const hasVisibleRows = Array.from(searchableItems)
-            .some(item => item.style.display !== 'none');
-        
         if (!hasVisibleRows) {
-            if (!noResultsMsg) {
+            if (!noResultsMsg && tableBody) {
                 noResultsMsg = document.createElement('tr');
                 noResultsMsg.className = 'no-results-message';
                 noResultsMsg.innerHTML = `
@@ -95,141 +213,176 @@ document.addEventListener('DOMContentLoaded', function() {
     // ====== Event Listeners ======
 
     // Search functionality
-    const debouncedSearch = debounce(performSearch, 300);
+    const debouncedSearch = debounce(() => performSearch(), 300);
     
     if (searchInput) {
-        // Real-time search as user types
+        // Search as user types, once typing pauses
         searchInput.addEventListener('input', debouncedSearch);
         
         // Search on Enter key
         searchInput.addEventListener('keypress', function(e) {
             if (e.key === 'Enter') {
-                debug('Enter key pressed');
                 performSearch();
             }
         });
     }
 
     if (searchBtn) {
-        console.log('Search button found and event listener being added');
         searchBtn.addEventListener('click', function(e) {
-            console.log('Button clicked - event fired');
             e.preventDefault();
-            console.log('Search term:', searchInput.value);
             performSearch();
         });
-    } else {
-        console.log('Search button NOT found in DOM');
     }
 
-    if (typeFilter) {
-        typeFilter.addEventListener('change', function() {
-            debug('Type filter changed');
-            performSearch();
-        });
-    }
+    [typeFilter, statusFilter].forEach(filter => {
+        if (filter) {
+            filter.addEventListener('change', function() {
+                performSearch();
+            });
+        }
+    });
 
     // Select All checkbox functionality
     if (selectAllCheckbox) {
         selectAllCheckbox.addEventListener('change', function() {
-            debug('Select all checkbox changed');
-            itemCheckboxes.forEach(checkbox => {
+            document.querySelectorAll('.item-checkbox').forEach(checkbox => {
                 checkbox.checked = this.checked;
             });
         });
     }
 
-    // Delete button functionality
-    deleteButtons.forEach((button, index) => {
-        debug(`Found delete button ${index} with ID: ${button.dataset.id}`);
-        
-        button.addEventListener('click', function(e) {
-            e.preventDefault();
-            e.stopPropagation();
-            debug('Delete button clicked');
-            
-            const applicationId = this.dataset.id;
-            debug(`Attempting to delete application: ${applicationId}`);
-            
-            if (!applicationId) {
-                debug('Error: No application ID found on button');
-                showNotification('Error: Could not identify application', 'error');
+    // Delete button functionality, delegated so rows rendered from search results work too
+    document.addEventListener('click', function(e) {
+        const button = e.target.closest('.delete-btn');
+        if (!button || !button.dataset.deleteUrl) return;
+
+        e.preventDefault();
+        e.stopPropagation();
+
+        if (confirm('Are you sure you want to delete this item?')) {
+            fetch(button.dataset.deleteUrl, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                }
+            })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(data => {
+                if (data.success) {
+                    const row = button.closest('tr');
+                    if (row) {
+                        row.remove();
+                    }
+                    showNotification(data.message || 'Deleted successfully', 'success');
+                } else {
+                    throw new Error(data.message || 'Server indicated deletion failed');
+                }
+            })
+            .catch(error => {
+                showNotification(error.message || 'Error deleting item', 'error');
+            });
+        }
+    });
+
+    // Bulk actions on the selected rows
+    const bulkActions = document.querySelector('.bulk-actions');
+    if (bulkActions) {
+        bulkActions.addEventListener('click', function(e) {
+            const button = e.target.closest('.bulk-btn');
+            if (!button) return;
+
+            const checked = Array.from(document.querySelectorAll('.item-checkbox:checked'));
+            if (checked.length === 0) {
+                showNotification('Select at least one item first', 'error');
                 return;
             }
-            
-            if (confirm('Are you sure you want to delete this application?')) {
-                debug('User confirmed delete');
-                
-                fetch(`/admin/applications/delete/${applicationId}`, {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    }
-                })
-                .then(response => {
-                    debug(`Server response status: ${response.status}`);
-                    if (!response.ok) {
-                        throw new Error(`HTTP error! status: ${response.status}`);
-                    }
-                    return response.json();
-                })
-                .then(data => {
-                    debug('Received response:', data);
-                    if (data.success) {
-                        const row = this.closest('tr');
-                        if (row) {
-                            row.remove();
-                            debug('Row removed from table');
-                            showNotification(data.message || 'Application deleted successfully', 'success');
-                        } else {
-                            throw new Error('Could not find table row to remove');
-                        }
-                    } else {
-                        throw new Error(data.message || 'Server indicated deletion failed');
-                    }
-                })
-                .catch(error => {
-                    debug('Delete error:', error);
-                    showNotification(error.message || 'Error deleting application', 'error');
-                });
+
+            const action = button.dataset.action;
+            if (action === 'delete' && !confirm(`Delete ${checked.length} selected item(s)?`)) {
+                return;
             }
-        });
-    });
 
-    // Status toggle functionality
-    const statusToggles = document.querySelectorAll('.status-toggle');
-    statusToggles.forEach(toggle => {
-        toggle.addEventListener('change', function() {
-            const opportunityId = this.dataset.id;
-            const newStatus = this.checked ? 'active' : 'inactive';
-            
-            fetch(`/admin/opportunities/${opportunityId}/status`, {
+            fetch(bulkActions.dataset.bulkUrl, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({ status: newStatus })
+                body: JSON.stringify({
+                    action: action,
+                    status: button.dataset.status,
+                    ids: checked.map(checkbox => checkbox.value)
+                })
             })
             .then(response => response.json())
             .then(data => {
-                if (data.success) {
-                    showNotification(`Status updated to ${newStatus}`, 'success');
-                } else {
-                    showNotification(data.message || 'Error updating status', 'error');
-                    // Revert the toggle if there was an error
-                    this.checked = !this.checked;
+                if (!data.success) {
+                    throw new Error(data.message || 'Bulk action failed');
                 }
+                let changed = 0;
+                checked.forEach(checkbox => {
+                    const outcome = data.results[checkbox.value];
+                    const row = checkbox.closest('tr');
+                    if (outcome === 'deleted') {
+                        row.remove();
+                        changed++;
+                    } else if (outcome === 'updated') {
+                        const badge = row.querySelector('.status-badge');
+                        if (badge) {
+                            badge.className = `status-badge status-${button.dataset.status}`;
+                            badge.textContent = button.dataset.status;
+                        }
+                        checkbox.checked = false;
+                        changed++;
+                    }
+                });
+                const skipped = checked.length - changed;
+                showNotification(`${changed} item(s) updated` + (skipped ? `, ${skipped} skipped` : ''),
+                                 skipped ? 'error' : 'success');
             })
             .catch(error => {
-                showNotification('Error updating status', 'error');
-                // Revert the toggle on error
-                this.checked = !this.checked;
+                showNotification(error.message || 'Error applying bulk action', 'error');
             });
         });
+    }
+
+    // Status toggle functionality, delegated so rows rendered from search results work too
+    document.addEventListener('change', function(e) {
+        const toggle = e.target.closest('.status-toggle');
+        if (!toggle) return;
+        const opportunityId = toggle.dataset.id;
+        const newStatus = toggle.checked ? 'active' : 'inactive';
+        
+        fetch(`/admin/opportunities/${opportunityId}/status`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ status: newStatus })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                showNotification(`Status updated to ${newStatus}`, 'success');
+            } else {
+                showNotification(data.message || 'Error updating status', 'error');
+                // Revert the toggle if there was an error
+                toggle.checked = !toggle.checked;
+            }
+        })
+        .catch(error => {
+            showNotification('Error updating status', 'error');
+            // Revert the toggle on error
+            toggle.checked = !toggle.checked;
+        });
     });
 
     // Initialize search if there are any existing values
-    if (searchInput?.value || typeFilter?.value) {
+    if (searchInput?.value || typeFilter?.value || statusFilter?.value) {
         performSearch();
     }
 });
\ No newline at end of file
@@ -0,0 +1,47 @@
+// Mock test page: countdown timer and per-answer autosave
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('mock-test-form');
+    if (!form) return;
+    const timer = document.getElementById('mock-test-timer');
+    const saveStatus = document.getElementById('mock-test-save-status');
+    // The server sends the seconds left, so a wrong client clock does not matter
+    const endsAt = Date.now() + Number(form.dataset.remaining) * 1000;
+    let handedIn = false;
+
+    function tick() {
+        const left = Math.max(0, Math.round((endsAt - Date.now()) / 1000));
+        timer.textContent = Math.floor(left / 60) + ':' + String(left % 60).padStart(2, '0');
+        if (left <= 60) {
+            timer.classList.add('text-danger');
+        }
+        if (left === 0 && !handedIn) {
+            handedIn = true;
+            form.submit();
+        }
+    }
+    tick();
+    setInterval(tick, 1000);
+
+    // Each answer is saved on its own as soon as it is chosen
+    form.addEventListener('change', function(event) {
+        const input = event.target;
+        if (input.type !== 'radio') return;
+        saveStatus.textContent = 'Saving...';
+        fetch(form.dataset.answerUrl, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({question: Number(input.dataset.question), choice: Number(input.value)})
+        })
+            .then(response => response.json())
+            .then(data => {
+                saveStatus.textContent = data.success ? 'All answers saved' : data.message;
+            })
+            .catch(() => {
+                saveStatus.textContent = 'Could not save; your answers are sent when you submit';
+            });
+    });
+
+    form.addEventListener('submit', function() {
+        handedIn = true;
+    });
+});
@@ -0,0 +1,25 @@
+import importlib
+import os
+import sys
+
+import mongomock
+import pytest
+
+# Tests import the app's modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    """The app module, configured so importing it needs no MongoDB server"""
+    os.environ.setdefault('MONGODB_URI', 'mongodb://localhost:1/?serverSelectionTimeoutMS=100')
+    os.environ.setdefault('SECRET_KEY', 'test')
+    os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+    module = importlib.import_module('app')
+    # The activity log writer and the page cache generations hold their own
+    # collections rather than going through app.db, which tests monkeypatch;
+    # point them at an in-memory database instead of the unreachable server
+    background = mongomock.MongoClient().career_portal
+    module.app.extensions['activity_log'].collection = background.activity_log
+    module.page_cache.backend.collection = background.page_cache_generations
+    return module
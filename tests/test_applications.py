@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from models import Application
+
+# Collection methods that each send one command to the server
+COMMANDS = {'find', 'find_one', 'aggregate', 'count_documents', 'estimated_document_count', 'distinct',
+            'insert_one', 'insert_many', 'update_one', 'update_many', 'delete_one', 'delete_many',
+            'find_one_and_update', 'find_one_and_delete', 'bulk_write'}
+
+
+class CountingDatabase:
+    """Wraps a mongomock database and counts the commands issued through it"""
+    def __init__(self, db):
+        self._db = db
+        self.commands = 0
+
+    def __getitem__(self, name):
+        return CountingCollection(self, self._db[name])
+
+    __getattr__ = __getitem__
+
+
+class CountingCollection:
+    def __init__(self, database, collection):
+        self._database = database
+        self._collection = collection
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if name not in COMMANDS:
+            return attribute
+
+        def command(*args, **kwargs):
+            self._database.commands += 1
+            return attribute(*args, **kwargs)
+        return command
+
+
+def seed(db, applications):
+    opportunities = [{'_id': ObjectId(), 'title': f'Opportunity {i}', 'type': 'job', 'status': 'active'}
+                     for i in range(10)]
+    db.opportunities.insert_many(opportunities)
+    now = datetime.utcnow()
+    db.applications.insert_many([{
+        'opportunity_id': opportunities[i % len(opportunities)]['_id'],
+        'opportunity_type': 'job',
+        'name': f'Applicant {i}',
+        'email': f'applicant{i}@example.com',
+        'status': 'pending',
+        'created_at': now - timedelta(minutes=i)
+    } for i in range(applications)])
+
+
+def titled_applications(db):
+    return Application.attach_opportunity_titles(db, list(db.applications.find().sort('created_at', -1)))
+
+
+def commands_for(applications, run):
+    db = CountingDatabase(mongomock.MongoClient().career_portal)
+    seed(db._db, applications)
+    result = run(db)
+    return db.commands, result
+
+
+@pytest.mark.parametrize('applications', [1, 200])
+def test_attach_opportunity_titles_titles_every_application(applications):
+    _, result = commands_for(applications, titled_applications)
+    assert len(result) == applications
+    assert all(application['opportunity_title'].startswith('Opportunity ') for application in result)
+
+
+def test_attach_opportunity_titles_query_count_does_not_grow_with_applications():
+    few, _ = commands_for(1, titled_applications)
+    many, _ = commands_for(200, titled_applications)
+    assert few == many == 2  # Applications, then one $in lookup of their opportunities
+
+
+def test_manage_applications_query_count_does_not_grow_with_applications(app_module, monkeypatch):
+    def render(db):
+        monkeypatch.setattr(app_module, 'db', db)
+        client = app_module.app.test_client()
+        with client.session_transaction() as session:
+            session['is_admin'] = True
+        response = client.get('/admin/applications')
+        assert response.status_code == 200
+        return response.get_data(as_text=True)
+
+    few, page = commands_for(1, render)
+    many, _ = commands_for(200, render)
+    assert 'Opportunity 0' in page
+    assert few == many
+
+
+def test_bulk_status_reports_applications_changed_meanwhile(app_module, monkeypatch):
+    db = mongomock.MongoClient().career_portal
+    seed(db, 3)
+    ids = [application['_id'] for application in db.applications.find()]
+    monkeypatch.setattr(app_module, 'db', db)
+    monkeypatch.setattr(app_module.dashboard_stats, '_stats', {'applications': {'total': 3, 'pending': 3}})
+    bulk_write = db.applications.bulk_write
+
+    def bulk_write_after_another_admin(requests, **kwargs):
+        # Between the read and the write another admin rejects one and deletes another
+        db.applications.update_one({'_id': ids[0]}, {'$set': {'status': 'rejected'}})
+        db.applications.delete_one({'_id': ids[1]})
+        return bulk_write(requests, **kwargs)
+
+    monkeypatch.setattr(db.applications, 'bulk_write', bulk_write_after_another_admin)
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+    response = client.post('/admin/applications/bulk',
+                           json={'action': 'status', 'status': 'accepted', 'ids': [str(i) for i in ids]})
+
+    assert response.get_json()['results'] == {str(ids[0]): 'conflict', str(ids[1]): 'not_found',
+                                              str(ids[2]): 'updated'}
+    assert app_module.dashboard_stats._stats is None  # Recounted on the next read
@@ -0,0 +1,63 @@
+import asyncio
+import contextvars
+import importlib.util
+import os
+from datetime import datetime
+
+import motor.frameworks.asyncio
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from utils.async_db import AsyncMongo
+
+
+@pytest.fixture(scope='module')
+def async_app(app_module):
+    """A second copy of the app imported with ASYNC_MODE=true, its Motor client backed by mongomock"""
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+    spec = importlib.util.spec_from_file_location('app_async', path)
+    module = importlib.util.module_from_spec(spec)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('ASYNC_MODE', 'true')
+        patch.setattr('motor.motor_asyncio.AsyncIOMotorClient', AsyncMongoMockClient)
+        spec.loader.exec_module(module)
+        module.adb.db  # Creates the client while the mock is in place
+    return module
+
+
+def test_async_views_read_through_motor(async_app):
+    async def seed(db):
+        opportunity = await db.opportunities.insert_one({'title': 'Async Engineer', 'type': 'job',
+                                                         'status': 'active'})
+        application = await db.applications.insert_one({
+            'opportunity_id': opportunity.inserted_id, 'name': 'Asha Async', 'email': 'asha@example.com',
+            'status': 'pending', 'created_at': datetime.utcnow()})
+        return application.inserted_id
+
+    application_id = asyncio.run(async_app.adb.run(seed))
+    assert async_app.app.view_functions['manage_applications'] is async_app.manage_applications_async
+    client = async_app.app.test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+
+    listing = client.get('/admin/applications')
+    assert listing.status_code == 200
+    assert 'Asha Async' in listing.get_data(as_text=True)
+    page = client.get(f'/admin/applications/{application_id}')
+    assert page.status_code == 200
+    assert 'Async Engineer' in page.get_data(as_text=True)
+
+
+def test_motor_commands_run_in_the_callers_context():
+    request_stats = contextvars.ContextVar('request_stats', default=None)
+    adb = AsyncMongo('mongodb://localhost:1', 'career_portal')
+
+    async def command(db):
+        # Motor runs each command on its executor threads
+        return await motor.frameworks.asyncio.run_on_executor(asyncio.get_running_loop(), request_stats.get)
+
+    async def view():
+        request_stats.set('this request')
+        return await adb.run(command)
+
+    assert asyncio.run(view()) == 'this request'
@@ -0,0 +1,21 @@
+import threading
+
+import pytest
+
+from utils.auth import HasherSaturated, PasswordHasher
+
+
+def test_timed_out_hash_keeps_its_slot_until_it_finishes():
+    hasher = PasswordHasher(max_workers=1, max_pending=0, timeout=0.05)
+    finish = threading.Event()
+    hasher._check = lambda password_hash, password: (finish.wait(5), (True, None))[1]
+
+    with pytest.raises(HasherSaturated):
+        hasher.verify('hash', 'password')  # Gives up waiting; the hash is still running
+    with pytest.raises(HasherSaturated):
+        hasher.verify('hash', 'password')  # So no second one is admitted
+
+    finish.set()
+    hasher._executor.submit(lambda: None).result(5)  # The slow hash has returned
+    hasher.timeout = 5
+    assert hasher.verify('hash', 'password') == (True, None)
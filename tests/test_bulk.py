@@ -0,0 +1,17 @@
+import io
+
+from utils.bulk import read_rows
+
+
+def test_jsonl_line_that_is_not_utf8_is_a_row_error():
+    rows = list(read_rows(io.BytesIO(b'{"title": "A"}\n{"title": "\xff"}\n{"title": "C"}\n'), 'jsonl'))
+    assert [number for number, _ in rows] == [1, 2, 3]
+    assert isinstance(rows[1][1], ValueError)
+    assert rows[2][1] == {'title': 'C'}
+
+
+def test_csv_that_is_not_utf8_stops_with_an_error():
+    rows = list(read_rows(io.BytesIO(b'title,type\nA,job\nB\xff,job\nC,job\n'), 'csv'))
+    assert rows[0] == (2, {'title': 'A', 'type': 'job'})
+    assert rows[1][0] == 3 and isinstance(rows[1][1], ValueError)
+    assert len(rows) == 2
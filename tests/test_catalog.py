@@ -0,0 +1,56 @@
+import threading
+from datetime import datetime
+
+import mongomock
+import pytest
+
+from utils.catalog import Catalog
+
+pytest.importorskip('numpy')
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().career_portal
+
+
+def titles(catalog):
+    opportunities, _ = catalog.page('job')
+    return [opportunity['title'] for opportunity in opportunities]
+
+
+def add(db, title):
+    db.opportunities.insert_one({'title': title, 'type': 'job', 'status': 'active', 'created_at': datetime.utcnow()})
+
+
+def test_snapshot_left_from_another_database_is_rebuilt(db, tmp_path):
+    path = str(tmp_path / 'catalog' / 'catalog.bin')
+    add(db, 'Old Posting')
+    db.catalog_versions.insert_one({'_id': 'opportunities', 'version': 7, 'epoch': 'before-restore'})
+    Catalog(db, path).refresh()
+
+    # The database is reset: the stamp starts again below the leftover file's version
+    db.opportunities.delete_many({})
+    db.catalog_versions.drop()
+    add(db, 'New Posting')
+    catalog = Catalog(db, path)
+    catalog.publish()
+    assert catalog.refresh() is True
+    assert titles(catalog) == ['New Posting']
+    assert catalog.refresh() is False
+
+
+def test_publish_rebuilds_in_the_background(db, tmp_path):
+    rebuilt = threading.Event()
+    catalog = Catalog(db, str(tmp_path / 'catalog' / 'catalog.bin'), refresh_interval=60, on_rebuilt=rebuilt.set)
+    add(db, 'First')
+    catalog.publish()
+    assert rebuilt.wait(5)
+    assert titles(catalog) == ['First']
+
+    rebuilt.clear()
+    add(db, 'Second')
+    catalog.publish()
+    assert catalog.page('job') is None or titles(catalog) == ['Second', 'First']  # Never the old file
+    assert rebuilt.wait(5)
+    assert titles(catalog) == ['Second', 'First']
@@ -0,0 +1,26 @@
+from utils.helpers import build_search_query
+
+
+class TextIndexFinding:
+    """Stands in for a collection whose text index finds nothing (or something)"""
+    def __init__(self, found):
+        self.found = found
+
+    def find_one(self, query, projection):
+        assert '$text' in query
+        return {'_id': 1} if self.found else None
+
+
+def test_search_term_goes_to_the_text_index_as_typed():
+    assert build_search_query(' data engineer ', {'type': 'job', 'status': None}) == \
+        {'type': 'job', '$text': {'$search': 'data engineer'}}
+    assert build_search_query('', {'type': 'job'}) == {'type': 'job'}
+
+
+def test_partial_word_falls_back_to_a_substring_match():
+    fields = ('title', 'company')
+    assert build_search_query('eng', None, TextIndexFinding(True), fields) == {'$text': {'$search': 'eng'}}
+    assert build_search_query('eng.', {'type': 'job'}, TextIndexFinding(False), fields) == {
+        'type': 'job',
+        '$or': [{'title': {'$regex': r'eng\.', '$options': 'i'}}, {'company': {'$regex': r'eng\.', '$options': 'i'}}]
+    }
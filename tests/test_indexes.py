@@ -0,0 +1,40 @@
+from pymongo.errors import OperationFailure
+
+from utils import indexes
+
+
+class ConflictingCollection:
+    """An existing collection whose 'deadline' index was created with different options"""
+    def __init__(self):
+        self.dropped = []
+
+    def create_indexes(self, models):
+        if any(model.document['name'] == 'deadline' for model in models) and 'deadline' not in self.dropped:
+            raise OperationFailure('Index with name: deadline already exists with different options',
+                                   code=indexes.INDEX_OPTIONS_CONFLICT)
+        return [model.document['name'] for model in models]
+
+    def drop_index(self, index):
+        self.dropped.append('deadline')
+
+
+class Database(dict):
+    def __missing__(self, name):
+        self[name] = ConflictingCollection()
+        return self[name]
+
+
+def test_conflicting_index_is_reported_not_dropped():
+    db = Database()
+    created, conflicts = indexes.ensure_indexes(db)
+    assert [name for name, _ in conflicts['opportunities']] == ['deadline']
+    assert 'deadline' not in created['opportunities'] and 'search' in created['opportunities']
+    assert db['opportunities'].dropped == []
+
+
+def test_rebuild_replaces_a_conflicting_index():
+    db = Database()
+    created, conflicts = indexes.ensure_indexes(db, rebuild=True)
+    assert conflicts == {}
+    assert 'deadline' in created['opportunities']
+    assert db['opportunities'].dropped == ['deadline']
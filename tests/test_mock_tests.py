@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import numpy as np
+import pytest
+
+from models import MockTest
+from utils.mock_tests import MockTestGrader, UNANSWERED, answer_matrix, cohort_totals, difficulty, grade, \
+    validate_test
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().career_portal
+
+
+@pytest.fixture
+def test(db):
+    # Key: B, A, D
+    test = validate_test({'title': 'Aptitude', 'duration_minutes': 30, 'questions': [
+        {'text': 'One', 'options': ['a', 'b', 'c'], 'answer': 1},
+        {'text': 'Two', 'options': ['a', 'b'], 'answer': 0},
+        {'text': 'Three', 'options': ['a', 'b', 'c', 'd'], 'answer': 3},
+    ]})
+    db.mock_tests.insert_one(test)
+    return test
+
+
+def submitted(db, test, *answer_sets):
+    now = datetime.utcnow()
+    ids = []
+    for answers in answer_sets:
+        attempt = MockTest.start_attempt(db, test, 'Student', 'student@example.com', now=now)
+        MockTest.submit(db, attempt['_id'], {str(q): choice for q, choice in answers.items()}, now=now)
+        ids.append(attempt['_id'])
+    return ids
+
+
+def test_cohort_totals_and_difficulty():
+    matrix = answer_matrix([{'answers': {'0': 1, '1': 0, '2': 3}}, {'answers': {'0': 1}}, {'answers': {}}], 3)
+    assert matrix[2].tolist() == [UNANSWERED] * 3
+    correct, scores = grade(matrix, np.array([1, 0, 3], dtype=np.int8))
+    assert scores.tolist() == [3, 1, 0]
+
+    totals = cohort_totals(matrix, correct, scores, options=4)
+    assert totals['correct'].tolist() == [2, 1, 1]
+    assert totals['scores'].tolist() == [1, 1, 0, 1]
+    assert totals['responses'][0].tolist() == [1, 0, 2, 0, 0]  # One blank, two chose option 1
+
+    questions = difficulty(dict(totals, attempts=3))
+    assert questions[0]['p_correct'] == round(2 / 3, 4)
+    # Only the top scorer got questions 2 and 3 right: they separate strong from weak
+    assert questions[1]['discrimination'] > 0 and questions[1]['level'] == 'hard'
+
+
+def test_submit_keeps_autosaved_answers_missing_from_the_form(db, test):
+    attempt = MockTest.start_attempt(db, test, 'Student', 'student@example.com')
+    assert MockTest.save_answer(db, attempt['_id'], 0, 2)
+    assert MockTest.submit(db, attempt['_id'], {'1': 0})
+    assert db.mock_test_attempts.find_one({'_id': attempt['_id']})['answers'] == {'0': 2, '1': 0}
+
+
+def test_grader_scores_attempts_and_accumulates_statistics(db, test):
+    ids = submitted(db, test, {0: 1, 1: 0, 2: 3}, {0: 1, 1: 1}, {})
+    grader = MockTestGrader()
+    assert grader.grade_pending(db) == 3
+    assert grader.grade_pending(db) == 0
+
+    scores = {attempt['_id']: attempt['score'] for attempt in db.mock_test_attempts.find({'status': 'graded'})}
+    assert [scores[i] for i in ids] == [3, 1, 0]
+    stats = db.mock_test_stats.find_one({'_id': test['_id']})
+    assert stats['attempts'] == 3 and stats['score_sum'] == 4
+    assert stats['scores'] == [1, 1, 0, 1]
+    assert len(stats['questions']) == 3
+
+    # A later cohort adds to the same totals
+    submitted(db, test, {0: 1, 1: 0, 2: 3})
+    assert grader.grade_pending(db) == 1
+    assert db.mock_test_stats.find_one({'_id': test['_id']})['attempts'] == 4
+
+
+def test_expired_attempts_are_handed_in_and_graded(db, test):
+    started = datetime.utcnow() - timedelta(hours=1)
+    attempt = MockTest.start_attempt(db, test, 'Student', 'student@example.com', now=started)
+    MockTest.save_answer(db, attempt['_id'], 0, 1, now=started)
+    assert MockTestGrader().grade_pending(db) == 1
+    graded = db.mock_test_attempts.find_one({'_id': attempt['_id']})
+    assert graded['auto_submitted'] and graded['score'] == 1
+
+
+def test_grader_that_lost_its_lease_adds_only_what_it_wrote(db, test):
+    submitted(db, test, *[{0: 1, 1: 0, 2: 3}] * 4)
+    slow, fast = MockTestGrader(lease=300), MockTestGrader()
+    claim = slow.claim
+
+    def claim_then_stall(db, test_id, now=None):
+        token, attempts = claim(db, test_id, now)
+        # The slow grader stalls past its lease; another grader reclaims half the batch and grades it
+        stolen = [attempt['_id'] for attempt in attempts[:2]]
+        db.mock_test_attempts.update_many({'_id': {'$in': stolen}},
+                                          {'$set': {'lease_until': datetime.utcnow() - timedelta(seconds=1)}})
+        fast.grade_test(db, db.mock_tests.find_one({'_id': test_id}))
+        return token, attempts
+
+    slow.claim = claim_then_stall
+    assert slow.grade_test(db, test) == 2
+
+    stats = db.mock_test_stats.find_one({'_id': test['_id']})
+    assert stats['attempts'] == 4 and stats['score_sum'] == 12
+    assert db.mock_test_attempts.count_documents({'status': 'graded'}) == 4
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import mongomock
+
+
+def test_api_lists_only_live_opportunities(app_module, monkeypatch):
+    db = mongomock.MongoClient().career_portal
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    db.opportunities.insert_many([
+        {'title': 'Open', 'type': 'job', 'status': 'active', 'deadline': today + timedelta(days=10),
+         'created_at': datetime.utcnow()},
+        {'title': 'Closes today', 'type': 'job', 'status': 'active', 'deadline': today,
+         'created_at': datetime.utcnow()},
+        {'title': 'No deadline', 'type': 'job', 'status': 'active', 'created_at': datetime.utcnow()},
+        {'title': 'Expired', 'type': 'job', 'status': 'active', 'deadline': today - timedelta(days=1),
+         'created_at': datetime.utcnow()},
+        {'title': 'Inactive', 'type': 'job', 'status': 'inactive', 'created_at': datetime.utcnow()},
+    ])
+    monkeypatch.setattr(app_module, 'db', db)
+    client = app_module.app.test_client()
+
+    def titles(query=''):
+        response = client.get(f'/api/v1/opportunities?fields=title{query}')
+        assert response.status_code == 200
+        return {opportunity['title'] for opportunity in response.get_json()['data']}
+
+    assert titles() == {'Open', 'Closes today', 'No deadline'}
+    assert titles(f"&deadline_from={(today + timedelta(days=1)).strftime('%Y-%m-%d')}") == {'Open'}
+    assert titles('&status=inactive') == {'Open', 'Closes today', 'No deadline'}
+
+
+def test_status_toggle_updates_the_opportunity(app_module, monkeypatch):
+    db = mongomock.MongoClient().career_portal
+    opportunity_id = db.opportunities.insert_one({'title': 'Open', 'type': 'job', 'status': 'active',
+                                                  'created_at': datetime.utcnow()}).inserted_id
+    monkeypatch.setattr(app_module, 'db', db)
+    monkeypatch.setattr(app_module.page_cache.backend, 'collection', db.page_cache_generations)
+    published = []
+    monkeypatch.setattr(app_module.catalog, 'publish', lambda: published.append(True))
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['is_admin'] = True
+
+    response = client.post(f'/admin/opportunities/{opportunity_id}/status', json={'status': 'inactive'})
+    assert response.get_json()['success'] is True
+    assert db.opportunities.find_one()['status'] == 'inactive'
+    assert published
+
+    response = client.post(f'/admin/opportunities/{opportunity_id}/status', json={'status': 'archived'})
+    assert response.status_code == 400
+    response = client.post(f'/admin/opportunities/{"0" * 24}/status', json={'status': 'active'})
+    assert response.status_code == 404
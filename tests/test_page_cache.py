@@ -0,0 +1,23 @@
+import mongomock
+from flask import Flask
+
+from utils.page_cache import LRUBackend, MongoGenerations, PageCache
+
+
+def test_invalidate_in_one_worker_reaches_another():
+    generations = mongomock.MongoClient().career_portal.page_cache_generations
+    # Two workers: separate page stores, one MongoDB
+    workers = [PageCache(MongoGenerations(LRUBackend(), generations, max_age=0)) for _ in range(2)]
+    renders = []
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    for number, cache in enumerate(workers):
+        app.add_url_rule(f'/listing{number}', f'listing{number}',
+                         cache.cached('opportunities')(lambda: renders.append(1) or f'render {len(renders)}'))
+    client = app.test_client()
+
+    first = client.get('/listing1').get_data(as_text=True)
+    assert client.get('/listing1').get_data(as_text=True) == first  # Served from the cache
+    workers[0].invalidate('opportunities')
+    assert client.get('/listing1').get_data(as_text=True) != first
+    assert len(renders) == 2
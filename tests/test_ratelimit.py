@@ -0,0 +1,74 @@
+import pytest
+from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from utils import ratelimit
+from utils.ratelimit import MemoryBackend, RateLimiter, client_address, parse_rate
+
+
+@pytest.fixture
+def limited_app():
+    app = Flask(__name__)
+    limiter = RateLimiter(MemoryBackend())
+
+    @app.route('/upload', methods=['POST'])
+    @limiter.limit_upload(parse_rate('2/minute'), parse_rate('100/minute'))
+    def upload():
+        return 'ok'
+
+    return app, limiter
+
+
+def test_parse_rate():
+    assert parse_rate('10/minute') == (10, 10 / 60)
+    assert parse_rate('5/30seconds') == (5, 5 / 30)
+    assert parse_rate('') is None
+    with pytest.raises(ValueError):
+        parse_rate('10 per minute')
+
+
+def test_rejected_bucket_does_not_charge_the_others():
+    backend = MemoryBackend()
+    assert [allowed for allowed, _ in backend.take_all([('requests', 2, 0.001, 1), ('bytes', 100, 0.001, 150)])] \
+        == [True, False]
+    # The request bucket was not debited by the rejected upload
+    assert [allowed for allowed, _ in backend.take_all([('requests', 2, 0.001, 1), ('bytes', 100, 0.001, 60)])] \
+        == [True, True]
+    assert [allowed for allowed, _ in backend.take_all([('requests', 2, 0.001, 1), ('bytes', 100, 0.001, 30)])] \
+        == [True, True]
+    assert backend.take('requests', 2, 0.001)[0] is False
+
+
+def test_byte_limit_rejection_keeps_request_tokens(limited_app):
+    app, limiter = limited_app
+    client = app.test_client()
+
+    response = client.post('/upload', data=b'x' * 60)
+    assert response.status_code == 200
+    response = client.post('/upload', data=b'x' * 60)
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    # Only the first upload was charged, so a small one still fits both buckets
+    assert client.post('/upload', data=b'x' * 10).status_code == 200
+    assert client.post('/upload', data=b'x' * 10).status_code == 429
+
+
+def test_client_address_uses_forwarded_for_behind_a_trusted_proxy():
+    app = Flask(__name__)
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1)
+    app.route('/')(client_address)
+
+    client = app.test_client()
+    assert client.get('/', headers={'X-Forwarded-For': '203.0.113.7'}).text == '203.0.113.7'
+    assert client.get('/', headers={'X-Forwarded-For': '198.51.100.1, 203.0.113.8'}).text == '203.0.113.8'
+
+
+def test_client_address_warns_when_forwarded_for_is_not_trusted(monkeypatch, capsys):
+    monkeypatch.setattr(ratelimit, '_untrusted_proxy_warned', False)
+    app = Flask(__name__)
+    app.route('/')(client_address)
+
+    client = app.test_client()
+    assert client.get('/', headers={'X-Forwarded-For': '203.0.113.7'}).text == '127.0.0.1'
+    client.get('/', headers={'X-Forwarded-For': '203.0.113.8'})
+    assert capsys.readouterr().out.count('TRUSTED_PROXIES is 0') == 1
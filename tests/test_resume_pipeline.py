@@ -0,0 +1,34 @@
+import time
+
+import mongomock
+import pytest
+
+from utils import resume_pipeline
+from utils.resume_pipeline import ResumePipeline
+from utils.resume_store import ResumeStore
+
+
+def hang(path):
+    time.sleep(60)
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().career_portal
+
+
+def test_job_running_past_the_timeout_is_failed_and_its_process_killed(db, tmp_path, monkeypatch):
+    # Pool processes are forked, so they see the patched analyzer
+    monkeypatch.setattr(resume_pipeline, 'analyze_resume', hang)
+    pipeline = ResumePipeline(ResumeStore(str(tmp_path)), max_workers=1, timeout=0.5)
+    pipeline.enqueue(db, 'stuck.pdf')
+    db.applications.insert_one({'resume_path': 'stuck.pdf'})
+
+    started = time.monotonic()
+    pipeline.run(db, once=True, poll_interval=0.1)
+
+    assert time.monotonic() - started < 10
+    job = db.resume_jobs.find_one({'_id': 'stuck.pdf'})
+    assert job['status'] == 'failed'
+    assert 'timed out' in job['error']
+    assert db.applications.find_one()['resume_info']['status'] == 'failed'
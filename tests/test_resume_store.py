@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import mongomock
+import pytest
+
+from utils import resume_store
+from utils.resume_store import HashingUpload, ResumeStore
+
+PDF = b'%PDF-1.4\n1 0 obj <<>> endobj\ntrailer <<>>\n%%EOF\n'
+
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().career_portal
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResumeStore(str(tmp_path))
+
+
+def upload(store, data=PDF):
+    stream = HashingUpload(store.directory, None)
+    stream.write(data)
+    return SimpleNamespace(stream=stream)
+
+
+def test_identical_uploads_share_one_blob(db, store):
+    first, second = store.save(db, upload(store)), store.save(db, upload(store))
+    assert first == second
+    assert db.resumes.find_one({'_id': first})['refs'] == 2
+    assert store.release(db, first) is False
+    assert os.path.exists(store.path(first))
+    assert store.release(db, first) is True
+    assert not os.path.exists(store.path(first))
+    assert db.resumes.find_one({'_id': first}) is None
+
+
+def test_save_during_release_keeps_the_new_reference(db, store, monkeypatch):
+    filename = store.save(db, upload(store))
+    saved, savers = [], []
+    remove = os.remove
+
+    def remove_while_saving(path):
+        # The last reference is being dropped when the same resume is uploaded again
+        saver = threading.Thread(target=lambda: saved.append(store.save(db, upload(store))))
+        savers.append(saver)
+        saver.start()
+        time.sleep(0.2)
+        assert saver.is_alive()  # Waits for the release instead of trusting the doomed file
+        remove(path)
+
+    monkeypatch.setattr(resume_store.os, 'remove', remove_while_saving)
+    assert store.release(db, filename) is True
+    savers[0].join(5)
+
+    assert saved == [filename]
+    assert os.path.exists(store.path(filename))
+    record = db.resumes.find_one({'_id': filename})
+    assert record['refs'] == 1 and 'deleting' not in record
+
+
+def test_release_of_a_missing_record_leaves_the_blob(db, store):
+    filename = store.save(db, upload(store))
+    db.resumes.delete_one({'_id': filename})  # Already dropped by a concurrent release
+    assert store.release(db, filename) is False
+    assert os.path.exists(store.path(filename))
+
+
+def test_release_removes_files_stored_before_reference_counting(db, store):
+    legacy = os.path.join(store.directory, 'resume.pdf')
+    with open(legacy, 'wb') as f:
+        f.write(PDF)
+    assert store.release(db, 'resume.pdf') is True
+    assert not os.path.exists(legacy)
+
+
+def test_release_many_reports_each_application_sharing_a_blob(db, store):
+    filename = store.save(db, upload(store))
+    store.save(db, upload(store))
+    outcomes = store.release_many(db, {'a': filename, 'b': filename}, timeout=5)
+    assert sorted(outcomes.values()) == ['deleted', 'kept']
+    assert set(outcomes) == {'a', 'b'}
+    assert not os.path.exists(store.path(filename))
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+from bson import ObjectId
+
+from utils.search import SearchIndex, tokenize
+
+pytest.importorskip('scipy')
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def opportunity(title, description='', **fields):
+    return dict({'_id': ObjectId(), 'title': title, 'description': description, 'type': 'job',
+                 'status': 'active', 'is_paid': False, 'created_at': NOW}, **fields)
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().career_portal.opportunities
+
+
+def titles(index, query='', **filters):
+    documents = {document['_id']: document['title'] for document in index.collection.find()}
+    results, _ = index.search(query, now=NOW, **filters)
+    return [documents.get(opportunity_id, opportunity_id) for opportunity_id, _ in results]
+
+
+def test_tokenize_drops_stopwords_and_plurals():
+    assert tokenize('The Engineers of Python') == ['engineer', 'python']
+
+
+def test_title_matches_rank_above_description_matches(collection):
+    collection.insert_many([
+        opportunity('Office Manager', 'Work with our python team'),
+        opportunity('Python Developer', 'Build services'),
+        opportunity('Data Analyst', 'Spreadsheets'),
+    ])
+    assert titles(SearchIndex(collection), 'python developers') == ['Python Developer', 'Office Manager']
+
+
+def test_filters_and_the_live_set(collection):
+    collection.insert_many([
+        opportunity('Paid Python Job', is_paid=True, payment_amount=50000),
+        opportunity('Cheap Python Job', is_paid=True, payment_amount=5000),
+        opportunity('Python Internship', type='internship'),
+        opportunity('Expired Python Job', deadline=NOW - timedelta(days=1)),
+        opportunity('Python Job Closing Today', deadline=NOW.replace(hour=0)),
+        opportunity('Inactive Python Job', status='inactive'),
+    ])
+    index = SearchIndex(collection)
+    assert set(titles(index, 'python')) == {'Paid Python Job', 'Cheap Python Job', 'Python Internship',
+                                            'Python Job Closing Today'}
+    assert titles(index, 'python', type='internship') == ['Python Internship']
+    assert titles(index, 'python', is_paid=True, min_payment=10000) == ['Paid Python Job']
+    assert titles(index, 'python', deadline_to=NOW) == ['Python Job Closing Today']
+    assert titles(index, 'cobol') == []
+
+
+def test_without_terms_results_come_newest_first(collection):
+    collection.insert_many([opportunity('Older', created_at=NOW - timedelta(days=2)),
+                            opportunity('Newer', created_at=NOW - timedelta(days=1))])
+    assert titles(SearchIndex(collection)) == ['Newer', 'Older']
+
+
+def test_incremental_upsert_and_remove(collection):
+    first, second = opportunity('Rust Engineer'), opportunity('Go Engineer')
+    collection.insert_many([first, second])
+    index = SearchIndex(collection)
+    assert len(titles(index, 'engineer')) == 2
+
+    collection.update_one({'_id': first['_id']}, {'$set': {'title': 'Rust Designer'}})
+    index.upsert(collection.find_one({'_id': first['_id']}))
+    index.remove(second['_id'])
+    assert titles(index, 'engineer') == []
+    assert titles(index, 'designer') == ['Rust Designer']
+
+
+class ChangingDuringScan:
+    """A collection that runs on_scan while a rebuild is reading it"""
+    def __init__(self, collection, on_scan):
+        self.collection = collection
+        self.on_scan = on_scan
+
+    def find(self, *args, **kwargs):
+        documents = list(self.collection.find(*args, **kwargs))
+        self.on_scan()
+        return documents
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+def test_writes_during_a_rebuild_are_replayed_onto_the_new_index(collection):
+    collection.insert_one(opportunity('Java Engineer'))
+    index = SearchIndex(collection)
+    added = opportunity('Kotlin Engineer')
+
+    def add_during_scan():
+        collection.insert_one(added)
+        index.upsert(added)
+    index.collection = ChangingDuringScan(collection, add_during_scan)
+    index.rebuild()
+    index.collection = collection
+
+    assert set(titles(index, 'engineer')) == {'Java Engineer', 'Kotlin Engineer'}
+    assert index._built_at is not None
+
+
+def test_invalidate_during_a_rebuild_forces_another(collection):
+    index = SearchIndex(collection)
+    index.collection = ChangingDuringScan(collection, index.invalidate)
+    index.rebuild()
+    index.collection = collection
+    assert index._built_at is None  # The scan may have missed what the invalidate was for
+
+    collection.insert_one(opportunity('Scala Engineer'))
+    assert titles(index, 'scala') == ['Scala Engineer']
@@ -0,0 +1,104 @@
+import atexit
+import os
+import queue
+import threading
+import time
+
+
+class ActivityLogWriter:
+    """Buffered, asynchronous writer for the activity_log collection.
+
+    log() only enqueues the entry, so request latency is unaffected by Mongo.
+    A background thread drains the bounded queue and writes batches with
+    insert_many every flush_interval seconds or batch_size entries, whichever
+    comes first. When the queue is full new entries are dropped and counted
+    rather than blocking the request.
+    """
+    def __init__(self, collection, max_queue=10000, batch_size=100, flush_interval=0.5):
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        atexit.register(self.close)
+
+    def log(self, entry):
+        """Queue an activity entry; returns False if it had to be dropped"""
+        if self._closed:
+            return False
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.queued += 1
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self.queued,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'pending': self._queue.qsize()
+            }
+
+    def close(self, timeout=5):
+        """Stop accepting entries and flush what is queued"""
+        self._closed = True
+        thread = self._thread
+        if thread is not None and thread.is_alive() and self._pid == os.getpid():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _ensure_thread(self):
+        # Threads do not survive fork, so (re)start the writer in each worker process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                entry = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                entry = False
+
+            stopping = entry is None
+            if entry:
+                batch.append(entry)
+
+            if batch and (stopping or len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write(batch)
+                batch = []
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+            if stopping:
+                return
+
+    def _write(self, batch):
+        try:
+            self.collection.insert_many(batch, ordered=False)
+            with self._lock:
+                self.written += len(batch)
+        except Exception as e:
+            with self._lock:
+                self.failed += len(batch)
+            print(f"Could not write activity log batch: {e}")
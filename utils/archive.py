@@ -0,0 +1,104 @@
+import time
+from datetime import datetime
+from pymongo import ReplaceOne
+from models import Opportunity
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+class Throttle:
+    """Keeps a batch job to a fraction of wall-clock time.
+
+    After each batch that took t seconds, pause() sleeps long enough that
+    work is at most duty_cycle of the elapsed time, and never less than
+    min_pause. Outside the optional (start_hour, end_hour) UTC window the
+    job stops, so it stays out of peak traffic.
+    """
+    def __init__(self, duty_cycle=0.25, min_pause=0.1, window=None, sleep=time.sleep):
+        self.duty_cycle = duty_cycle
+        self.min_pause = min_pause
+        self.window = window
+        self.sleep = sleep
+
+    def in_window(self, now=None):
+        if not self.window:
+            return True
+        start, end = self.window
+        hour = (now or datetime.utcnow()).hour
+        return start <= hour < end if start <= end else hour >= start or hour < end
+
+    def pause(self, busy_seconds):
+        self.sleep(max(self.min_pause, busy_seconds * (1 - self.duty_cycle) / self.duty_cycle))
+
+
+def parse_window(value):
+    """Parse an 'HH-HH' UTC hour window such as '1-6' or '22-5'; blank means always"""
+    if not value:
+        return None
+    start, end = value.split('-')
+    return int(start), int(end)
+
+
+def _move(source, target, documents):
+    """Copy documents into target (idempotently) and delete them from source.
+
+    Returns the ids actually removed. Upserting by _id means a run that died
+    between the copy and the delete is simply repeated by the next run.
+    """
+    if not documents:
+        return []
+    target.bulk_write([ReplaceOne({'_id': doc['_id']}, doc, upsert=True) for doc in documents], ordered=False)
+    ids = [doc['_id'] for doc in documents]
+    source.delete_many({'_id': {'$in': ids}})
+    return ids
+
+
+def archive_opportunities(db, now=None, grace_days=0, include_applications=False,
+                          batch_size=ARCHIVE_BATCH_SIZE, throttle=None, max_batches=None):
+    """Move closed and expired opportunities into opportunities_archive in batches.
+
+    With include_applications their applications move to applications_archive
+    too (resume files stay, still referenced by the archived applications).
+    Returns a report with the number of documents moved and batches run.
+    """
+    throttle = throttle or Throttle()
+    query = Opportunity.expired_query(now, grace_days)
+    report = {'opportunities': 0, 'applications': 0, 'batches': 0, 'stopped': None}
+
+    while max_batches is None or report['batches'] < max_batches:
+        if not throttle.in_window():
+            report['stopped'] = 'outside window'
+            break
+        started = time.monotonic()
+        batch = list(db.opportunities.find(query).limit(batch_size))
+        if not batch:
+            break
+
+        ids = [doc['_id'] for doc in batch]
+        # Applications move first, so a run that dies midway leaves their
+        # opportunities in place to be picked up again by the next run
+        while include_applications:
+            applications = list(db.applications.find({'opportunity_id': {'$in': ids}}).limit(batch_size))
+            if not applications:
+                break
+            report['applications'] += len(_move(db.applications, db.applications_archive, applications))
+            throttle.pause(time.monotonic() - started)
+            started = time.monotonic()
+
+        db.opportunities_archive.bulk_write(
+            [ReplaceOne({'_id': doc['_id']}, dict(doc, archived_at=datetime.utcnow()), upsert=True)
+             for doc in batch], ordered=False)
+        # Re-check the expiry condition on delete so an opportunity reopened
+        # mid-batch stays live, together with its applications
+        db.opportunities.delete_many({'$and': [{'_id': {'$in': ids}}, query]})
+        reopened = [doc['_id'] for doc in db.opportunities.find({'_id': {'$in': ids}}, {'_id': 1})]
+        if reopened:
+            db.opportunities_archive.delete_many({'_id': {'$in': reopened}})
+            if include_applications:
+                restored = list(db.applications_archive.find({'opportunity_id': {'$in': reopened}}))
+                report['applications'] -= len(_move(db.applications_archive, db.applications, restored))
+        report['opportunities'] += len(ids) - len(reopened)
+
+        report['batches'] += 1
+        throttle.pause(time.monotonic() - started)
+    return report
@@ -0,0 +1,231 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional, .br variants are skipped without it
+    brotli = None
+
+# Sources under the static folder that are built; uploads and build output are not
+ASSET_DIRS = ('css', 'js')
+BUILD_DIR = 'dist'
+MANIFEST = 'manifest.json'
+# Hashed names change whenever the content does, so browsers may keep them for good
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+CSS_TOKENS = re.compile(r'/\*.*?\*/|"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|\s+|[^\s"\'/]+|/', re.S)
+CSS_TIGHT = set('{};,>')
+# After one of these a '/' starts a regular expression literal rather than a division
+JS_REGEX_AFTER = set('(,=:[!&|?{};+-*%<>~^') | {''}
+JS_TIGHT = set('{}()[];,:=<>?&|!*%')
+
+
+def minify_css(text):
+    """Drop comments and the whitespace CSS does not need, leaving strings alone"""
+    out = []
+    for token in CSS_TOKENS.findall(text):
+        if token.startswith('/*'):
+            continue
+        if token.isspace():
+            if out and out[-1][-1] not in CSS_TIGHT and out[-1][-1] != ':':
+                out.append(' ')
+            continue
+        if out and out[-1] == ' ' and token[0] in CSS_TIGHT:
+            out.pop()
+        if token[0] == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(token)
+    return ''.join(out).strip()
+
+
+def _js_skip_string(text, i):
+    """Index just past the string, template or regex literal starting at text[i]"""
+    quote = text[i]
+    in_class = False
+    i += 1
+    while i < len(text):
+        c = text[i]
+        if c == '\\':
+            i += 2
+            continue
+        if quote == '/':
+            if c == '[':
+                in_class = True
+            elif c == ']':
+                in_class = False
+            elif c == '/' and not in_class:
+                return i + 1
+        elif c == quote:
+            return i + 1
+        i += 1
+    raise ValueError('Unterminated literal in JavaScript source')
+
+
+def minify_js(text):
+    """Conservatively minify JavaScript: drop comments, indentation and blank lines.
+
+    Line breaks between statements are kept so automatic semicolon insertion
+    behaves exactly as in the source; string, template and regex literals
+    are copied verbatim.
+    """
+    out = []
+    i = 0
+
+    def last():
+        return out[-1][-1] if out else ''
+
+    while i < len(text):
+        c = text[i]
+        if text.startswith('//', i):
+            end = text.find('\n', i)
+            i = len(text) if end == -1 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            if end == -1:
+                raise ValueError('Unterminated comment in JavaScript source')
+            if '\n' in text[i:end]:
+                out.append('\n')
+            i = end + 2
+        elif c in '"\'`' or (c == '/' and last() in JS_REGEX_AFTER):
+            end = _js_skip_string(text, i)
+            out.append(text[i:end])
+            i = end
+        elif c.isspace():
+            end = i
+            while end < len(text) and text[end].isspace():
+                end += 1
+            newline = '\n' in text[i:end] or last() == '\n'
+            if out and last() == '\n':
+                out.pop()
+            nxt = text[end:end + 1]
+            if not out or not nxt:
+                pass
+            elif newline and last() not in '{;,' and nxt != '}':
+                out.append('\n')
+            elif not newline and last() not in JS_TIGHT and nxt not in JS_TIGHT:
+                out.append(' ')
+            i = end
+        else:
+            out.append(c)
+            i += 1
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def _write(path, data):
+    # Written under a temporary name and renamed, so a worker never serves half a file
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def build_assets(static_folder, compress=True):
+    """Minify, fingerprint and precompress the static CSS and JS.
+
+    Each source static/<dir>/<name>.<ext> is written to
+    static/dist/<dir>/<name>.<hash>.<ext>, with .gz (and, if brotli is
+    installed, .br) variants, and static/dist/manifest.json maps source
+    names to built ones. Returns the manifest.
+    """
+    manifest = {}
+    for directory in ASSET_DIRS:
+        source_dir = os.path.join(static_folder, directory)
+        if not os.path.isdir(source_dir):
+            continue
+        for root, _, files in os.walk(source_dir):
+            for name in sorted(files):
+                stem, ext = os.path.splitext(name)
+                source = os.path.join(root, name)
+                logical = os.path.relpath(source, static_folder).replace(os.sep, '/')
+                with open(source, 'rb') as f:
+                    data = f.read()
+                if ext in MINIFIERS:
+                    data = MINIFIERS[ext](data.decode('utf-8')).encode('utf-8')
+                digest = hashlib.sha256(data).hexdigest()[:12]
+                built = f'{BUILD_DIR}/{os.path.dirname(logical)}/{stem}.{digest}{ext}'
+                target = os.path.join(static_folder, *built.split('/'))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if not os.path.exists(target):
+                    _write(target, data)
+                    if compress:
+                        _write(target + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+                        if brotli is not None:
+                            _write(target + '.br', brotli.compress(data, quality=11))
+                manifest[logical] = built
+    _write(os.path.join(static_folder, BUILD_DIR, MANIFEST),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+class Assets:
+    """Serves built static assets by their fingerprinted names.
+
+    asset_url('css/style.css') in templates gives the URL of the built file
+    from static/dist/manifest.json, or of the source file when there is no
+    build (e.g. in development). init_app() takes over Flask's static view:
+    built files are answered with their precompressed .br/.gz variant when
+    the client accepts it, and with Cache-Control: public, immutable and a
+    one-year max-age. Everything else is served as before.
+    """
+    def __init__(self, app=None, enabled=True):
+        self.enabled = enabled
+        self.manifest = {}
+        self.built = set()
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.view_functions['static'] = self.send_static_file
+        app.add_template_global(self.url, 'asset_url')
+        app.extensions['assets'] = self
+        self.load()
+
+    def build(self):
+        self.manifest = build_assets(self.app.static_folder)
+        self.built = set(self.manifest.values())
+        return self.manifest
+
+    def load(self):
+        """Read the manifest written by build(); returns False when there is none"""
+        path = os.path.join(self.app.static_folder, BUILD_DIR, MANIFEST)
+        try:
+            with open(path) as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = {}
+        self.built = set(self.manifest.values())
+        return bool(self.manifest)
+
+    def url(self, filename, **values):
+        if self.enabled:
+            filename = self.manifest.get(filename, filename)
+        return url_for('static', filename=filename, **values)
+
+    def send_static_file(self, filename):
+        if filename not in self.built:
+            return self.app.send_static_file(filename)
+        mimetype = mimetypes.guess_type(filename)[0]
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if request.accept_encodings[encoding] and \
+                    os.path.exists(os.path.join(self.app.static_folder, filename + suffix)):
+                response = send_from_directory(self.app.static_folder, filename + suffix, mimetype=mimetype,
+                                               max_age=IMMUTABLE_MAX_AGE)
+                response.headers['Content-Encoding'] = encoding
+                break
+        else:
+            response = send_from_directory(self.app.static_folder, filename, mimetype=mimetype,
+                                           max_age=IMMUTABLE_MAX_AGE)
+        response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
@@ -0,0 +1,64 @@
+import asyncio
+import contextvars
+import os
+import threading
+
+
+class AsyncMongo:
+    """Motor client living on a dedicated event loop thread.
+
+    Flask runs each async view on a short-lived event loop, while a Motor
+    client must stay on the loop it was created on. This class keeps one
+    loop (and one connection pool) per worker process and runs coroutines
+    on it, so views can await queries and asyncio.gather independent ones:
+
+        count, recent = await asyncio.gather(
+            adb.run(lambda db: db.applications.count_documents({})),
+            adb.run(lambda db: db.activity_log.find().to_list(10)))
+    """
+    def __init__(self, uri, database, **client_options):
+        self.uri = uri
+        self.database = database
+        self.client_options = client_options
+        self._lock = threading.Lock()
+        self._pid = None
+        self._loop = None
+        self._client = None
+
+    def _ensure_started(self):
+        # The loop thread does not survive fork, so start one per worker process
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            from motor.motor_asyncio import AsyncIOMotorClient
+
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='motor-loop', daemon=True).start()
+
+            async def connect():
+                return AsyncIOMotorClient(self.uri, **self.client_options)
+
+            self._client = asyncio.run_coroutine_threadsafe(connect(), loop).result()
+            self._loop = loop
+            self._pid = os.getpid()
+
+    @property
+    def db(self):
+        self._ensure_started()
+        return self._client[self.database]
+
+    async def run(self, fn):
+        """Await fn(db) on the Motor loop; fn returns an awaitable (coroutine or future)"""
+        db = self.db
+        context = contextvars.copy_context()
+
+        async def call():
+            # Carry the caller's context variables (e.g. the request's metrics) onto
+            # the Motor loop; Motor passes them on to the threads running the commands
+            for variable, value in context.items():
+                variable.set(value)
+            return await fn(db)
+
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(call(), self._loop))
@@ -1,18 +1,123 @@
 from functools import wraps
 from flask import session, redirect, url_for, flash
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pymongo import UpdateOne
 from datetime import datetime
+import atexit
+import os
+import threading
+import time
+
+class HasherSaturated(Exception):
+    """Raised when the password hashing executor has no free capacity"""
+
+def normalize_hash_method(method):
+    """Spell out the default PBKDF2 iteration count so methods compare reliably"""
+    if method.startswith('pbkdf2:') and method.count(':') == 1:
+        return f'{method}:{DEFAULT_PBKDF2_ITERATIONS}'
+    return method
+
+class PasswordHasher:
+    """Runs password hashing on a bounded thread pool.
+
+    hashlib's PBKDF2 releases the GIL, so verification runs in parallel off
+    the request thread. At most max_workers + max_pending checks may be in
+    flight; beyond that verify() raises HasherSaturated instead of queueing,
+    so a login surge cannot starve every worker.
+    """
+    def __init__(self, method='pbkdf2:sha256', max_workers=4, max_pending=16, timeout=10):
+        self.method = normalize_hash_method(method)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='password-hasher')
+
+    def hash(self, password):
+        return generate_password_hash(password, method=self.method)
+
+    def needs_rehash(self, password_hash):
+        return password_hash.split('$', 1)[0] != self.method
+
+    def _check(self, password_hash, password):
+        if not check_password_hash(password_hash, password):
+            return False, None
+        # Upgrade hashes made with an older method or work factor while we have the password
+        return True, self.hash(password) if self.needs_rehash(password_hash) else None
+
+    def verify(self, password_hash, password):
+        """Return (valid, upgraded_hash); upgraded_hash is None when no rehash was needed"""
+        if not self._slots.acquire(blocking=False):
+            raise HasherSaturated()
+        try:
+            future = self._executor.submit(self._check, password_hash, password)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the hash finishes, even if this request stops waiting for it
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            raise HasherSaturated()
+
+class LastLoginRecorder:
+    """Coalesces last_login updates and writes them in periodic bulk_write batches"""
+    def __init__(self, collection, flush_interval=5):
+        self.collection = collection
+        self.flush_interval = flush_interval
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        atexit.register(self.flush)
+
+    def record(self, user_id, when=None):
+        with self._lock:
+            self._pending[user_id] = when or datetime.utcnow()
+        self._ensure_thread()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            self.collection.bulk_write([
+                UpdateOne({'_id': user_id}, {'$max': {'last_login': when}})
+                for user_id, when in pending.items()
+            ], ordered=False)
+        except Exception as e:
+            print(f"Could not write last_login batch: {e}")
+            return 0
+        return len(pending)
+
+    def _ensure_thread(self):
+        # Threads do not survive fork, so (re)start the flusher in each worker process
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive() or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='last-login-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
 
 class Auth:
-    def __init__(self, db):
+    def __init__(self, db, hasher=None, last_login=None):
         self.db = db
+        self.hasher = hasher or PasswordHasher()
+        self.last_login = last_login
 
     def create_user(self, username, email, password, role='user'):
         """Create a new user in the database"""
         user = {
             'username': username,
             'email': email,
-            'password': generate_password_hash(password),
+            'password': self.hasher.hash(password),
             'role': role,
             'created_at': datetime.utcnow(),
             'last_login': None,
@@ -21,21 +126,35 @@ class Auth:
         return self.db.users.insert_one(user)
 
     def verify_user(self, username, password):
-        """Verify user credentials"""
+        """Verify user credentials.
+
+        Raises HasherSaturated when the hashing executor is at capacity.
+        """
         user = self.db.users.find_one({'username': username})
-        if user and check_password_hash(user['password'], password):
+        if not user:
+            return None
+        valid, upgraded_hash = self.hasher.verify(user['password'], password)
+        if not valid:
+            return None
+        if upgraded_hash:
+            self.db.users.update_one(
+                {'_id': user['_id'], 'password': user['password']},
+                {'$set': {'password': upgraded_hash}}
+            )
+        if self.last_login:
+            self.last_login.record(user['_id'])
+        else:
             self.db.users.update_one(
                 {'_id': user['_id']},
                 {'$set': {'last_login': datetime.utcnow()}}
             )
-            return user
-        return None
+        return user
 
     def change_password(self, user_id, new_password):
         """Change user password"""
         return self.db.users.update_one(
             {'_id': user_id},
-            {'$set': {'password': generate_password_hash(new_password)}}
+            {'$set': {'password': self.hasher.hash(new_password)}}
         )
 
     def get_user_by_email(self, email):
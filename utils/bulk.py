@@ -0,0 +1,181 @@
+import csv
+import io
+import json
+from datetime import datetime
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from utils.serialization import dumps
+from utils.helpers import parse_deadline
+
+OPPORTUNITY_TYPES = {'internship', 'job', 'hackathon'}
+OPPORTUNITY_STATUSES = {'active', 'inactive'}
+IMPORT_CHUNK_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+
+def read_rows(stream, format):
+    """Yield (row number, dict) pairs from a CSV or JSONL byte stream, one line at a time.
+
+    Rows that cannot be read are yielded as (row number, ValueError) so they
+    are reported with the validation errors.
+    """
+    lines = iter(stream.readline, b'')
+    if format == 'csv':
+        # DictReader row numbers are 2-based: line 1 is the header
+        number = 1
+        try:
+            for number, row in enumerate(csv.DictReader(line.decode('utf-8-sig') for line in lines), start=2):
+                yield number, row
+        except UnicodeDecodeError:
+            # A CSV record may span lines, so the rest of the file cannot be trusted
+            yield number + 1, ValueError('The file is not UTF-8 text; the rows from here on were not read')
+    else:
+        for number, line in enumerate(lines, start=1):
+            try:
+                line = line.decode('utf-8-sig')
+            except UnicodeDecodeError:
+                yield number, ValueError('Line is not UTF-8 text')
+                continue
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, ValueError(f'Invalid JSON: {e}')
+                continue
+            yield number, row if isinstance(row, dict) else ValueError('Each line must be a JSON object')
+
+
+def validate_opportunity(row):
+    """Build an opportunity document from an import row, returning (document, errors)"""
+    def text(key):
+        value = row.get(key)
+        value = str(value).strip() if value is not None else ''
+        return value or None
+
+    errors = []
+    for key in ('title', 'description', 'type', 'link'):
+        if not text(key):
+            errors.append(f'{key} is required')
+
+    opportunity_type = (text('type') or '').lower()
+    if text('type') and opportunity_type not in OPPORTUNITY_TYPES:
+        errors.append(f"type must be one of {', '.join(sorted(OPPORTUNITY_TYPES))}")
+
+    status = (text('status') or 'active').lower()
+    if status not in OPPORTUNITY_STATUSES:
+        errors.append(f"status must be one of {', '.join(sorted(OPPORTUNITY_STATUSES))}")
+
+    try:
+        deadline = parse_deadline(text('deadline'))
+    except ValueError:
+        errors.append('deadline must be formatted YYYY-MM-DD')
+
+    is_paid = str(row.get('is_paid', '')).strip().lower() in ('true', '1', 'yes')
+    payment_amount = None
+    if is_paid and text('payment_amount'):
+        try:
+            payment_amount = float(text('payment_amount'))
+        except ValueError:
+            errors.append('payment_amount must be a number')
+
+    if errors:
+        return None, errors
+
+    opportunity = {
+        'title': text('title'),
+        'description': text('description'),
+        'type': opportunity_type,
+        'link': text('link'),
+        'company': text('company'),
+        'location': text('location'),
+        'deadline': deadline,
+        'created_at': datetime.utcnow(),
+        'status': status,
+        'is_paid': is_paid,
+        'payment_amount': payment_amount
+    }
+    # Remove None values to avoid storing null, as add_opportunity does
+    return {k: v for k, v in opportunity.items() if v is not None}, []
+
+
+def bulk_import_opportunities(db, rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """Validate and insert rows in unordered bulk_write chunks.
+
+    Returns a report with the inserted count and a list of (row number,
+    message) errors covering both validation and write failures.
+    """
+    report = {'inserted': 0, 'errors': []}
+    chunk, numbers = [], []
+
+    def flush():
+        if not chunk:
+            return
+        try:
+            result = db.opportunities.bulk_write(chunk, ordered=False)
+            report['inserted'] += result.inserted_count
+        except BulkWriteError as e:
+            report['inserted'] += e.details.get('nInserted', 0)
+            for error in e.details.get('writeErrors', []):
+                report['errors'].append((numbers[error['index']], error.get('errmsg', 'write failed')))
+        chunk.clear()
+        numbers.clear()
+
+    for number, row in rows:
+        if isinstance(row, Exception):
+            report['errors'].append((number, str(row)))
+            continue
+        opportunity, errors = validate_opportunity(row)
+        if errors:
+            report['errors'].append((number, '; '.join(errors)))
+            continue
+        chunk.append(InsertOne(opportunity))
+        numbers.append(number)
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    return report
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        # Dates (deadlines) round-trip through import as YYYY-MM-DD
+        if value == datetime.combine(value.date(), datetime.min.time()):
+            return value.strftime('%Y-%m-%d')
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return '' if value is None else value
+
+
+def export_rows(cursor, fields, format, transform=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield a CSV or JSONL export of a cursor in batches.
+
+    Only one batch of documents is held at a time; transform, if given, is
+    called on each batch (e.g. to join related data with one query).
+    """
+    batch = []
+
+    def render(documents):
+        if transform:
+            transform(documents)
+        if format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for document in documents:
+                writer.writerow([_csv_value(document.get(field)) for field in fields])
+            return buffer.getvalue().encode()
+        return b''.join(
+            dumps({field: document.get(field) for field in fields}) + b'\n' for document in documents
+        )
+
+    if format == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(fields)
+        yield buffer.getvalue().encode()
+
+    for document in cursor.batch_size(batch_size):
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield render(batch)
+            batch = []
+    if batch:
+        yield render(batch)
@@ -0,0 +1,339 @@
+import fcntl
+import json
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument
+from utils.helpers import decode_cursor, parse_deadline, private_directory, _keyset_page
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - listings read MongoDB without it
+    np = None
+
+MAGIC = b'CATALOG1'
+PREFIX = struct.Struct('<8sI')
+# Fields of an active opportunity kept in the snapshot (what the listing pages render)
+STRING_FIELDS = ('title', 'description', 'company', 'location', 'link', 'deadline_text')
+NUMERIC_COLUMNS = (('created_at', '<i8'), ('deadline', '<i8'), ('payment_amount', '<f8'), ('is_paid', 'u1'))
+# Sort sentinels in microseconds: a missing created_at sorts last, a missing deadline never passes
+NO_CREATED_AT = -2 ** 63
+NO_DEADLINE = 2 ** 63 - 1
+EPOCH = datetime(1970, 1, 1)
+
+
+def _micros(value):
+    return (value - EPOCH) // datetime.resolution if isinstance(value, datetime) else None
+
+
+def _datetime(micros):
+    return EPOCH + micros * datetime.resolution
+
+
+def _stamp(document):
+    """A catalog_versions document as (epoch, version); stamps from before epochs have None"""
+    if document is None:
+        return None, 0
+    epoch = document.get('epoch')
+    return (str(epoch) if epoch else None), document['version']
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def write_snapshot(path, opportunities, version, epoch=None):
+    """Write active opportunities to path as a struct-of-arrays snapshot.
+
+    Rows are grouped by type and ordered by (created_at, _id) descending,
+    the listing order. Numeric fields are fixed-width columns; strings are
+    UTF-8 in one blob per field, addressed by an offsets column. The file is
+    written beside path and renamed over it, so readers see either the old
+    snapshot or the new one, never a partial write.
+    """
+    def listing_order(doc):
+        created = _micros(doc.get('created_at'))
+        return (created if created is not None else NO_CREATED_AT), doc['_id'].binary
+    rows = sorted(opportunities, key=listing_order, reverse=True)
+    rows.sort(key=lambda doc: doc.get('type') or '')  # Stable: each type keeps the listing order
+
+    segments = {}
+    blobs = {field: bytearray() for field in STRING_FIELDS}
+    offsets = {field: [0] for field in STRING_FIELDS}
+    present = {field: [] for field in STRING_FIELDS}
+    columns = {name: [] for name, _ in NUMERIC_COLUMNS}
+    ids = bytearray()
+    for index, doc in enumerate(rows):
+        start, _ = segments.get(doc.get('type') or '', (index, index))
+        segments[doc.get('type') or ''] = (start, index + 1)
+        ids += doc['_id'].binary
+        deadline = doc.get('deadline')
+        if isinstance(deadline, str):
+            try:
+                deadline = parse_deadline(deadline)
+            except ValueError:
+                pass  # Shown as stored; never closes, as in Opportunity.live_query
+        created = _micros(doc.get('created_at'))
+        columns['created_at'].append(created if created is not None else NO_CREATED_AT)
+        columns['deadline'].append(_micros(deadline) if isinstance(deadline, datetime) else NO_DEADLINE)
+        payment = doc.get('payment_amount')
+        columns['payment_amount'].append(float(payment) if isinstance(payment, (int, float)) else math.nan)
+        columns['is_paid'].append(1 if doc.get('is_paid') else 0)
+        values = dict(doc, deadline_text=deadline if isinstance(deadline, str) else None)
+        for field in STRING_FIELDS:
+            value = values.get(field)
+            if value is not None:
+                blobs[field] += str(value).encode('utf-8')
+            offsets[field].append(len(blobs[field]))
+            present[field].append(value is not None)
+
+    arrays = [('_id', np.frombuffer(bytes(ids), dtype='u1'))]
+    arrays += [(name, np.array(columns[name], dtype=dtype)) for name, dtype in NUMERIC_COLUMNS]
+    for field in STRING_FIELDS:
+        arrays.append((f'{field}_offsets', np.array(offsets[field], dtype='<u8')))
+        # Tells a missing (None) field from an empty string
+        arrays.append((f'{field}_present', np.array(present[field], dtype='u1')))
+        arrays.append((f'{field}_strings', np.frombuffer(bytes(blobs[field]), dtype='u1')))
+
+    layout, offset = {}, 0
+    for name, array in arrays:
+        offset = _align(offset)
+        layout[name] = [offset, array.dtype.str, len(array)]
+        offset += array.nbytes
+    header = json.dumps({'version': version, 'epoch': epoch, 'count': len(rows), 'segments': segments, 'columns': layout,
+                         'built_at': datetime.utcnow().isoformat()}).encode()
+    base = _align(PREFIX.size + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(PREFIX.pack(MAGIC, len(header)) + header)
+            for name, array in arrays:
+                f.seek(base + layout[name][0])
+                f.write(array.tobytes())
+            f.truncate(base + offset)  # Trailing empty columns still lie inside the file
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class CatalogSnapshot:
+    """Read-only view of a snapshot file, mapped into memory.
+
+    Columns are NumPy arrays over the mapping, so every worker that opens
+    the same file shares its pages through the OS page cache; only the
+    rows of the page being rendered are turned into Python objects.
+    """
+    __slots__ = ('version', 'epoch', 'count', 'segments', 'columns', 'identity', '_mmap')
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_uid != os.getuid():
+                # Another user's file would be served as the public listings
+                raise ValueError(f'{path} is not owned by uid {os.getuid()}')
+            self.identity = (stat.st_ino, stat.st_mtime_ns)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, header_length = PREFIX.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a catalog snapshot')
+        header = json.loads(self._mmap[PREFIX.size:PREFIX.size + header_length])
+        base = _align(PREFIX.size + header_length)
+        self.version = header['version']
+        self.epoch = header.get('epoch')
+        self.count = header['count']
+        self.segments = {type: tuple(bounds) for type, bounds in header['segments'].items()}
+        self.columns = {name: np.frombuffer(self._mmap, dtype=dtype, count=length, offset=base + offset)
+                        for name, (offset, dtype, length) in header['columns'].items()}
+
+    def _id(self, row):
+        return self.columns['_id'][row * 12:row * 12 + 12].tobytes()
+
+    def _key(self, row):
+        return int(self.columns['created_at'][row]), self._id(row)
+
+    def _string(self, field, row):
+        if not self.columns[f'{field}_present'][row]:
+            return None
+        offsets = self.columns[f'{field}_offsets']
+        return self.columns[f'{field}_strings'][offsets[row]:offsets[row + 1]].tobytes().decode('utf-8')
+
+    def record(self, row, type):
+        """The opportunity at row as a dict shaped like its MongoDB document"""
+        columns = self.columns
+        created, deadline = int(columns['created_at'][row]), int(columns['deadline'][row])
+        payment = float(columns['payment_amount'][row])
+        document = {
+            '_id': ObjectId(self._id(row)),
+            'type': type,
+            'status': 'active',
+            'created_at': _datetime(created) if created != NO_CREATED_AT else None,
+            'deadline': _datetime(deadline) if deadline != NO_DEADLINE else self._string('deadline_text', row),
+            'is_paid': bool(columns['is_paid'][row]),
+            'payment_amount': None if math.isnan(payment) else payment,
+        }
+        for field in STRING_FIELDS[:-1]:
+            document[field] = self._string(field, row)
+        return document
+
+    def _first_after(self, start, end, key):
+        """First row in [start, end) whose (created_at, _id) sorts after key in listing order"""
+        while start < end:
+            middle = (start + end) // 2
+            if self._key(middle) < key:
+                end = middle
+            else:
+                start = middle + 1
+        return start
+
+    def page(self, type, cursor=None, per_page=20, now=None):
+        """One keyset page of live opportunities of type, exactly as helpers.paginate
+        would return it for Opportunity.live_query(type)"""
+        start, end = self.segments.get(type or '', (0, 0))
+        position = decode_cursor(cursor) if cursor else None
+        today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+        deadlines = self.columns['deadline']
+
+        if position is not None:
+            created = _micros(position[0])
+            key = (created if created is not None else NO_CREATED_AT, position[1].binary)
+            split = self._first_after(start, end, key)
+        if position is None or position[2] == 'next':
+            first = split if position is not None else start
+            rows = first + np.flatnonzero(deadlines[first:end] >= _micros(today))[:per_page + 1]
+        else:
+            # Rows before the position, nearest first (ascending, as MongoDB returns them)
+            while split > start and self._key(split - 1) == key:
+                split -= 1
+            rows = (start + np.flatnonzero(deadlines[start:split] >= _micros(today)))[::-1][:per_page + 1]
+        return _keyset_page([self.record(int(row), type) for row in rows], position, per_page)
+
+
+class Catalog:
+    """The active opportunity catalog, shared by every worker on a host.
+
+    Listing reads come from a CatalogSnapshot mapped from `path` and never
+    query MongoDB. A version stamp in the catalog_versions collection is
+    bumped by publish() after every admin write; the rebuild runs on the
+    worker's refresh thread, not in the request, and other workers notice
+    the renamed file on their next read and map the new one. Until then the
+    worker that published reads MongoDB, so an admin sees their own write.
+    Each worker also checks the stamp every refresh_interval seconds, so
+    writes made on another host (or by a CLI job) reach this host's
+    snapshot too, and on_rebuilt (e.g. dropping cached pages) runs after
+    every rebuild. The stamp carries an epoch created with it, so a
+    snapshot left over from a dropped or restored database never matches.
+    Rebuilds take a file lock, so one process per host does the work. The
+    snapshot's directory must be private to the app's user, and a file
+    owned by anyone else is never mapped.
+    """
+    def __init__(self, db, path, refresh_interval=5, on_rebuilt=None):
+        self.db = db
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.on_rebuilt = on_rebuilt
+        self._snapshot = None
+        self._published = None
+        self._lock = threading.Lock()
+        self._wake = None
+        self._pid = None
+
+    @property
+    def available(self):
+        return np is not None
+
+    def version(self):
+        """The stamp as (epoch, version); (None, 0) before the first publish"""
+        return _stamp(self.db.catalog_versions.find_one({'_id': 'opportunities'}))
+
+    def build(self, stamp):
+        """Write a snapshot of stamp, an (epoch, version) pair, unless the file already holds it"""
+        epoch, version = stamp
+        private_directory(os.path.dirname(os.path.abspath(self.path)))
+        with open(self.path + '.lock', 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            current = self._open()
+            if current is not None and (current.epoch, current.version) == (epoch, version):
+                return False
+            write_snapshot(self.path, self.db.opportunities.find({'status': 'active'}), version, epoch)
+        if self.on_rebuilt:
+            self.on_rebuilt()
+        return True
+
+    def publish(self):
+        """Bump the version stamp after a write; this host's snapshot is rebuilt in the background"""
+        if not self.available:
+            return
+        try:
+            stamp = self.db.catalog_versions.find_one_and_update(
+                {'_id': 'opportunities'}, {'$inc': {'version': 1}, '$setOnInsert': {'epoch': ObjectId()}},
+                upsert=True, return_document=ReturnDocument.AFTER)
+        except Exception as e:
+            print(f"Could not publish the opportunity catalog: {e}")
+            return
+        self._published = _stamp(stamp)
+        self._ensure_thread()
+        self._wake.set()
+
+    def refresh(self):
+        """Rebuild the snapshot if it does not hold the current stamp; returns True if rebuilt"""
+        return self.build(self.version())
+
+    def _open(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.identity != (stat.st_ino, stat.st_mtime_ns):
+            with self._lock:
+                if self._snapshot is snapshot:
+                    # The previous mapping is released once no request still uses it
+                    self._snapshot = CatalogSnapshot(self.path)
+                snapshot = self._snapshot
+        return snapshot
+
+    def _ensure_thread(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._wake = threading.Event()
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='catalog-refresh', daemon=True).start()
+
+    def _run(self):
+        while True:
+            # Woken early by publish()
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Could not refresh the opportunity catalog: {e}")
+
+    def page(self, type, cursor=None, per_page=20):
+        """A listing page from the snapshot, or None when there is no snapshot to read"""
+        if not self.available:
+            return None
+        self._ensure_thread()
+        try:
+            snapshot = self._open()
+        except (OSError, ValueError) as e:
+            print(f"Could not read the opportunity catalog: {e}")
+            return None
+        if snapshot is None:
+            return None
+        published = self._published
+        if published is not None and snapshot.epoch == published[0] and snapshot.version < published[1]:
+            return None  # This worker's write is not in the file yet
+        return snapshot.page(type, cursor, per_page)
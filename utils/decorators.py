@@ -1,5 +1,5 @@
 from functools import wraps
-from flask import session, redirect, url_for, flash, request
+from flask import session, redirect, url_for, flash, request, current_app
 from datetime import datetime
 
 def admin_required(f):
@@ -23,14 +23,20 @@ def login_required(f):
     return decorated_function
 
 def log_activity(f):
-    """Decorator to log admin activities"""
+    """Decorator to log admin activities.
+
+    Entries are handed to the ActivityLogWriter registered as
+    app.extensions['activity_log'], which writes them in the background.
+    Only state-changing requests are logged.
+    """
     @wraps(f)
     def decorated_function(*args, **kwargs):
         # Get the result from the route
         result = f(*args, **kwargs)
         
         # Log the activity
-        if session.get('is_admin'):
+        writer = current_app.extensions.get('activity_log')
+        if writer and session.get('is_admin') and request.method != 'GET':
             activity = {
                 'user_id': session.get('user_id'),
                 'username': session.get('username'),
@@ -38,10 +44,10 @@ def log_activity(f):
                 'timestamp': datetime.utcnow(),
                 'ip_address': request.remote_addr,
                 'endpoint': request.endpoint,
+                'path': request.path,
                 'method': request.method
             }
-            # You would need to pass db to this decorator somehow
-            # db.activity_log.insert_one(activity)
+            writer.log(activity)
         
         return result
-    return decorated_function
\ No newline at end of file
+    return decorated_function
@@ -1,5 +1,9 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from bson import ObjectId
+from bson.errors import InvalidId
+import base64
+import json
+import os
 import re
 
 def format_datetime(dt):
@@ -8,6 +12,25 @@ def format_datetime(dt):
         return ''
     return dt.strftime('%Y-%m-%d %H:%M:%S')
 
+def parse_deadline(value):
+    """Parse a YYYY-MM-DD deadline into a datetime (midnight UTC); blank gives None.
+
+    Raises ValueError for any other format."""
+    if isinstance(value, datetime):
+        return value
+    value = (value or '').strip()
+    if not value:
+        return None
+    return datetime.strptime(value, '%Y-%m-%d')
+
+def format_date(value):
+    """Format a deadline for display; strings stored before deadlines were dates pass through"""
+    if not value:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    return str(value)
+
 def get_pagination_params(request, default_per_page=10):
     """Get pagination parameters from request"""
     try:
@@ -18,32 +41,173 @@ def get_pagination_params(request, default_per_page=10):
         per_page = default_per_page
     return page, per_page
 
+def get_cursor_params(request, default_per_page=20, max_per_page=100):
+    """Get keyset pagination parameters (cursor token, page size) from request"""
+    try:
+        per_page = int(request.args.get('per_page', default_per_page))
+    except ValueError:
+        per_page = default_per_page
+    per_page = max(1, min(per_page, max_per_page))
+    return request.args.get('cursor'), per_page
+
+def encode_cursor(document, direction):
+    """Encode the (created_at, _id) position of a document as an opaque token"""
+    created_at = document.get('created_at')
+    payload = {
+        'c': created_at.isoformat() if created_at else None,
+        'i': str(document['_id']),
+        'd': direction
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token):
+    """Decode a cursor token, returning (created_at, _id, direction) or None if invalid"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        created_at = datetime.fromisoformat(payload['c']) if payload['c'] else None
+        direction = payload['d'] if payload['d'] in ('next', 'prev') else 'next'
+        return created_at, ObjectId(payload['i']), direction
+    except (ValueError, TypeError, KeyError, InvalidId):
+        return None
+
+def _keyset_filter(created_at, object_id, direction):
+    """Build the query matching documents after (next) or before (prev) a position
+    in (created_at desc, _id desc) order. Documents without created_at sort last."""
+    if direction == 'next':
+        if created_at is None:
+            return {'created_at': None, '_id': {'$lt': object_id}}
+        return {'$or': [
+            {'created_at': {'$lt': created_at}},
+            {'created_at': created_at, '_id': {'$lt': object_id}},
+            {'created_at': None}
+        ]}
+    if created_at is None:
+        return {'$or': [
+            {'created_at': {'$ne': None}},
+            {'created_at': None, '_id': {'$gt': object_id}}
+        ]}
+    return {'$or': [
+        {'created_at': {'$gt': created_at}},
+        {'created_at': created_at, '_id': {'$gt': object_id}}
+    ]}
+
+def _keyset_find(query, cursor, per_page):
+    """Return (position, find filter, sort spec) for one keyset page"""
+    position = decode_cursor(cursor) if cursor else None
+    direction = position[2] if position else 'next'
+
+    filters = dict(query or {})
+    if position:
+        filters = {'$and': [filters, _keyset_filter(*position)]}
+
+    order = -1 if direction == 'next' else 1
+    return position, filters, [('created_at', order), ('_id', order)]
+
+def _keyset_page(items, position, per_page):
+    """Trim the per_page + 1 fetched rows to a page and build its next/prev tokens"""
+    direction = position[2] if position else 'next'
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    if direction == 'prev':
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, position is not None
+
+    return items, {
+        'next': encode_cursor(items[-1], 'next') if items and has_next else None,
+        'prev': encode_cursor(items[0], 'prev') if items and has_prev else None,
+        'per_page': per_page
+    }
+
+def paginate(collection, query, cursor=None, per_page=20, projection=None):
+    """Fetch one page of documents ordered by (created_at, _id) descending.
+
+    Uses keyset pagination: the cursor encodes the last (or first) row of the
+    previous page, so every page is an indexed range scan of per_page + 1
+    documents no matter how deep it is. Returns (items, pagination) where
+    pagination holds the next/prev tokens (None at either end).
+    """
+    position, filters, sort = _keyset_find(query, cursor, per_page)
+    items = list(collection.find(filters, projection).sort(sort).limit(per_page + 1))
+    return _keyset_page(items, position, per_page)
+
+async def paginate_async(collection, query, cursor=None, per_page=20, projection=None):
+    """paginate() for a Motor collection"""
+    position, filters, sort = _keyset_find(query, cursor, per_page)
+    items = await collection.find(filters, projection).sort(sort).limit(per_page + 1).to_list(per_page + 1)
+    return _keyset_page(items, position, per_page)
+
 def validate_email(email):
     """Validate email format"""
     pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
     return re.match(pattern, email) is not None
 
-def get_opportunity_stats(db):
-    """Get statistics about opportunities"""
-    return {
-        'total': db.opportunities.count_documents({}),
-        'active': db.opportunities.count_documents({'status': 'active'}),
-        'by_type': {
-            'internship': db.opportunities.count_documents({'type': 'internship'}),
-            'job': db.opportunities.count_documents({'type': 'job'}),
-            'hackathon': db.opportunities.count_documents({'type': 'hackathon'})
-        }
-    }
+def _facet_count(result, key):
+    """Read a {'$count': 'n'} facet result, which is empty when nothing matched"""
+    return result[key][0]['n'] if result[key] else 0
+
+def opportunity_stats_pipeline():
+    """$facet pipeline computing every opportunity counter in one pass"""
+    return [{'$facet': {
+        'total': [{'$count': 'n'}],
+        'active': [{'$match': {'status': 'active'}}, {'$count': 'n'}],
+        'by_type': [{'$group': {'_id': '$type', 'n': {'$sum': 1}}}]
+    }}]
 
-def get_application_stats(db):
-    """Get statistics about applications"""
+def parse_opportunity_stats(result):
+    by_type = {'internship': 0, 'job': 0, 'hackathon': 0}
+    by_type.update({row['_id']: row['n'] for row in result['by_type'] if row['_id']})
     return {
-        'total': db.applications.count_documents({}),
-        'pending': db.applications.count_documents({'status': 'pending'}),
-        'accepted': db.applications.count_documents({'status': 'accepted'}),
-        'rejected': db.applications.count_documents({'status': 'rejected'})
+        'total': _facet_count(result, 'total'),
+        'active': _facet_count(result, 'active'),
+        'by_type': by_type
     }
 
+def application_stats_pipeline(new_since=None):
+    """$facet pipeline computing every application counter in one pass"""
+    new_since = new_since or datetime.utcnow() - timedelta(days=1)
+    return [{'$facet': {
+        'total': [{'$count': 'n'}],
+        'new': [{'$match': {'created_at': {'$gte': new_since}}}, {'$count': 'n'}],
+        'by_status': [{'$group': {'_id': '$status', 'n': {'$sum': 1}}}]
+    }}]
+
+def parse_application_stats(result):
+    stats = {'total': _facet_count(result, 'total'), 'new': _facet_count(result, 'new'),
+             'pending': 0, 'accepted': 0, 'rejected': 0}
+    stats.update({row['_id']: row['n'] for row in result['by_status'] if row['_id']})
+    return stats
+
+def get_opportunity_stats(db):
+    """Get statistics about opportunities in a single aggregation pass"""
+    return parse_opportunity_stats(next(db.opportunities.aggregate(opportunity_stats_pipeline())))
+
+def get_application_stats(db, new_since=None):
+    """Get statistics about applications in a single aggregation pass"""
+    return parse_application_stats(next(db.applications.aggregate(application_stats_pipeline(new_since))))
+
+def build_search_query(term, filters=None, collection=None, fields=()):
+    """Build a Mongo query for a free-text search plus exact-match filters.
+
+    The term goes to the text index as typed, which matches whole (stemmed)
+    words. Given the collection and its text-indexed fields, a term the
+    index finds nothing for is matched as a case-insensitive substring of
+    those fields instead, so a partial word like "eng" still finds "engineer".
+    """
+    query = {k: v for k, v in (filters or {}).items() if v}
+    term = (term or '').strip()
+    if not term:
+        return query
+    text_query = dict(query, **{'$text': {'$search': term}})
+    if collection is None or not fields or collection.find_one(text_query, {'_id': 1}) is not None:
+        return text_query
+    pattern = {'$regex': re.escape(term), '$options': 'i'}
+    return dict(query, **{'$or': [{field: pattern} for field in fields]})
+
 def sanitize_input(text):
     """Sanitize user input"""
     if not text:
@@ -55,4 +219,15 @@ def sanitize_input(text):
     text = text.replace('<', '&lt;')
     text = text.replace('>', '&gt;')
     text = text.replace('"', '&quot;')
-    return text
\ No newline at end of file
+    return text
+
+def private_directory(path):
+    """Create path (mode 0700) if missing and make sure no other user can write to it.
+
+    Raises OSError when the directory belongs to another user or is group or
+    world writable, e.g. a predictable name under /tmp taken by someone else."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    stat = os.stat(path)
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+        raise OSError(f'{path} must be owned by uid {os.getuid()} and not writable by group or others')
+    return path
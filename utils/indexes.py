@@ -0,0 +1,144 @@
+import os
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+from models import Opportunity
+
+# Indexes required by the queries the app issues, keyed by collection.
+# create_indexes() is a no-op for indexes that already exist with the same
+# spec, so this can be applied on every boot.
+INDEXES = {
+    'opportunities': [
+        # /api/v1/opportunities (live_query without a type) and admin listing: find({'status': ...})
+        IndexModel([('status', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)],
+                   name='status_created_at'),
+        # Public listings (Opportunity.live_query) paginated on (created_at, _id)
+        IndexModel([('status', ASCENDING), ('type', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)],
+                   name='status_type_created_at'),
+        # Archival job: expired deadlines
+        IndexModel([('deadline', ASCENDING)], name='deadline'),
+        # Admin search (/admin/api/search)
+        IndexModel([('title', TEXT), ('company', TEXT), ('location', TEXT)], name='search'),
+    ],
+    'applications': [
+        # Admin listing paginated on (created_at, _id)
+        IndexModel([('created_at', DESCENDING), ('_id', DESCENDING)], name='created_at'),
+        IndexModel([('opportunity_id', ASCENDING)], name='opportunity_id'),
+        # Resume pipeline: results written to every application sharing a file
+        IndexModel([('resume_path', ASCENDING)], name='resume_path'),
+        # Admin search (/admin/api/search)
+        IndexModel([('name', TEXT), ('email', TEXT), ('phone', TEXT), ('opportunity_title', TEXT)],
+                   name='search'),
+    ],
+    'opportunities_archive': [
+        IndexModel([('archived_at', DESCENDING)], name='archived_at'),
+    ],
+    'applications_archive': [
+        IndexModel([('opportunity_id', ASCENDING)], name='opportunity_id'),
+    ],
+    'resume_jobs': [
+        # Resume pipeline: claim the next ready job
+        IndexModel([('status', ASCENDING), ('next_attempt_at', ASCENDING)], name='status_next_attempt_at'),
+    ],
+    'mock_test_attempts': [
+        # Mock test grader: tests with submissions, then a batch of a test's submitted attempts
+        IndexModel([('status', ASCENDING), ('test_id', ASCENDING)], name='status_test_id'),
+        # Mock test grader: attempts whose time ran out without a submission
+        IndexModel([('status', ASCENDING), ('expires_at', ASCENDING)], name='status_expires_at'),
+    ],
+    'rate_limits': [
+        # RATE_LIMIT_BACKEND=mongo: drop buckets of clients that went quiet
+        IndexModel([('expires_at', ASCENDING)], name='expires_at', expireAfterSeconds=0),
+    ],
+    'users': [
+        # Login lookup
+        IndexModel([('username', ASCENDING)], name='username'),
+        # Admin listing paginated on (created_at, _id)
+        IndexModel([('created_at', DESCENDING), ('_id', DESCENDING)], name='created_at'),
+    ],
+    'activity_log': [
+        # Dashboard "recent activity"; also expires old entries so the collection stays small
+        IndexModel([('timestamp', DESCENDING)], name='timestamp',
+                   expireAfterSeconds=int(os.getenv('ACTIVITY_LOG_TTL_DAYS', 90)) * 24 * 3600),
+    ],
+}
+
+
+# Server error codes for an existing index whose options or key differ from the declaration
+INDEX_OPTIONS_CONFLICT = 85
+INDEX_KEY_SPECS_CONFLICT = 86
+
+
+def ensure_indexes(db, rebuild=False):
+    """Create every declared index, returning ({collection: [index names]}, conflicts).
+
+    An existing index that conflicts with its declaration (e.g. a TTL added
+    later) is left alone and reported in conflicts as {collection: [(index
+    name, server message)]}; with rebuild it is dropped and recreated so the
+    declaration wins. Dropping a large index is slow and leaves its queries
+    unindexed meanwhile, so only an operator asks for it.
+    """
+    created, conflicts = {}, {}
+    for collection, indexes in INDEXES.items():
+        try:
+            created[collection] = db[collection].create_indexes(indexes)
+            continue
+        except OperationFailure as e:
+            if e.code not in (INDEX_OPTIONS_CONFLICT, INDEX_KEY_SPECS_CONFLICT):
+                raise
+        created[collection] = []
+        for index in indexes:
+            try:
+                created[collection] += db[collection].create_indexes([index])
+            except OperationFailure as e:
+                if e.code not in (INDEX_OPTIONS_CONFLICT, INDEX_KEY_SPECS_CONFLICT):
+                    raise
+                if not rebuild:
+                    conflicts.setdefault(collection, []).append((index.document['name'], str(e)))
+                    continue
+                if e.code == INDEX_OPTIONS_CONFLICT:
+                    db[collection].drop_index(list(index.document['key'].items()))
+                else:
+                    db[collection].drop_index(index.document['name'])
+                created[collection] += db[collection].create_indexes([index])
+    return created, conflicts
+
+
+def _checked_queries(db):
+    """Cursors for the hot queries whose plans must use an index.
+
+    The dashboard counters are not here: their $facet aggregations read the
+    whole collection by design and are cached by StatsCache.
+    """
+    return {
+        'api_opportunities': db.opportunities.find(Opportunity.live_query()).sort(
+            [('created_at', -1), ('_id', -1)]).limit(21),
+        'listing': db.opportunities.find(Opportunity.live_query('internship')).sort(
+            [('created_at', -1), ('_id', -1)]).limit(21),
+        'archive_opportunities': db.opportunities.find(Opportunity.expired_query()).limit(500),
+        'login': db.users.find({'username': ''}).limit(1),
+        'admin_dashboard.recent_activities': db.activity_log.find().sort('timestamp', -1).limit(10),
+    }
+
+
+def _plan_stages(plan):
+    """Yield every stage name in an explain() plan tree"""
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            yield plan['stage']
+        for value in plan.values():
+            yield from _plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+
+def check_indexes(db):
+    """Explain each hot query and return {query name: winning stages} for any
+    whose winning plan falls back to a COLLSCAN. An empty dict means all good."""
+    failures = {}
+    for name, cursor in _checked_queries(db).items():
+        winning_plan = cursor.explain().get('queryPlanner', {}).get('winningPlan', {})
+        stages = list(_plan_stages(winning_plan))
+        if 'COLLSCAN' in stages:
+            failures[name] = stages
+    return failures
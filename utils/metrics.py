@@ -0,0 +1,302 @@
+import bisect
+import contextvars
+import hmac
+import ipaddress
+import threading
+import time
+from collections import Counter as TallyCounter
+from flask import Response, abort, g, request
+from pymongo import monitoring
+
+# Latency buckets in seconds, from cache hits to slow exports
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COMMAND_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labelnames, labels)} {_number(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(labels, ([0] * (len(self.buckets) + 1), 0))
+            counts[index] += 1
+            self._values[labels] = (counts, total + value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket'
+                                 f'{_labels(self.labelnames, labels, [("le", _number(bound))])} {cumulative}')
+                lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}')
+                lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+
+class Gauge:
+    """Gauge read from a callback at scrape time; fn returns a number or {labels: number}.
+
+    With ttl, a value is reused for that many seconds and concurrent scrapes
+    wait for one call, so an expensive fn (e.g. a MongoDB aggregation) runs
+    at most once per ttl however often /metrics is fetched.
+    """
+    def __init__(self, name, help, fn, labelnames=(), ttl=0):
+        self.name = name
+        self.help = help
+        self.fn = fn
+        self.labelnames = tuple(labelnames)
+        self.ttl = ttl
+        self._cached = None
+        self._lock = threading.Lock()
+
+    def collect(self):
+        if not self.ttl:
+            return self.fn()
+        with self._lock:
+            if self._cached is None or time.monotonic() >= self._cached[0]:
+                self._cached = (time.monotonic() + self.ttl, self.fn())
+            return self._cached[1]
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        try:
+            values = self.collect()
+        except Exception as e:
+            print(f"Could not collect {self.name}: {e}")
+            return lines
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in sorted(values.items()):
+            labels = labels if isinstance(labels, tuple) else (labels,)
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {_number(value)}')
+        return lines
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when one request issues more Mongo commands than allowed"""
+
+
+class RequestStats:
+    """MongoDB commands issued while handling one request"""
+    def __init__(self):
+        self.commands = 0
+        self.failures = 0
+        self.duration = 0.0
+        self.documents = 0
+        self.by_command = TallyCounter()
+
+
+_current = contextvars.ContextVar('request_mongo_stats', default=None)
+
+
+def _documents_returned(command_name, reply):
+    # find, getMore and aggregate return batches; findAndModify returns one document
+    cursor = reply.get('cursor')
+    if isinstance(cursor, dict):
+        return len(cursor.get('firstBatch') or cursor.get('nextBatch') or [])
+    if command_name == 'findAndModify':
+        return 1 if reply.get('value') is not None else 0
+    return 0
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Attributes every MongoDB command to the request that issued it.
+
+    pymongo publishes command events on the thread running the command,
+    so the request's RequestStats is found through a context variable.
+    Commands from background threads are recorded under 'background'.
+    """
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event, _documents_returned(event.command_name, event.reply))
+
+    def failed(self, event):
+        self.metrics.mongo_failures.inc(event.command_name)
+        self._record(event, 0, failed=True)
+
+    def _record(self, event, documents, failed=False):
+        duration = event.duration_micros / 1e6
+        self.metrics.mongo_duration.observe(event.command_name, value=duration)
+        stats = _current.get()
+        if stats is None:
+            self.metrics.mongo_documents.inc('background', amount=documents)
+            return
+        stats.commands += 1
+        stats.failures += failed
+        stats.duration += duration
+        stats.documents += documents
+        stats.by_command[event.command_name] += 1
+
+
+class Metrics:
+    """Request latency histograms and MongoDB command accounting for a Flask app.
+
+    init_app() times every request per endpoint and exposes everything in
+    the Prometheus text format at /metrics. Pass `listener` to MongoClient's
+    event_listeners. With query_budget set, requests issuing more commands
+    are logged, or fail with QueryBudgetExceeded when budget_mode='raise'.
+    Values are per process; scrape each worker, or aggregate in Prometheus.
+    /metrics answers only clients in the `allow` networks or presenting
+    `Authorization: Bearer <token>`.
+    """
+    def __init__(self, query_budget=0, budget_mode='log'):
+        self.query_budget = query_budget
+        self.budget_mode = budget_mode
+        self.collectors = []
+        self.request_duration = self.add(Histogram(
+            'http_request_duration_seconds', 'Time spent handling a request', ('endpoint', 'method')))
+        self.requests = self.add(Counter(
+            'http_requests_total', 'Requests handled', ('endpoint', 'method', 'status')))
+        self.mongo_per_request = self.add(Histogram(
+            'mongo_commands_per_request', 'MongoDB commands issued by one request', ('endpoint',),
+            buckets=COUNT_BUCKETS))
+        self.mongo_request_duration = self.add(Histogram(
+            'mongo_request_time_seconds', 'Time one request spent waiting on MongoDB', ('endpoint',)))
+        self.mongo_documents = self.add(Counter(
+            'mongo_documents_returned_total', 'Documents returned by MongoDB', ('endpoint',)))
+        self.mongo_duration = self.add(Histogram(
+            'mongo_command_duration_seconds', 'MongoDB command round trip time', ('command',),
+            buckets=COMMAND_BUCKETS))
+        self.mongo_failures = self.add(Counter(
+            'mongo_command_failures_total', 'MongoDB commands that failed', ('command',)))
+        self.budget_exceeded = self.add(Counter(
+            'mongo_query_budget_exceeded_total', 'Requests over the per-request query budget', ('endpoint',)))
+        self.listener = MongoCommandListener(self)
+
+    def add(self, collector):
+        self.collectors.append(collector)
+        return collector
+
+    def gauge(self, name, help, fn, labelnames=(), ttl=0):
+        return self.add(Gauge(name, help, fn, labelnames, ttl))
+
+    def render(self):
+        lines = []
+        for collector in self.collectors:
+            lines.extend(collector.render())
+        return '\n'.join(lines) + '\n'
+
+    def init_app(self, app, endpoint='/metrics', token=None, allow=('127.0.0.1/32', '::1/128')):
+        self.token = token
+        self.allow = [ipaddress.ip_network(network.strip()) for network in allow if network.strip()]
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule(endpoint, 'metrics', self._serve)
+        app.extensions['metrics'] = self
+
+    def _authorized(self):
+        if self.token and hmac.compare_digest(request.headers.get('Authorization', '').encode(),
+                                              f'Bearer {self.token}'.encode()):
+            return True
+        try:
+            address = ipaddress.ip_address(request.remote_addr or '')
+        except ValueError:
+            return False
+        return any(address in network for network in self.allow)
+
+    def _serve(self):
+        if not self._authorized():
+            abort(403)
+        return Response(self.render(), content_type=CONTENT_TYPE)
+
+    def _before_request(self):
+        g._metrics_started = time.perf_counter()
+        g._metrics_stats = RequestStats()
+        g._metrics_token = _current.set(g._metrics_stats)
+
+    def _after_request(self, response):
+        stats = g.get('_metrics_stats')
+        if stats is None:
+            return response
+        # Checked once: a raise here re-runs after_request for the error response
+        if self.query_budget and stats.commands > self.query_budget and not g.get('_metrics_over_budget'):
+            g._metrics_over_budget = True
+            self.budget_exceeded.inc(request.endpoint or 'unmatched')
+            summary = ', '.join(f'{name}={count}' for name, count in stats.by_command.most_common())
+            message = (f"{request.method} {request.path} issued {stats.commands} MongoDB commands "
+                       f"(budget {self.query_budget}): {summary}")
+            if self.budget_mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            print(f"Query budget exceeded: {message}")
+        self._observe(response.status_code)
+        # Visible in browser dev tools alongside the request timing
+        response.headers.add('Server-Timing', f'db;dur={stats.duration * 1000:.1f};desc="{stats.commands} commands"')
+        return response
+
+    def _teardown_request(self, exception=None):
+        # Requests that ended in an unhandled exception never reach after_request
+        if g.get('_metrics_stats') is not None and not g.get('_metrics_observed'):
+            self._observe(500)
+        token = g.pop('_metrics_token', None)
+        if token is not None:
+            try:
+                _current.reset(token)
+            except ValueError:
+                _current.set(None)  # Torn down in a different context than it was set in
+
+    def _observe(self, status):
+        g._metrics_observed = True
+        stats = g._metrics_stats
+        endpoint = request.endpoint or 'unmatched'
+        self.request_duration.observe(endpoint, request.method,
+                                      value=time.perf_counter() - g._metrics_started)
+        self.requests.inc(endpoint, request.method, str(status))
+        self.mongo_per_request.observe(endpoint, value=stats.commands)
+        self.mongo_request_duration.observe(endpoint, value=stats.duration)
+        self.mongo_documents.inc(endpoint, amount=stats.documents)
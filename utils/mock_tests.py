@@ -0,0 +1,257 @@
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - attempts are kept but not graded without it
+    np = None
+
+# Answer matrices are int8: -1 marks a question left blank
+UNANSWERED = -1
+MAX_OPTIONS = 26
+# Answers saved this long after the timer ran out still count (network delay, clock skew)
+GRACE = timedelta(seconds=30)
+# Share of the cohort answering correctly above which a question counts as easy, below which hard
+EASY, HARD = 0.75, 0.35
+
+
+class InvalidMockTest(ValueError):
+    """A test definition that cannot be imported"""
+
+
+def validate_test(definition):
+    """Check a test definition (as imported from JSON) and return the document to store.
+
+    {"title": ..., "description": ..., "duration_minutes": 30, "closes_at": "2026-11-01T18:00:00",
+     "questions": [{"text": ..., "options": ["A", "B", ...], "answer": 0}, ...]}
+    """
+    title = (definition.get('title') or '').strip()
+    if not title:
+        raise InvalidMockTest('A test needs a title')
+    questions = definition.get('questions')
+    if not isinstance(questions, list) or not questions:
+        raise InvalidMockTest('A test needs at least one question')
+    for number, question in enumerate(questions, 1):
+        options = question.get('options')
+        if not question.get('text') or not isinstance(options, list) or not 2 <= len(options) <= MAX_OPTIONS:
+            raise InvalidMockTest(f'Question {number} needs text and 2 to {MAX_OPTIONS} options')
+        answer = question.get('answer')
+        if not isinstance(answer, int) or not 0 <= answer < len(options):
+            raise InvalidMockTest(f'Question {number} has no valid answer index')
+    duration = definition.get('duration_minutes', 30)
+    if not isinstance(duration, int) or duration <= 0:
+        raise InvalidMockTest('duration_minutes must be a positive whole number')
+    closes_at = definition.get('closes_at')
+    if closes_at:
+        try:
+            closes_at = datetime.fromisoformat(closes_at)
+        except (TypeError, ValueError):
+            raise InvalidMockTest('closes_at must be an ISO date and time (UTC)')
+    return {
+        'title': title,
+        'description': definition.get('description'),
+        'duration_minutes': duration,
+        'closes_at': closes_at or None,
+        'questions': [{'text': q['text'], 'options': [str(o) for o in q['options']], 'answer': q['answer']}
+                      for q in questions],
+        'question_count': len(questions),
+        'created_at': datetime.utcnow(),
+    }
+
+
+def answer_matrix(attempts, questions):
+    """Chosen options of each attempt as an (attempts, questions) int8 array"""
+    matrix = np.full((len(attempts), questions), UNANSWERED, dtype=np.int8)
+    rows, columns, choices = [], [], []
+    for row, attempt in enumerate(attempts):
+        answers = attempt.get('answers') or {}
+        rows.extend([row] * len(answers))
+        columns.extend(int(question) for question in answers)
+        choices.extend(answers.values())
+    if rows:
+        matrix[rows, columns] = choices
+    return matrix
+
+
+def grade(matrix, key):
+    """Compare a cohort's answer matrix with the key; returns (correct matrix, scores)"""
+    correct = matrix == key
+    return correct, correct.sum(axis=1)
+
+
+def cohort_totals(matrix, correct, scores, options):
+    """Sums describing a graded cohort, additive across cohorts.
+
+    responses[q][k + 1] counts option k chosen for question q (slot 0 is
+    blank); correct_score[q] sums the scores of attempts that got q right,
+    which with the score moments gives each question's discrimination.
+    """
+    questions = matrix.shape[1]
+    slots = np.arange(questions) * (options + 1) + (matrix.astype(np.int64) + 1)
+    responses = np.bincount(slots.ravel(), minlength=questions * (options + 1)).reshape(questions, options + 1)
+    return {
+        'attempts': int(matrix.shape[0]),
+        'score_sum': int(scores.sum()),
+        'score_squares': int((scores.astype(np.int64) ** 2).sum()),
+        'scores': np.bincount(scores, minlength=questions + 1),
+        'correct': correct.sum(axis=0),
+        'correct_score': scores @ correct,
+        'responses': responses,
+    }
+
+
+def difficulty(stats):
+    """Per-question statistics from the accumulated totals of a test's stats document"""
+    attempts = stats['attempts']
+    if not attempts:
+        return []
+    correct = np.asarray(stats['correct'], dtype=np.float64)
+    responses = np.asarray(stats['responses'], dtype=np.float64)
+    p = correct / attempts
+    mean = stats['score_sum'] / attempts
+    sd = np.sqrt(max(stats['score_squares'] / attempts - mean ** 2, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Point-biserial correlation between getting the question right and the total score
+        discrimination = (np.asarray(stats['correct_score']) / correct - mean) / sd * np.sqrt(p / (1 - p))
+    discrimination = np.where(np.isfinite(discrimination), discrimination, 0.0)
+    level = np.where(p >= EASY, 'easy', np.where(p < HARD, 'hard', 'medium'))
+    return [{'p_correct': round(float(p[q]), 4), 'discrimination': round(float(discrimination[q]), 4),
+             'level': str(level[q]), 'blank': round(float(responses[q, 0] / attempts), 4),
+             'options': [round(float(share), 4) for share in responses[q, 1:] / attempts]}
+            for q in range(len(p))]
+
+
+def empty_stats(test):
+    """Zeroed totals for a test's mock_test_stats document; graders $inc into them"""
+    questions = len(test['questions'])
+    options = max(len(question['options']) for question in test['questions'])
+    return {'attempts': 0, 'score_sum': 0, 'score_squares': 0,
+            'scores': [0] * (questions + 1), 'correct': [0] * questions, 'correct_score': [0] * questions,
+            'responses': [[0] * (options + 1) for _ in range(questions)], 'questions': []}
+
+
+def percentile(stats, score):
+    """Share of graded attempts scoring below score"""
+    if not stats or not stats['attempts']:
+        return None
+    return sum(stats['scores'][:score]) / stats['attempts']
+
+
+class MockTestGrader:
+    """Grades submitted mock test attempts a cohort at a time.
+
+    Attempts are only marked submitted by the web workers; run() (the
+    `flask grade-mock-tests` worker) claims up to batch_size of them per
+    test with a lease, loads their answers as one int8 matrix, compares it
+    with the answer key in a single NumPy operation and writes every score
+    back in one bulk_write. The cohort's totals are added to the test's
+    mock_test_stats document with one $inc, and the per-question difficulty
+    derived from them is stored beside, so result pages read it instead of
+    recomputing it. Attempts whose timer ran out without a submission are
+    closed first. A worker that dies mid-batch loses its lease and the
+    attempts are graded again.
+    """
+    def __init__(self, batch_size=5000, lease=300):
+        self.batch_size = batch_size
+        self.lease = lease
+
+    @property
+    def available(self):
+        return np is not None
+
+    def close_expired(self, db, now=None):
+        """Submit attempts whose time is up (e.g. the browser was closed before submitting)"""
+        now = now or datetime.utcnow()
+        return db.mock_test_attempts.update_many(
+            {'status': 'in_progress', 'expires_at': {'$lt': now - GRACE}},
+            {'$set': {'status': 'submitted', 'submitted_at': now, 'auto_submitted': True}}
+        ).modified_count
+
+    def claim(self, db, test_id, now=None):
+        """Lease a batch of gradable attempts of a test; returns (token, attempts)"""
+        now = now or datetime.utcnow()
+        ready = {'test_id': test_id, '$or': [{'status': 'submitted'},
+                                             {'status': 'grading', 'lease_until': {'$lt': now}}]}
+        ids = [attempt['_id'] for attempt in db.mock_test_attempts.find(ready, {'_id': 1}).limit(self.batch_size)]
+        if not ids:
+            return None, []
+        token = ObjectId()
+        db.mock_test_attempts.update_many(
+            dict(ready, _id={'$in': ids}),
+            {'$set': {'status': 'grading', 'grader': token, 'lease_until': now + timedelta(seconds=self.lease)}}
+        )
+        return token, list(db.mock_test_attempts.find({'_id': {'$in': ids}, 'grader': token}, {'answers': 1}))
+
+    def grade_test(self, db, test):
+        """Grade one batch of a test's submitted attempts; returns how many were graded"""
+        token, attempts = self.claim(db, test['_id'])
+        if not attempts:
+            return 0
+        questions = test['questions']
+        key = np.array([question['answer'] for question in questions], dtype=np.int8)
+        matrix = answer_matrix(attempts, len(key))
+        correct, scores = grade(matrix, key)
+
+        now = datetime.utcnow()
+        # grader stays on graded attempts, recording whose scores were written
+        result = db.mock_test_attempts.bulk_write([
+            UpdateOne({'_id': attempt['_id'], 'grader': token, 'status': 'grading'},
+                      {'$set': {'status': 'graded', 'score': int(score), 'max_score': len(key), 'graded_at': now},
+                       '$unset': {'lease_until': ''}})
+            for attempt, score in zip(attempts, scores.tolist())
+        ], ordered=False)
+        if result.modified_count < len(attempts):
+            # The lease ran out and another grader claimed some of them: their
+            # totals are that grader's to add, so count only the rows written here
+            written = {attempt['_id'] for attempt in db.mock_test_attempts.find(
+                {'_id': {'$in': [attempt['_id'] for attempt in attempts]}, 'grader': token, 'status': 'graded'},
+                {'_id': 1})}
+            rows = np.array([attempt['_id'] in written for attempt in attempts], dtype=bool)
+            matrix, correct, scores = matrix[rows], correct[rows], scores[rows]
+            if not rows.any():
+                return 0
+
+        totals = cohort_totals(matrix, correct, scores, max(len(question['options']) for question in questions))
+        increments = {'attempts': totals['attempts'], 'score_sum': totals['score_sum'],
+                      'score_squares': totals['score_squares']}
+        for field in ('scores', 'correct', 'correct_score'):
+            increments.update((f'{field}.{i}', int(value)) for i, value in enumerate(totals[field]) if value)
+        for q, row in enumerate(totals['responses']):
+            increments.update((f'responses.{q}.{k}', int(value)) for k, value in enumerate(row) if value)
+        db.mock_test_stats.update_one({'_id': test['_id']}, {'$setOnInsert': empty_stats(test)}, upsert=True)
+        stats = db.mock_test_stats.find_one_and_update({'_id': test['_id']}, {'$inc': increments},
+                                                       return_document=ReturnDocument.AFTER)
+        # Another grader may have added a cohort since; only the newest totals write the summary
+        db.mock_test_stats.update_one({'_id': test['_id'], 'attempts': stats['attempts']},
+                                      {'$set': {'questions': difficulty(stats), 'updated_at': now}})
+        return totals['attempts']
+
+    def grade_pending(self, db):
+        """Close expired attempts and grade a batch of every test with submissions"""
+        self.close_expired(db)
+        graded = 0
+        for test_id in db.mock_test_attempts.distinct('test_id', {'status': {'$in': ['submitted', 'grading']}}):
+            test = db.mock_tests.find_one({'_id': test_id}, {'questions.answer': 1, 'questions.options': 1})
+            if test is None:
+                print(f"Attempts of deleted mock test {test_id} cannot be graded")
+                continue
+            graded += self.grade_test(db, test)
+        return graded
+
+    def backlog(self, db):
+        """Attempt counts by status, e.g. {'in_progress': 40, 'submitted': 2000, 'graded': 350}"""
+        counts = {'in_progress': 0, 'submitted': 0, 'grading': 0, 'graded': 0}
+        for row in db.mock_test_attempts.aggregate([{'$group': {'_id': '$status', 'n': {'$sum': 1}}}]):
+            counts[row['_id']] = row['n']
+        return counts
+
+    def run(self, db, once=False, poll_interval=2.0, should_stop=lambda: False):
+        """Grade until should_stop() (or, with once, until nothing is left to grade)"""
+        while not should_stop():
+            if self.grade_pending(db):
+                continue
+            if once:
+                return
+            time.sleep(poll_interval)
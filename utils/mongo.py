@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+from pymongo import MongoClient
+
+# Pool and timeout options read from the environment, as MongoClient keyword arguments
+POOL_OPTIONS = {
+    'maxPoolSize': ('MONGODB_MAX_POOL_SIZE', 50),
+    'minPoolSize': ('MONGODB_MIN_POOL_SIZE', 0),
+    'maxIdleTimeMS': ('MONGODB_MAX_IDLE_TIME_MS', None),
+    'waitQueueTimeoutMS': ('MONGODB_WAIT_QUEUE_TIMEOUT_MS', None),
+    'connectTimeoutMS': ('MONGODB_CONNECT_TIMEOUT_MS', 5000),
+    'serverSelectionTimeoutMS': ('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 5000),
+    'socketTimeoutMS': ('MONGODB_SOCKET_TIMEOUT_MS', None),
+}
+
+
+def pool_options_from_env(uri=None):
+    """Return MongoClient pool/timeout options from MONGODB_* environment variables.
+
+    Defaults are skipped for options already set in the connection string,
+    since keyword arguments would override them.
+    """
+    options = {}
+    uri_options = (uri or '').partition('?')[2].lower()
+    for option, (variable, default) in POOL_OPTIONS.items():
+        value = os.getenv(variable)
+        if value:
+            options[option] = int(value)
+        elif default is not None and f'{option.lower()}=' not in uri_options:
+            options[option] = default
+    return options
+
+
+class _LazyProxy:
+    """Resolves its target on every attribute access, so it never holds a stale client"""
+    def __init__(self, resolve):
+        self._resolve = resolve
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __getitem__(self, name):
+        return self._resolve()[name]
+
+
+class LazyDatabase(_LazyProxy):
+    """Database handle that is safe to create at import time.
+
+    Collections taken from it (e.g. db.users passed to a background writer)
+    are proxies too, so they always talk to the current process's client.
+    """
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            return getattr(self._resolve(), name)
+        return _LazyProxy(lambda: self._resolve()[name])
+
+    def __getitem__(self, name):
+        return _LazyProxy(lambda: self._resolve()[name])
+
+
+class Mongo:
+    """Per-process MongoClient created on first use.
+
+    A client's sockets and monitor threads must not be shared across fork,
+    so a new client is created whenever the process id changes; the parent's
+    client is left alone for the parent. Nothing touches the network until
+    the first query, warm_up() or ping().
+    """
+    def __init__(self, uri, database, **client_options):
+        self.uri = uri
+        self.database = database
+        self.client_options = client_options
+        self._lock = threading.Lock()
+        self._pid = None
+        self._client = None
+        self.db = LazyDatabase(lambda: self.client[self.database])
+
+    @property
+    def client(self):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._client = MongoClient(self.uri, **self.client_options)
+                    self._pid = os.getpid()
+        return self._client
+
+    def ping(self):
+        """Round trip to the server; raises on failure"""
+        self.client.admin.command('ping')
+
+    def warm_up(self):
+        """Discover the server and open a connection ahead of the first request.
+
+        pymongo then tops the pool up to minPoolSize in the background.
+        Returns the elapsed seconds, or None if the server was unreachable
+        (the worker still starts and connects on demand).
+        """
+        started = time.monotonic()
+        try:
+            self.ping()
+        except Exception as e:
+            print(f"MongoDB warm-up failed: {e}")
+            return None
+        return time.monotonic() - started
+
+    def close(self):
+        if self._client is not None and self._pid == os.getpid():
+            self._client.close()
+        self._client = None
+        self._pid = None
@@ -0,0 +1,170 @@
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, session, make_response
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+
+class LRUBackend:
+    """In-process LRU store for rendered pages and generation counters.
+
+    Any object with the same get/set/get_counter/incr methods (e.g. a Redis
+    wrapper) can be passed to PageCache instead, which shares both pages and
+    generations across workers.
+    """
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_counter(self, key):
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class MongoGenerations:
+    """Keeps pages in a per-process store but generation counters in MongoDB.
+
+    Every worker (and host) reads the same counters, so an invalidate() in
+    one worker makes the others bypass their copies of the old pages too.
+    A worker reuses a counter it read for up to max_age seconds, and keeps
+    using the last value it saw while MongoDB cannot be reached.
+    """
+    def __init__(self, pages, collection, max_age=1.0):
+        self.pages = pages
+        self.collection = collection
+        self.max_age = max_age
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self.pages.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.pages.set(key, value, ttl)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._counters[key] = (value, time.monotonic())
+        return value
+
+    def get_counter(self, key):
+        with self._lock:
+            value, read_at = self._counters.get(key, (None, None))
+        if value is not None and time.monotonic() - read_at < self.max_age:
+            return value
+        try:
+            counter = self.collection.find_one({'_id': key})
+        except PyMongoError:
+            return value or 0
+        return self._remember(key, counter['value'] if counter else 0)
+
+    def incr(self, key):
+        counter = self.collection.find_one_and_update({'_id': key}, {'$inc': {'value': 1}},
+                                                      upsert=True, return_document=ReturnDocument.AFTER)
+        return self._remember(key, counter['value'])
+
+
+class PageCache:
+    """Caches rendered GET responses per namespace generation.
+
+    Writes call invalidate(namespace), which bumps the generation so every
+    cached page of that namespace is bypassed at once; old entries simply
+    age out of the LRU. With MongoGenerations the bump reaches every worker.
+    Cached pages carry a strong ETag so browsers revalidate with
+    If-None-Match and get a 304 without a body.
+    """
+    def __init__(self, backend=None, ttl=300):
+        self.backend = backend or LRUBackend()
+        self.ttl = ttl
+
+    def invalidate(self, namespace):
+        return self.backend.incr(f'generation:{namespace}')
+
+    def _key(self, namespace):
+        generation = self.backend.get_counter(f'generation:{namespace}')
+        return f'page:{namespace}:{generation}:{request.full_path}'
+
+    def _lookup(self, namespace):
+        """Return (key, cached entry) for this request, or (None, None) to bypass the cache"""
+        # Pages carrying flashed messages are per-user; render them fresh
+        if request.method != 'GET' or session.get('_flashes'):
+            return None, None
+        key = self._key(namespace)
+        return key, self.backend.get(key)
+
+    def _store(self, key, rv):
+        """Cache a freshly rendered view result, returning the entry or the uncacheable response"""
+        response = make_response(rv)
+        if response.status_code != 200 or response.direct_passthrough:
+            return response
+        body = response.get_data()
+        entry = {
+            'body': body,
+            'mimetype': response.mimetype,
+            'etag': hashlib.sha256(body).hexdigest()
+        }
+        self.backend.set(key, entry, self.ttl)
+        return entry
+
+    def _respond(self, entry):
+        response = make_response(entry['body'])
+        response.mimetype = entry['mimetype']
+        response.set_etag(entry['etag'])
+        # Let browsers keep the page but revalidate it on every use
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+    def cached(self, namespace):
+        """Decorator caching a view's rendered page under namespace (sync or async views)"""
+        def decorator(f):
+            if inspect.iscoroutinefunction(f):
+                @wraps(f)
+                async def async_decorated_function(*args, **kwargs):
+                    key, entry = self._lookup(namespace)
+                    if key is None:
+                        return await f(*args, **kwargs)
+                    if entry is None:
+                        entry = self._store(key, await f(*args, **kwargs))
+                    return self._respond(entry) if isinstance(entry, dict) else entry
+                return async_decorated_function
+
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                key, entry = self._lookup(namespace)
+                if key is None:
+                    return f(*args, **kwargs)
+                if entry is None:
+                    entry = self._store(key, f(*args, **kwargs))
+                return self._respond(entry) if isinstance(entry, dict) else entry
+            return decorated_function
+        return decorator
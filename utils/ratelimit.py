@@ -0,0 +1,216 @@
+import inspect
+import math
+import re
+import threading
+import time
+from functools import wraps
+from flask import abort, request
+from pymongo import ReturnDocument
+from werkzeug.exceptions import TooManyRequests
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_rate(value):
+    """Parse '10/minute' or '5/30second' into (capacity, refill per second); blank means unlimited"""
+    if not value:
+        return None
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*', value)
+    if not match:
+        raise ValueError(f'Invalid rate {value!r}; expected e.g. 10/minute')
+    capacity, multiple, period = match.groups()
+    return int(capacity), int(capacity) / (int(multiple or 1) * PERIODS[period])
+
+
+class MemoryBackend:
+    """Token buckets held in this process, safe across request threads.
+
+    Limits are per worker process. Any object with the same take_all()
+    method (e.g. MongoBackend) can be passed to RateLimiter instead, which
+    shares the buckets across workers.
+    """
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate, cost=1):
+        """Spend cost tokens from key's bucket; return (allowed, tokens left)"""
+        return self.take_all([(key, capacity, rate, cost)])[0]
+
+    def take_all(self, buckets):
+        """Spend from every (key, capacity, rate, cost) bucket, or from none.
+
+        Returns (affordable, tokens left) per bucket; tokens are only
+        debited when every bucket can afford its cost, so a request turned
+        away by one bucket is not charged by the others.
+        """
+        now = time.monotonic()
+        with self._lock:
+            refilled = []
+            for key, capacity, rate, cost in buckets:
+                tokens, updated = self._buckets.get(key, (capacity, now))
+                refilled.append(min(capacity, tokens + (now - updated) * rate))
+            affordable = [tokens >= bucket[3] for tokens, bucket in zip(refilled, buckets)]
+            debit = all(affordable)
+            results = []
+            for tokens, ok, (key, _, _, cost) in zip(refilled, affordable, buckets):
+                if debit:
+                    tokens -= cost
+                self._buckets[key] = (tokens, now)
+                results.append((ok, tokens))
+            if len(self._buckets) > self.max_keys:
+                self._prune()
+            return results
+
+    def _prune(self):
+        # Drop the least recently used half; an evicted bucket starts full
+        # again, so pruning can only err towards letting a client through
+        idle = sorted(self._buckets.items(), key=lambda item: item[1][1])
+        for key, _ in idle[:len(idle) - self.max_keys // 2]:
+            del self._buckets[key]
+
+
+class MongoBackend:
+    """Token buckets in a MongoDB collection, shared by every worker.
+
+    Each take() is one findAndModify running an update pipeline, so the
+    refill and the spend are atomic and use the server's clock ($$NOW)
+    rather than each worker's. Requires MongoDB 4.2+. Buckets carry an
+    expires_at for the TTL index declared in utils/indexes.py.
+    """
+    def __init__(self, collection, expire_after=86400):
+        self.collection = collection
+        self.expire_after = expire_after
+
+    def take(self, key, capacity, rate, cost=1):
+        return self._update(key, capacity, rate, cost)
+
+    def take_all(self, buckets):
+        """Like MemoryBackend.take_all(); the buckets are checked first and
+        only then debited, so a concurrent request can slip in between and
+        let both through, but a rejection never costs a client tokens"""
+        checked = [self._update(*bucket, debit=False) for bucket in buckets]
+        if not all(allowed for allowed, _ in checked):
+            return checked
+        return [self._update(*bucket) for bucket in buckets]
+
+    def _update(self, key, capacity, rate, cost, debit=True):
+        elapsed = {'$divide': [{'$subtract': ['$$NOW', {'$ifNull': ['$updated_at', '$$NOW']}]}, 1000]}
+        refilled = {'$min': [capacity, {'$add': [{'$ifNull': ['$tokens', capacity]}, {'$multiply': [elapsed, rate]}]}]}
+        spent = {'$cond': ['$allowed', {'$subtract': ['$tokens', cost]}, '$tokens']} if debit else '$tokens'
+        bucket = self.collection.find_one_and_update(
+            {'_id': key},
+            [
+                {'$set': {'tokens': refilled, 'updated_at': '$$NOW'}},
+                {'$set': {'allowed': {'$gte': ['$tokens', cost]}}},
+                {'$set': {'tokens': spent, 'expires_at': {'$add': ['$$NOW', self.expire_after * 1000]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return bucket['allowed'], bucket['tokens']
+
+
+_untrusted_proxy_warned = False
+
+
+def client_address():
+    """Default rate limit key: the client IP (see TRUSTED_PROXIES for apps behind a proxy)"""
+    global _untrusted_proxy_warned
+    if (not _untrusted_proxy_warned and 'HTTP_X_FORWARDED_FOR' in request.environ
+            and 'werkzeug.proxy_fix.orig' not in request.environ):
+        # Behind a proxy every client arrives from the proxy's address and
+        # would share one bucket
+        _untrusted_proxy_warned = True
+        print("Rate limiting by the proxy's address: requests carry X-Forwarded-For "
+              "but TRUSTED_PROXIES is 0, so all clients share one limit")
+    return request.remote_addr or 'unknown'
+
+
+class RateLimiter:
+    """Per-client, per-route token bucket limits for Flask views.
+
+    limit() throttles how often a client may call a view; limit_upload()
+    additionally meters the bytes it may upload and admits a request from
+    its Content-Length header alone, before the body is read, so a flood of
+    large uploads is turned away without tying up a worker receiving it.
+    Rejected requests get 429 Too Many Requests with a Retry-After header.
+    on_reject(endpoint, reason) is called for every rejection (for metrics).
+    """
+    def __init__(self, backend=None, key_func=client_address, enabled=True, on_reject=None):
+        self.backend = backend or MemoryBackend()
+        self.key_func = key_func
+        self.enabled = enabled
+        self.on_reject = on_reject
+
+    def _take(self, limits):
+        """Charge each (scope, limit, cost) at once; reject if any bucket is empty"""
+        key = f'{request.endpoint}:{self.key_func()}'
+        try:
+            results = self.backend.take_all([(f'{scope}:{key}', *limit, cost) for scope, limit, cost in limits])
+        except Exception as e:
+            # A limiter outage must not take the routes down with it
+            print(f"Rate limit check failed: {e}")
+            return
+        for (scope, (_, rate), cost), (allowed, tokens) in zip(limits, results):
+            if not allowed:
+                self._reject(scope, retry_after=math.ceil((cost - tokens) / rate))
+
+    def _reject(self, reason, retry_after=None, code=429):
+        if self.on_reject:
+            self.on_reject(request.endpoint or 'unmatched', reason)
+        if code == 429:
+            raise TooManyRequests(retry_after=max(1, retry_after))
+        abort(code)
+
+    def _admit(self, requests, upload_bytes, methods):
+        if not self.enabled or request.method not in methods:
+            return
+        if upload_bytes:
+            length = request.content_length
+            if length is None:
+                # Chunked bodies cannot be metered before reading them
+                self._reject('length', code=411)
+            max_length = request.max_content_length
+            if length > upload_bytes[0] or (max_length is not None and length > max_length):
+                self._reject('size', code=413)
+        limits = []
+        if requests:
+            limits.append(('requests', requests, 1))
+        if upload_bytes:
+            limits.append(('bytes', upload_bytes, request.content_length))
+        self._take(limits)
+
+    def _guard(self, requests, upload_bytes, methods):
+        methods = {method.upper() for method in methods}
+
+        def decorator(f):
+            if requests is None and upload_bytes is None:
+                return f
+            if inspect.iscoroutinefunction(f):
+                @wraps(f)
+                async def async_decorated_function(*args, **kwargs):
+                    self._admit(requests, upload_bytes, methods)
+                    return await f(*args, **kwargs)
+                return async_decorated_function
+
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                self._admit(requests, upload_bytes, methods)
+                return f(*args, **kwargs)
+            return decorated_function
+        return decorator
+
+    def limit(self, rate, methods=('POST',)):
+        """Decorator allowing each client rate (e.g. parse_rate('10/minute')) calls of the view"""
+        return self._guard(rate, None, methods)
+
+    def limit_upload(self, rate, byte_rate, methods=('POST',)):
+        """Like limit(), plus a byte_rate bucket charged each request's Content-Length.
+
+        Requests without a Content-Length get 411, and requests larger than
+        the byte bucket or the endpoint's upload limit get 413, all before
+        any of the body is read.
+        """
+        return self._guard(rate, byte_rate, methods)
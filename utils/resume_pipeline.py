@@ -0,0 +1,344 @@
+import os
+import re
+import time
+import zipfile
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from xml.etree import ElementTree
+from pymongo import ReturnDocument
+from utils.resume_store import SIGNATURE_LENGTH, sniff_resume_type
+
+try:
+    import pypdf
+except ImportError:  # pragma: no cover - optional, better PDF text extraction
+    pypdf = None
+
+# Extracted text kept per resume; enough for search and screening
+MAX_TEXT_CHARS = 100000
+# Uncompressed size allowed inside a DOCX, against zip bombs
+MAX_DOCX_UNCOMPRESSED = 50 * 1024 * 1024
+# Total size PDF content streams may inflate to, against Flate bombs
+MAX_PDF_UNCOMPRESSED = 50 * 1024 * 1024
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PDF_STREAM = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+PDF_PAGE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+PDF_COUNT = re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b', re.S)
+PDF_TEXT = re.compile(rb'\((?:\\.|[^\\)])*\)\s*(?:Tj|\'|")|\[(?:[^\]\\]|\\.)*\]\s*TJ|T\*|ET', re.S)
+PDF_STRING = re.compile(rb'\((?:\\.|[^\\)])*\)', re.S)
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+
+class InvalidDocument(ValueError):
+    """The file is not a structurally valid document of its claimed type"""
+
+
+def _pdf_string(literal):
+    """Decode a PDF literal string (without its parentheses)"""
+    def unescape(match):
+        escaped = match.group(1)
+        if escaped[:1].isdigit():
+            return bytes([int(escaped, 8) & 0xFF])
+        return PDF_ESCAPES.get(escaped, escaped if escaped not in (b'\n', b'\r') else b'')
+    return re.sub(rb'\\([0-7]{1,3}|.)', unescape, literal, flags=re.S).decode('latin-1')
+
+
+def _pdf_streams(data, limit=MAX_PDF_UNCOMPRESSED):
+    remaining = limit
+    for match in PDF_STREAM.finditer(data):
+        try:
+            # Inflate one byte past the budget at most, to tell when it is exceeded
+            stream = zlib.decompressobj().decompress(match.group(1), remaining + 1)
+        except zlib.error:
+            stream = match.group(1)
+        if len(stream) > remaining:
+            raise InvalidDocument('PDF streams expand beyond the allowed size')
+        remaining -= len(stream)
+        yield stream
+
+
+def _analyze_pdf(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(b'%PDF-') or b'%%EOF' not in data[-2048:] or b'startxref' not in data:
+        raise InvalidDocument('PDF is truncated or has no cross-reference table')
+
+    if pypdf is not None:
+        try:
+            reader = pypdf.PdfReader(path)
+            text = '\n'.join(page.extract_text() or '' for page in reader.pages)
+            return len(reader.pages), text
+        except Exception as e:
+            raise InvalidDocument(f'PDF could not be parsed: {e}')
+
+    # Without pypdf: count page objects and pull literal strings out of the
+    # text operators of (Flate-)decoded content streams
+    streams = list(_pdf_streams(data))
+    pages = sum(len(PDF_PAGE.findall(chunk)) for chunk in [data] + streams)
+    if not pages:
+        counts = [int(a or b) for chunk in [data] + streams for a, b in PDF_COUNT.findall(chunk)]
+        pages = max(counts, default=0)
+    parts = []
+    for stream in streams:
+        if b'BT' not in stream:
+            continue
+        for match in PDF_TEXT.finditer(stream):
+            operator = match.group(0)
+            if operator in (b'T*', b'ET'):
+                parts.append('\n')
+            else:
+                parts.extend(_pdf_string(literal[1:-1]) for literal in PDF_STRING.findall(operator))
+    return pages or None, ''.join(parts)
+
+
+def _analyze_docx(path):
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile:
+        raise InvalidDocument('DOCX is not a valid ZIP archive')
+    with archive:
+        names = set(archive.namelist())
+        if '[Content_Types].xml' not in names or 'word/document.xml' not in names:
+            raise InvalidDocument('ZIP archive is not a Word document')
+        if sum(info.file_size for info in archive.infolist()) > MAX_DOCX_UNCOMPRESSED:
+            raise InvalidDocument('DOCX expands beyond the allowed size')
+
+        paragraphs, current = [], []
+        try:
+            with archive.open('word/document.xml') as document:
+                for _, element in ElementTree.iterparse(document):
+                    if element.tag == WORD_NS + 't':
+                        current.append(element.text or '')
+                    elif element.tag == WORD_NS + 'tab':
+                        current.append('\t')
+                    elif element.tag == WORD_NS + 'p':
+                        paragraphs.append(''.join(current))
+                        current = []
+                        element.clear()
+        except ElementTree.ParseError as e:
+            raise InvalidDocument(f'DOCX body is malformed: {e}')
+
+        # Page count as last saved by the editor, when it recorded one
+        pages = None
+        if 'docProps/app.xml' in names:
+            try:
+                root = ElementTree.fromstring(archive.read('docProps/app.xml'))
+                node = next((e for e in root.iter() if e.tag.endswith('}Pages')), None)
+                pages = int(node.text) if node is not None and node.text else None
+            except (ElementTree.ParseError, ValueError):
+                pass
+    return pages, '\n'.join(paragraphs)
+
+
+def _analyze_doc(path):
+    # OLE2 compound files are laid out in 512-byte sectors after the header
+    size = os.path.getsize(path)
+    if size < 1536 or size % 512:
+        raise InvalidDocument('DOC file is truncated')
+    return None, ''
+
+
+ANALYZERS = {'pdf': _analyze_pdf, 'docx': _analyze_docx, 'doc': _analyze_doc}
+
+
+def analyze_resume(path):
+    """Validate a stored resume and extract its text and page count.
+
+    Runs in a pool process. Returns the resume_info stored on applications;
+    a file that fails validation gives status 'invalid' rather than raising.
+    """
+    with open(path, 'rb') as f:
+        resume_type = sniff_resume_type(f.read(SIGNATURE_LENGTH))
+    info = {'format': resume_type, 'processed_at': datetime.utcnow()}
+    if resume_type is None:
+        return dict(info, status='invalid', error='Unrecognized file format')
+    try:
+        pages, text = ANALYZERS[resume_type](path)
+    except InvalidDocument as e:
+        return dict(info, status='invalid', error=str(e))
+    text = re.sub(r'[ \t]+', ' ', text).strip()
+    return dict(info, status='valid', pages=pages, text=text[:MAX_TEXT_CHARS],
+                text_truncated=len(text) > MAX_TEXT_CHARS)
+
+
+class ResumePipeline:
+    """Post-upload resume processing on a process pool with persistent jobs.
+
+    apply() calls enqueue(); jobs live in the resume_jobs collection, keyed
+    by the content-addressed resume filename, so identical uploads are
+    processed once. run() (the `flask process-resumes` worker) claims jobs
+    with a lease, analyzes them in pool processes and writes resume_info to
+    every application using the file. Failures are retried with
+    exponential backoff up to max_attempts; a worker that dies mid-job
+    loses its lease and the job is picked up again. A job still running
+    after timeout seconds is marked failed and its pool process killed.
+    """
+    def __init__(self, store, max_workers=2, max_attempts=5, retry_delay=30, lease=300, timeout=60):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.timeout = timeout
+
+    def enqueue(self, db, filename):
+        now = datetime.utcnow()
+        job = db.resume_jobs.find_one_and_update(
+            {'_id': filename},
+            {'$setOnInsert': {'status': 'pending', 'attempts': 0, 'next_attempt_at': now, 'created_at': now}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if job['status'] in ('done', 'failed'):
+            # Already processed for an earlier application with the same file
+            db.applications.update_many({'resume_path': filename, 'resume_info': {'$exists': False}},
+                                        {'$set': {'resume_info': job['result']}})
+        return job
+
+    def claim(self, db):
+        now = datetime.utcnow()
+        return db.resume_jobs.find_one_and_update(
+            {'$or': [{'status': 'pending', 'next_attempt_at': {'$lte': now}},
+                     {'status': 'running', 'lease_until': {'$lt': now}}]},
+            {'$set': {'status': 'running', 'lease_until': now + timedelta(seconds=self.lease)},
+             '$inc': {'attempts': 1}},
+            sort=[('next_attempt_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def complete(self, db, job, result):
+        db.applications.update_many({'resume_path': job['_id']}, {'$set': {'resume_info': result}})
+        db.resume_jobs.update_one({'_id': job['_id']},
+                                  {'$set': {'status': 'done', 'result': result, 'finished_at': datetime.utcnow()},
+                                   '$unset': {'lease_until': '', 'error': ''}})
+
+    def fail(self, db, job, error):
+        if job['attempts'] >= self.max_attempts:
+            result = {'status': 'failed', 'error': error, 'processed_at': datetime.utcnow()}
+            db.applications.update_many({'resume_path': job['_id']}, {'$set': {'resume_info': result}})
+            db.resume_jobs.update_one({'_id': job['_id']},
+                                      {'$set': {'status': 'failed', 'result': result, 'error': error},
+                                       '$unset': {'lease_until': ''}})
+            return
+        delay = self.retry_delay * 2 ** (job['attempts'] - 1)
+        db.resume_jobs.update_one({'_id': job['_id']},
+                                  {'$set': {'status': 'pending', 'error': error,
+                                            'next_attempt_at': datetime.utcnow() + timedelta(seconds=delay)},
+                                   '$unset': {'lease_until': ''}})
+
+    def renew(self, db, job):
+        """Extend a claimed job's lease (it is about to be run again)"""
+        db.resume_jobs.update_one({'_id': job['_id'], 'status': 'running'},
+                                  {'$set': {'lease_until': datetime.utcnow() + timedelta(seconds=self.lease)}})
+        return job
+
+    def release(self, db, job):
+        """Hand a claimed job back untried, refunding the attempt its claim counted"""
+        db.resume_jobs.update_one({'_id': job['_id'], 'status': 'running'},
+                                  {'$set': {'status': 'pending', 'next_attempt_at': datetime.utcnow()},
+                                   '$inc': {'attempts': -1},
+                                   '$unset': {'lease_until': ''}})
+
+    def backlog(self, db):
+        """Job counts by status, e.g. {'pending': 3, 'running': 1, 'done': 120}"""
+        counts = {'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for row in db.resume_jobs.aggregate([{'$group': {'_id': '$status', 'n': {'$sum': 1}}}]):
+            counts[row['_id']] = row['n']
+        return counts
+
+    def _record(self, db, job, future):
+        try:
+            self.complete(db, job, future.result())
+        except FileNotFoundError:
+            self.fail(db, dict(job, attempts=self.max_attempts), 'Resume file is missing')
+        except Exception as e:
+            self.fail(db, job, f'{type(e).__name__}: {e}')
+
+    def _recycle(self, pool):
+        """Kill pool's processes and return a fresh pool"""
+        # A running call cannot be cancelled, and the executor has no public
+        # way to stop the processes it runs in
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _time_out(self, db, in_flight, overdue):
+        """Fail the overdue jobs and hand back the rest (their pool is about to be killed)"""
+        for future in overdue:
+            self.fail(db, dict(in_flight.pop(future), attempts=self.max_attempts),
+                      f'Resume processing timed out after {self.timeout}s')
+        for job in in_flight.values():
+            self.release(db, job)
+        in_flight.clear()
+
+    def run(self, db, once=False, poll_interval=1.0, should_stop=lambda: False):
+        """Process jobs until should_stop() (or, with once, until none are ready)"""
+        pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        # Future -> job, and future -> when it was submitted (with at most
+        # max_workers in flight, it starts running right away)
+        in_flight, started = {}, {}
+        # Jobs in flight when a pool process died: any of them may have
+        # killed it, so they are run again one at a time to find which
+        suspects = []
+
+        def submit(job):
+            future = pool.submit(analyze_resume, self.store.path(job['_id']))
+            in_flight[future] = job
+            started[future] = time.monotonic()
+
+        try:
+            while not should_stop():
+                if suspects:
+                    if not in_flight:
+                        submit(self.renew(db, suspects.pop(0)))
+                else:
+                    while len(in_flight) < self.max_workers:
+                        job = self.claim(db)
+                        if job is None:
+                            break
+                        submit(job)
+                if not in_flight:
+                    if once:
+                        return
+                    time.sleep(poll_interval)
+                    continue
+
+                done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # A pool process died (e.g. on a hostile file) and took every job in flight with it
+                    crashed = list(in_flight.values())
+                    in_flight.clear()
+                    started.clear()
+                    pool.shutdown(wait=False)
+                    pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                    if len(crashed) == 1:
+                        self.fail(db, crashed[0], 'Resume processor crashed')
+                    else:
+                        suspects.extend(crashed)
+                    continue
+                for future in done:
+                    started.pop(future)
+                    self._record(db, in_flight.pop(future), future)
+                deadline = time.monotonic() - self.timeout
+                overdue = [future for future in in_flight if started[future] < deadline]
+                if overdue:
+                    self._time_out(db, in_flight, overdue)
+                    started.clear()
+                    pool = self._recycle(pool)
+
+            # Stopping: finish what is already running rather than waiting out
+            # the leases, but no longer than the jobs have left to run
+            if in_flight:
+                wait(in_flight, timeout=max(0, max(started.values()) + self.timeout - time.monotonic()))
+            for future in [future for future in in_flight if future.done()]:
+                self._record(db, in_flight.pop(future), future)
+            if in_flight:
+                self._time_out(db, in_flight, list(in_flight))
+                pool = self._recycle(pool)
+            for job in suspects:
+                self.release(db, job)
+        finally:
+            pool.shutdown(wait=True)
@@ -0,0 +1,239 @@
+import hashlib
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from functools import lru_cache
+from flask import Request, current_app
+from pymongo import ReturnDocument
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# Leading bytes of each accepted resume format, mapped to the stored extension
+RESUME_SIGNATURES = [
+    (b'%PDF', 'pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'doc'),  # OLE2 compound file (Word 97-2003)
+    (b'PK\x03\x04', 'docx'),                        # ZIP container (Office Open XML)
+]
+SIGNATURE_LENGTH = max(len(signature) for signature, _ in RESUME_SIGNATURES)
+CHUNK_SIZE = 64 * 1024
+# A release marks a blob's record while it removes the file; a mark older
+# than this is taken to be left by a crashed process
+DELETE_LEASE = timedelta(seconds=30)
+
+
+def sniff_resume_type(head):
+    """Return the resume extension matching the first bytes of a file, or None"""
+    for signature, extension in RESUME_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    return None
+
+RESUME_MIMETYPES = {
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
+@lru_cache(maxsize=4096)
+def _detect_file_type(path, mtime_ns, size):
+    # Keyed on the file's stat so a replaced file is re-read
+    with open(path, 'rb') as f:
+        return sniff_resume_type(f.read(SIGNATURE_LENGTH))
+
+class HashingUpload:
+    """Writable upload target that hashes, sizes and sniffs data as it arrives.
+
+    Werkzeug writes each multipart chunk here while parsing the request body,
+    so the SHA-256 is ready and oversized files are rejected as soon as they
+    cross max_size, without the body being buffered anywhere else first.
+    """
+    def __init__(self, directory, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self.head = b''
+        self._hash = hashlib.sha256()
+        self._file = tempfile.NamedTemporaryFile(dir=directory, prefix='.upload-')
+
+    @property
+    def name(self):
+        return self._file.name
+
+    @property
+    def sha256(self):
+        return self._hash.hexdigest()
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            raise RequestEntityTooLarge()
+        if len(self.head) < SIGNATURE_LENGTH:
+            self.head += bytes(data[:SIGNATURE_LENGTH - len(self.head)])
+        self._hash.update(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        # read/seek/close etc. go to the underlying temporary file
+        return getattr(self._file, name)
+
+
+class ResumeUploadRequest(Request):
+    """Request class that streams file uploads into HashingUpload targets.
+
+    Uploads are capped at MAX_RESUME_SIZE unless the endpoint has its own
+    limit in the UPLOAD_LIMITS config mapping.
+    """
+    # Allowance for the multipart framing and other form fields
+    FORM_OVERHEAD = 64 * 1024
+
+    def _upload_limit(self):
+        limits = current_app.config.get('UPLOAD_LIMITS', {})
+        return limits.get(self.endpoint, current_app.config.get('MAX_RESUME_SIZE'))
+
+    @property
+    def max_content_length(self):
+        limit = self._upload_limit()
+        return limit + self.FORM_OVERHEAD if limit is not None else None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        directory = current_app.config.get('UPLOAD_FOLDER') or tempfile.gettempdir()
+        return HashingUpload(directory, self._upload_limit())
+
+
+class InvalidResume(ValueError):
+    """Raised when an uploaded file is not an accepted resume format"""
+
+
+class ResumeStore:
+    """Content-addressed resume storage with reference counting.
+
+    Blobs are stored as <sha256>.<ext> in the upload directory and tracked in
+    the resumes collection, so identical uploads share one file and the file
+    is removed only when the last application referencing it goes away.
+    """
+    def __init__(self, directory, cleanup_workers=4):
+        self.directory = directory
+        self._cleanup = ThreadPoolExecutor(max_workers=cleanup_workers, thread_name_prefix='resume-cleanup')
+
+    def path(self, filename):
+        return os.path.join(self.directory, os.path.basename(filename))
+
+    def detect_type(self, filename):
+        """Return the sniffed extension of a stored resume (cached per file version).
+
+        Raises FileNotFoundError if the file is missing."""
+        path = self.path(filename)
+        stat = os.stat(path)
+        return _detect_file_type(path, stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def content_hash(filename):
+        """Return the SHA-256 encoded in a content-addressed filename, or None"""
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        if len(stem) == 64 and all(c in '0123456789abcdef' for c in stem):
+            return stem
+        return None
+
+    def save(self, db, resume):
+        """Store an uploaded FileStorage and return the stored filename"""
+        stream = resume.stream
+        if not isinstance(stream, HashingUpload):
+            # Uploads parsed without ResumeUploadRequest: hash by copying in chunks
+            stream = HashingUpload(self.directory, None)
+            for chunk in iter(lambda: resume.stream.read(CHUNK_SIZE), b''):
+                stream.write(chunk)
+
+        extension = sniff_resume_type(stream.head)
+        if extension is None:
+            raise InvalidResume('File content is not a PDF, DOC, or DOCX document')
+
+        filename = f'{stream.sha256}.{extension}'
+        record = db.resumes.find_one_and_update(
+            {'_id': filename},
+            {'$inc': {'refs': 1},
+             '$setOnInsert': {'size': stream.size, 'created_at': datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if record.get('deleting'):
+            # A release is removing the blob right now: link ours once it is gone
+            self._wait_for_release(db, filename, record['deleting'])
+
+        stream.flush()
+        try:
+            # Hard-link the finished temp file into place; it is unlinked on close
+            os.link(stream.name, self.path(filename))
+        except FileExistsError:
+            pass  # Identical resume already stored
+        return filename
+
+    def _wait_for_release(self, db, filename, since, poll_interval=0.05):
+        while datetime.utcnow() - since < DELETE_LEASE:
+            if db.resumes.find_one({'_id': filename, 'deleting': since}, {'_id': 1}) is None:
+                return
+            time.sleep(poll_interval)
+        db.resumes.update_one({'_id': filename, 'deleting': since}, {'$unset': {'deleting': ''}})
+
+    def release(self, db, filename):
+        """Drop one reference to a stored resume, deleting the blob with the last one.
+
+        The record stays, marked deleting, until the file is gone; a save()
+        of the same content in the meantime waits for the mark to clear and
+        then links its own copy, so it never points at a removed file.
+        """
+        record = db.resumes.find_one_and_update(
+            {'_id': filename},
+            {'$inc': {'refs': -1}},
+            return_document=ReturnDocument.AFTER
+        )
+        if record is None:
+            if self.content_hash(filename) is not None:
+                return False  # Already released by someone else
+            # A file stored before reference counting existed
+            try:
+                os.remove(self.path(filename))
+            except FileNotFoundError:
+                pass
+            return True
+        if record['refs'] > 0:
+            return False
+
+        now = datetime.utcnow()
+        since = now.replace(microsecond=now.microsecond // 1000 * 1000)  # As MongoDB stores it
+        marked = db.resumes.update_one({'_id': filename, 'refs': {'$lte': 0}, 'deleting': {'$exists': False}},
+                                       {'$set': {'deleting': since}})
+        if not marked.modified_count:
+            return False  # Referenced again, or another release is deleting it
+        try:
+            os.remove(self.path(filename))
+        except FileNotFoundError:
+            pass
+        finally:
+            # Drop the record, unless a save() referenced the content again meanwhile
+            if not db.resumes.delete_one({'_id': filename, 'refs': {'$lte': 0}, 'deleting': since}).deleted_count:
+                db.resumes.update_one({'_id': filename, 'deleting': since}, {'$unset': {'deleting': ''}})
+        return True
+
+    def release_many(self, db, filenames, timeout=None):
+        """Release several resumes in parallel on the cleanup pool.
+
+        filenames maps a key (e.g. the application id) to the resume it
+        referenced; the same file may appear under several keys and is then
+        released once per key. Waits at most timeout seconds and returns
+        {key: outcome} where outcome is 'deleted', 'kept' (still referenced),
+        'error' or 'pending' (still running in the background when the
+        timeout expired).
+        """
+        futures = {self._cleanup.submit(self.release, db, filename): key for key, filename in filenames.items()}
+        done, _ = wait(futures, timeout=timeout)
+        outcomes = {}
+        for future, key in futures.items():
+            if future not in done:
+                outcomes[key] = 'pending'
+            elif future.exception() is not None:
+                current_app.logger.error("Could not delete resume file %s: %s", filenames[key], future.exception())
+                outcomes[key] = 'error'
+            else:
+                outcomes[key] = 'deleted' if future.result() else 'kept'
+        return outcomes
@@ -0,0 +1,305 @@
+import math
+import re
+import threading
+import time
+from datetime import datetime
+from utils.helpers import parse_deadline
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # pragma: no cover - search is unavailable without them
+    np = sparse = None
+
+# Matches in the title count most, then company and location, then the description
+FIELD_WEIGHTS = {'title': 3.0, 'company': 2.0, 'location': 2.0, 'description': 1.0}
+INDEX_FIELDS = list(FIELD_WEIGHTS) + ['type', 'status', 'is_paid', 'payment_amount', 'deadline', 'created_at']
+TYPE_CODES = {'internship': 1, 'job': 2, 'hackathon': 3}
+# Rebuild without the tombstoned rows once this share of the matrix is dead
+COMPACT_RATIO = 0.25
+
+TOKEN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+STOPWORDS = frozenset('a an and are as at be by for from in is it of on or our the to we with you your'.split())
+
+
+class SearchUnavailable(RuntimeError):
+    """Raised when NumPy/SciPy are not installed"""
+
+
+def tokenize(text):
+    """Lowercased word tokens without stopwords; a plural 's' is dropped so 'engineers' matches 'engineer'"""
+    tokens = []
+    for token in TOKEN.findall((text or '').lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _deadline(value):
+    # Older documents may still hold the raw form string
+    if isinstance(value, str):
+        try:
+            value = parse_deadline(value)
+        except ValueError:
+            value = None
+    return np.datetime64(value, 's') if value else np.datetime64('NaT', 's')
+
+
+class _Snapshot:
+    """Immutable state searched without locking: the term matrix and per-row columns"""
+    def __init__(self, matrix, ids, live, meta, idf, norms):
+        self.matrix = matrix
+        self.ids = ids
+        self.live = live
+        self.meta = meta
+        self.idf = idf
+        self.norms = norms
+
+
+class SearchIndex:
+    """In-memory TF-IDF index over opportunities, scored with one sparse mat-vec.
+
+    Each opportunity is a row of a CSR matrix of sublinear, field-weighted
+    term frequencies. Queries are weighted by IDF twice (once for the
+    document side), multiplied against the matrix and divided by the rows'
+    TF-IDF norms, giving cosine similarity. Filters are NumPy masks over
+    per-row type, status, pay and deadline columns.
+
+    upsert()/remove() update the index incrementally: changed documents are
+    tokenized alone, appended as new rows and their old rows tombstoned.
+    The next search merges them in and recomputes IDF and norms from the
+    matrix. Each process keeps its own index; writes in other processes
+    are picked up by rebuilding from MongoDB every `ttl` seconds.
+    """
+    def __init__(self, collection, ttl=300):
+        self.collection = collection
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._vocab = {}
+        self._snapshot = None
+        self._pending = []
+        self._removed = set()
+        self._row_of = {}
+        self._rows = 0
+        self._built_at = None
+        self._replay = None
+        self._rebuilding = False
+
+    @property
+    def available(self):
+        return np is not None
+
+    def _row(self, document):
+        """Return (columns, weights, meta) for a document, extending the vocabulary"""
+        counts = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(document.get(field)):
+                counts[token] = counts.get(token, 0.0) + weight
+        columns = np.fromiter((self._vocab.setdefault(token, len(self._vocab)) for token in counts),
+                              dtype=np.int32, count=len(counts))
+        weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))
+        payment = document.get('payment_amount')
+        meta = (
+            TYPE_CODES.get(document.get('type'), 0),
+            document.get('status') == 'active',
+            bool(document.get('is_paid')),
+            float(payment) if isinstance(payment, (int, float)) else math.nan,
+            _deadline(document.get('deadline')),
+            np.datetime64(document.get('created_at') or datetime.min, 's'),
+        )
+        return columns, weights, meta
+
+    def upsert(self, document):
+        """Index a new or changed opportunity (the full document, with _id)"""
+        if not self.available:
+            return
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(('upsert', document))
+            if self._built_at is None:
+                return
+            previous = self._row_of.get(document['_id'])
+            if previous is not None:
+                self._removed.add(previous)
+            self._pending.append((document['_id'],) + self._row(document))
+            self._row_of[document['_id']] = self._rows
+            self._rows += 1
+
+    def remove(self, opportunity_id):
+        if not self.available:
+            return
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(('remove', opportunity_id))
+            if self._built_at is None:
+                return
+            row = self._row_of.pop(opportunity_id, None)
+            if row is not None:
+                self._removed.add(row)
+
+    def invalidate(self):
+        """Rebuild from MongoDB on the next search (e.g. after a bulk import)"""
+        with self._lock:
+            if self._replay is not None:
+                # A rebuild already reading the collection may miss the change
+                self._replay.append(('invalidate', None))
+            self._built_at = None
+
+    def rebuild(self, only_if_invalid=False):
+        """Index every opportunity from MongoDB, swapping the new index in when done.
+
+        With only_if_invalid, nothing is done if the index became valid while
+        waiting for a rebuild in another thread, so concurrent searches after
+        invalidate() share one collection scan.
+        """
+        if not self.available:
+            raise SearchUnavailable('Search requires numpy and scipy')
+        with self._rebuild_lock:
+            if only_if_invalid and self._built_at is not None:
+                return
+            fresh = SearchIndex(self.collection, self.ttl)
+            fresh._built_at = time.monotonic()
+            # Updates arriving while the collection is read are replayed onto the new index
+            with self._lock:
+                self._replay = []
+            try:
+                for document in self.collection.find({}, dict.fromkeys(INDEX_FIELDS, 1)):
+                    fresh.upsert(document)
+                fresh._merge()
+            except Exception:
+                with self._lock:
+                    self._replay = None
+                raise
+            with self._lock:
+                replay, self._replay = self._replay, None
+                for action, argument in replay:
+                    if action != 'invalidate':
+                        getattr(fresh, action)(argument)
+                self._vocab, self._snapshot, self._pending = fresh._vocab, fresh._snapshot, fresh._pending
+                self._removed, self._row_of, self._rows = fresh._removed, fresh._row_of, fresh._rows
+                invalidated = any(action == 'invalidate' for action, _ in replay)
+                self._built_at = None if invalidated else fresh._built_at
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            print(f"Could not rebuild the search index: {e}")
+        finally:
+            self._rebuilding = False
+
+    def _merge(self):
+        """Fold pending rows and removals into a new snapshot (caller holds the lock)"""
+        snapshot, vocabulary = self._snapshot, len(self._vocab)
+        blocks, ids, live, meta = [], [], [], []
+        if snapshot is not None:
+            matrix = snapshot.matrix
+            blocks.append(sparse.csr_matrix((matrix.data, matrix.indices, matrix.indptr),
+                                            shape=(matrix.shape[0], vocabulary)))
+            ids, live, meta = list(snapshot.ids), [snapshot.live], [snapshot.meta]
+        if self._pending:
+            indptr = np.cumsum([0] + [len(columns) for _, columns, _, _ in self._pending])
+            blocks.append(sparse.csr_matrix(
+                (np.concatenate([weights for _, _, weights, _ in self._pending]),
+                 np.concatenate([columns for _, columns, _, _ in self._pending]), indptr),
+                shape=(len(self._pending), vocabulary)))
+            ids.extend(document_id for document_id, _, _, _ in self._pending)
+            live.append(np.ones(len(self._pending), dtype=bool))
+            meta.append(np.array([row_meta for _, _, _, row_meta in self._pending], dtype=[
+                ('type', np.int8), ('active', bool), ('is_paid', bool), ('payment', np.float64),
+                ('deadline', 'datetime64[s]'), ('created_at', 'datetime64[s]')]))
+        if not blocks:
+            return None
+
+        matrix = sparse.vstack(blocks, format='csr') if len(blocks) > 1 else blocks[0]
+        live, meta = np.concatenate(live), np.concatenate(meta)
+        if self._removed:
+            live[list(self._removed)] = False
+        if live.size and (~live).sum() > COMPACT_RATIO * live.size:
+            keep = np.flatnonzero(live)
+            matrix, meta, ids = matrix[keep], meta[keep], [ids[i] for i in keep]
+            live = np.ones(len(ids), dtype=bool)
+            self._row_of = {document_id: row for row, document_id in enumerate(ids)}
+            self._rows = len(ids)
+
+        # Document frequencies and norms come from the live rows only
+        live_rows = matrix[np.flatnonzero(live)]
+        df = np.bincount(live_rows.indices, minlength=vocabulary)
+        idf = np.log((1.0 + live_rows.shape[0]) / (1.0 + df)) + 1.0
+        norms = np.sqrt(matrix.multiply(matrix) @ (idf ** 2))
+        norms[norms == 0] = 1.0
+        self._snapshot = _Snapshot(matrix, ids, live, meta, idf, norms)
+        self._pending, self._removed = [], set()
+        return self._snapshot
+
+    def _current(self):
+        if not self.available:
+            raise SearchUnavailable('Search requires numpy and scipy')
+        if self._built_at is None:
+            # Nothing (valid) to serve yet: build it now, or wait for the thread already doing so
+            self.rebuild(only_if_invalid=True)
+        elif time.monotonic() - self._built_at > self.ttl and not self._rebuilding:
+            # Stale: keep serving the current index while a fresh one is built
+            self._rebuilding = True
+            threading.Thread(target=self._rebuild_in_background, daemon=True).start()
+        with self._lock:
+            if self._pending or self._removed:
+                return self._merge()
+            return self._snapshot
+
+    def search(self, query='', type=None, is_paid=None, min_payment=None, deadline_from=None,
+               deadline_to=None, now=None, offset=0, limit=20):
+        """Rank live opportunities by relevance to query, after filtering.
+
+        Returns ([(opportunity_id, score)], total matches). Without query
+        terms the filtered opportunities come back newest first.
+        """
+        snapshot = self._current()
+        if snapshot is None:
+            return [], 0
+        today = np.datetime64((now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0), 's')
+        meta = snapshot.meta
+        # Same rule as Opportunity.live_query: active, and open through the deadline's day
+        mask = snapshot.live & meta['active'] & ~(meta['deadline'] < today)
+        if type:
+            mask &= meta['type'] == TYPE_CODES.get(type, -1)
+        if is_paid is not None:
+            mask &= meta['is_paid'] == is_paid
+        if min_payment is not None:
+            mask &= meta['payment'] >= min_payment
+        if deadline_from is not None:
+            mask &= meta['deadline'] >= np.datetime64(deadline_from, 's')
+        if deadline_to is not None:
+            mask &= meta['deadline'] <= np.datetime64(deadline_to, 's')
+
+        tokens = tokenize(query)
+        terms = {}
+        for token in tokens:
+            column = self._vocab.get(token)
+            if column is not None and column < snapshot.idf.size:
+                terms[column] = terms.get(column, 0) + 1
+        if terms:
+            columns = np.fromiter(terms, dtype=np.int64, count=len(terms))
+            query_weights = (1.0 + np.log(np.fromiter(terms.values(), dtype=np.float64, count=len(terms)))) \
+                * snapshot.idf[columns]
+            vector = np.zeros(snapshot.idf.size)
+            vector[columns] = query_weights * snapshot.idf[columns]
+            scores = (snapshot.matrix @ vector) / (snapshot.norms * np.linalg.norm(query_weights))
+            mask &= scores > 0
+        elif tokens:
+            return [], 0  # Only words no opportunity contains
+        else:
+            scores = np.zeros(mask.size)
+
+        rows = np.flatnonzero(mask)
+        # Best score first, ties broken by the newest posting
+        order = rows[np.lexsort((-meta['created_at'][rows].astype(np.int64), -scores[rows]))]
+        page = order[offset:offset + limit]
+        return [(snapshot.ids[row], float(scores[row])) for row in page], int(rows.size)
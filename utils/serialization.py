@@ -0,0 +1,59 @@
+import gzip
+import json
+from datetime import datetime, date
+from bson import ObjectId
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+# Bodies smaller than this are not worth the CPU to compress
+MIN_COMPRESS_SIZE = 1024
+
+
+def _default(value):
+    """Serialize the BSON/Python types the standard encoders do not know"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(obj):
+    """Encode obj as compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode()
+
+
+def available_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compress_response(response, request):
+    """Compress a response body with the best encoding the client accepts"""
+    response.vary.add('Accept-Encoding')
+    if response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_SIZE:
+        return response
+
+    encoding = request.accept_encodings.best_match(available_encodings())
+    if encoding == 'br':
+        body = brotli.compress(body, quality=5)
+    elif encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=6)
+    else:
+        return response
+
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,64 @@
+import time
+from contextlib import contextmanager
+from jinja2 import FileSystemBytecodeCache
+from utils.helpers import private_directory
+
+
+class StartupTimer:
+    """Records where process start-up time goes.
+
+    mark(phase) closes a phase at the current instant; phase(name) times a
+    block. report() lists every phase with its share of the total.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def phase(self, name):
+        self._last = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def report(self):
+        total = sum(seconds for _, seconds in self.phases) or 1e-9
+        width = max((len(name) for name, _ in self.phases), default=0)
+        lines = [f"{name:<{width}}  {seconds * 1000:8.1f} ms  {seconds / total:6.1%}" for name, seconds in self.phases]
+        lines.append(f"{'total':<{width}}  {total * 1000:8.1f} ms")
+        return '\n'.join(lines)
+
+
+def bytecode_cache(directory=None):
+    """Jinja bytecode cache on local disk, shared by every worker on the host.
+
+    Entries are keyed by template name and checked against the source, so a
+    deploy that changes a template simply compiles it again. The cache holds
+    code the app executes, so the directory must belong to this user and be
+    writable by no one else. Without a directory, Jinja's per-user temporary
+    directory is used (Jinja applies the same check to it).
+    """
+    if directory is None:
+        return FileSystemBytecodeCache()
+    return FileSystemBytecodeCache(private_directory(directory))
+
+
+def precompile_templates(app):
+    """Load every template into the app's Jinja environment; returns the count.
+
+    Templates come from the bytecode cache when it has them and are compiled
+    (and written to it) otherwise. Run before forking, the compiled
+    templates are shared by every worker.
+    """
+    env = app.jinja_env
+    names = env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    for name in names:
+        env.get_template(name)
+    return len(names)
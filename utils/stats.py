@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from utils.helpers import (get_opportunity_stats, get_application_stats, opportunity_stats_pipeline,
+                           parse_opportunity_stats, application_stats_pipeline, parse_application_stats)
+
+NEW_APPLICATION_WINDOW = timedelta(days=1)
+
+
+class StatsCache:
+    """In-process cache of the admin dashboard counters.
+
+    A refresh costs one $facet aggregation per collection. Between refreshes
+    the counters are adjusted in place by the write routes, so a dashboard
+    view does no Mongo work while the cache is fresh. The TTL bounds drift
+    from writes made by other worker processes and from applications ageing
+    out of the "new" window.
+    """
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = None
+        self._loaded_at = 0
+
+    def _is_stale(self):
+        return self._stats is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def _snapshot(self):
+        return {
+            'opportunities': dict(self._stats['opportunities'],
+                                  by_type=dict(self._stats['opportunities']['by_type'])),
+            'applications': dict(self._stats['applications']),
+            'users': dict(self._stats['users'])
+        }
+
+    def get(self, db):
+        """Return a snapshot of the counters, refreshing them when stale"""
+        with self._lock:
+            if self._is_stale():
+                self._stats = {
+                    'opportunities': get_opportunity_stats(db),
+                    'applications': get_application_stats(
+                        db, datetime.utcnow() - NEW_APPLICATION_WINDOW),
+                    'users': {'total': db.users.estimated_document_count()}
+                }
+                self._loaded_at = time.monotonic()
+            return self._snapshot()
+
+    async def get_async(self, adb):
+        """get() for async mode: a refresh runs the three queries concurrently on adb"""
+        with self._lock:
+            if not self._is_stale():
+                return self._snapshot()
+
+        new_since = datetime.utcnow() - NEW_APPLICATION_WINDOW
+        opportunities, applications, users = await asyncio.gather(
+            adb.run(lambda db: db.opportunities.aggregate(opportunity_stats_pipeline()).to_list(1)),
+            adb.run(lambda db: db.applications.aggregate(application_stats_pipeline(new_since)).to_list(1)),
+            adb.run(lambda db: db.users.estimated_document_count())
+        )
+        with self._lock:
+            self._stats = {
+                'opportunities': parse_opportunity_stats(opportunities[0]),
+                'applications': parse_application_stats(applications[0]),
+                'users': {'total': users}
+            }
+            self._loaded_at = time.monotonic()
+            return self._snapshot()
+
+    def invalidate(self):
+        with self._lock:
+            self._stats = None
+
+    def _adjust_opportunity(self, opportunity, delta):
+        stats = self._stats['opportunities']
+        stats['total'] += delta
+        if opportunity.get('status') == 'active':
+            stats['active'] += delta
+        opportunity_type = opportunity.get('type')
+        if opportunity_type:
+            stats['by_type'][opportunity_type] = stats['by_type'].get(opportunity_type, 0) + delta
+
+    def _adjust_application(self, application, delta):
+        stats = self._stats['applications']
+        stats['total'] += delta
+        status = application.get('status')
+        if status:
+            stats[status] = stats.get(status, 0) + delta
+        created_at = application.get('created_at')
+        if created_at and created_at >= datetime.utcnow() - NEW_APPLICATION_WINDOW:
+            stats['new'] += delta
+
+    def opportunity_added(self, opportunity):
+        with self._lock:
+            if self._stats is not None:
+                self._adjust_opportunity(opportunity, 1)
+
+    def opportunity_updated(self, before, after):
+        with self._lock:
+            if self._stats is not None and before is not None:
+                self._adjust_opportunity(before, -1)
+                self._adjust_opportunity(after, 1)
+
+    def opportunity_removed(self, opportunity):
+        with self._lock:
+            if self._stats is not None and opportunity is not None:
+                self._adjust_opportunity(opportunity, -1)
+
+    def application_added(self, application):
+        with self._lock:
+            if self._stats is not None:
+                self._adjust_application(application, 1)
+
+    def application_updated(self, before, after):
+        with self._lock:
+            if self._stats is not None and before is not None:
+                self._adjust_application(before, -1)
+                self._adjust_application(after, 1)
+
+    def application_removed(self, application):
+        with self._lock:
+            if self._stats is not None and application is not None:
+                self._adjust_application(application, -1)